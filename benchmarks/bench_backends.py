@@ -0,0 +1,83 @@
+"""
+Benchmark backend query dashboard: roll-up pandas (cube di memori) dibandingkan
+SQL DuckDB di atas satu file Parquet dan di atas partisi bulanan (hanya bulan
+dalam rentang filter yang dibaca), pada tabel transaksi sintetis. Setiap
+roll-up diukur untuk seluruh rentang data dan untuk filter satu bulan.
+
+    python benchmarks/bench_backends.py                 # 2 juta baris
+    python benchmarks/bench_backends.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import cube  # noqa: E402
+import partitions  # noqa: E402
+from cleaning_data import clean_and_merge_transaksi  # noqa: E402
+from filters import BitmapIndex, TimeIndex, sort_by_time  # noqa: E402
+from query_backend import DuckDBBackend, PandasBackend  # noqa: E402
+from result_cache import filter_key  # noqa: E402
+from schema import compact_transaksi, convert_to_indonesian  # noqa: E402
+from synthetic import make_exports  # noqa: E402
+
+ROLLUPS = ["summary", "daily_totals", "donatur_stats", "bulan_stats", "campaign_stats"]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    # Export sintetis dibersihkan seperti precompute.build_data
+    df, detik = timed(clean_and_merge_transaksi, *make_exports(args.rows))
+    df = sort_by_time(compact_transaksi(convert_to_indonesian(df)))
+    print(f"{len(df):,} baris bersih dari export sintetis, cleaning {detik:.1f} detik")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "transaksi.parquet")
+        df.to_parquet(path, index=False)
+
+        data_cube, detik_cube = timed(cube.build_cube, df)
+        print(f"cube: {len(data_cube):,} baris, dibangun dalam {detik_cube:.2f} detik\n")
+
+        partition_dir = os.path.join(tmp, "partitions")
+        manifest, detik_partisi = timed(partitions.write_partitions, df, "bench", partition_dir)
+        print(f"partisi: {len(manifest['parts'])} bulan, ditulis dalam {detik_partisi:.2f} detik")
+        _, detik_ulang = timed(partitions.write_partitions, df, "bench", partition_dir)
+        print(f"partisi: refresh tanpa perubahan {detik_ulang:.2f} detik\n")
+
+        backends = {
+            "pandas": PandasBackend(data_cube, TimeIndex(data_cube["tanggal"]), BitmapIndex(data_cube)),
+            "duckdb": DuckDBBackend(path),
+            "duckdb+partisi": DuckDBBackend(
+                partitions.partition_paths(manifest["parts"], partition_dir),
+                ranges=[(part["min"], part["max"]) for part in manifest["parts"]],
+            ),
+        }
+        akhir = df["tanggal"].iloc[-1]
+        keys = {
+            "semua": filter_key(df["tanggal"].iloc[0].date(), akhir.date(), {}),
+            "1 bulan": filter_key((akhir - pd.Timedelta(days=30)).date(), akhir.date(), {}),
+        }
+
+        print(f"{'roll-up':<24}" + "".join(f"{name:>16}" for name in backends))
+        for label, key in keys.items():
+            for name in ROLLUPS:
+                hasil = [timed(backend.rollup, name, key)[1] for backend in backends.values()]
+                print(f"{name + ' (' + label + ')':<24}" + "".join(f"{detik:>15.3f}s" for detik in hasil))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Engine cleaning pandas (src/cleaning_data.py) dibandingkan engine Polars lazy
+(src/cleaning_polars.py).
+
+Pertama dicek bahwa kedua engine menghasilkan DataFrame yang identik untuk
+data/transaksi_*.xlsx, lalu throughput diukur pada export sintetis.
+
+    python benchmarks/bench_cleaning.py                      # 1 juta & 10 juta baris
+    python benchmarks/bench_cleaning.py --rows 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from cleaning_data import clean_and_merge_transaksi  # noqa: E402
+from cleaning_polars import clean_and_merge_transaksi_polars  # noqa: E402
+from import_data import load_data  # noqa: E402
+from synthetic import make_exports  # noqa: E402
+
+
+def check_equivalent():
+    df_qris, df_manual = load_data()
+    expected = clean_and_merge_transaksi(df_qris.copy(), df_manual.copy())
+    result = clean_and_merge_transaksi_polars(df_qris, df_manual)
+    pd.testing.assert_frame_equal(expected, result)
+    print(f"OK: hasil Polars identik dengan pandas ({len(result):,} baris, {result.shape[1]} kolom)\n")
+
+
+def checksum(df):
+    return (list(df.dtypes.astype(str)), int(pd.util.hash_pandas_object(df).sum()))
+
+
+def timeit(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    check_equivalent()
+
+    print(f"{'baris':>12} {'pandas':>10} {'polars':>10} {'speedup':>9} {'baris/detik (polars)':>22}")
+    for rows in args.rows:
+        df_qris, df_manual = make_exports(rows)
+
+        # Polars dulu: engine pandas menambah kolom ke DataFrame input. Hasil
+        # dibandingkan lewat checksum agar kedua hasil tidak perlu ada di
+        # memori bersamaan.
+        hasil, t_polars = timeit(clean_and_merge_transaksi_polars, df_qris, df_manual)
+        checksum_polars = checksum(hasil)
+        del hasil
+        hasil, t_pandas = timeit(clean_and_merge_transaksi, df_qris, df_manual)
+        assert checksum(hasil) == checksum_polars, "hasil pandas dan Polars berbeda"
+        del hasil, df_qris, df_manual
+        print(
+            f"{rows:>12,} {t_pandas:>9.2f}s {t_polars:>9.2f}s {t_pandas / t_polars:>8.1f}x "
+            f"{rows / t_polars:>22,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Suite benchmark ETL dan dashboard pada data sintetis (benchmarks/synthetic.py).
+
+Untuk setiap skala diukur: load (Parquet, dan Excel untuk skala kecil),
+cleaning, build tabel dashboard (nama hari/bulan, skema ringkas, urut waktu),
+build cube dan indeks, filter sidebar, serta agregasi setiap tab. Hasil
+disimpan sebagai JSON di benchmarks/results/ dan dibandingkan dengan hasil
+sebelumnya agar regresi langsung terlihat.
+
+    python benchmarks/bench_suite.py                          # 10 ribu, 100 ribu, 1 juta baris
+    python benchmarks/bench_suite.py --rows 10000 5000000 --backend duckdb
+    python benchmarks/bench_suite.py --baseline benchmarks/results/suite-20250526-120000.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import cube  # noqa: E402
+from cleaning_data import clean_and_merge_transaksi  # noqa: E402
+from filters import BitmapIndex, TimeIndex, apply_filters, sort_by_time  # noqa: E402
+from import_data import load_data  # noqa: E402
+from instrumentation import peak_rss_mb  # noqa: E402
+from result_cache import filter_key  # noqa: E402
+from schema import compact_transaksi, convert_to_indonesian  # noqa: E402
+from synthetic import make_exports, write_excel, write_parquet  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Roll-up yang dihitung oleh setiap tab app.py
+TAB_ROLLUPS = {
+    "ringkasan": [
+        "summary", "total_by_status", "status_per_metode", "success_rate_per_metode",
+        "metode_frequency", "donatur_per_metode", "metode_stats",
+    ],
+    "donatur": ["donatur_stats"],
+    "transaksi_keseluruhan": ["daily_totals"],
+    "transaksi_harian": ["hari_stats", "jam_stats"],
+    "transaksi_bulanan": ["bulan_stats"],
+    "tren_campaign": ["campaign_stats"],
+}
+
+
+class Recorder:
+    """Mencatat durasi setiap stage per skala"""
+
+    def __init__(self):
+        self.results = []
+
+    @contextmanager
+    def stage(self, rows, name):
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        self.results.append({"rows": rows, "stage": name, "seconds": round(seconds, 6)})
+        print(f"  {name:<28} {seconds:>9.3f} detik")
+
+
+def make_backend(name, data_cube, parquet_path):
+    from query_backend import DuckDBBackend, PandasBackend
+
+    if name == "duckdb":
+        return DuckDBBackend(parquet_path)
+    return PandasBackend(data_cube, TimeIndex(data_cube["tanggal"]), BitmapIndex(data_cube))
+
+
+def run_scale(rows, recorder, tmp, backend_name, excel_max):
+    print(f"\n{rows:,} baris")
+    with recorder.stage(rows, "generate"):
+        df_qris, df_manual = make_exports(rows)
+
+    paths = {}
+    for metode, df in [("qris", df_qris), ("manual", df_manual)]:
+        paths[metode] = os.path.join(tmp, f"transaksi_{metode}.parquet")
+        write_parquet([df], paths[metode])
+    with recorder.stage(rows, "load_parquet"):
+        df_qris = pd.read_parquet(paths["qris"])
+        df_manual = pd.read_parquet(paths["manual"])
+
+    if rows <= excel_max:
+        for metode, df in [("qris", df_qris), ("manual", df_manual)]:
+            write_excel([df], os.path.join(tmp, f"transaksi_{metode}.xlsx"))
+        with recorder.stage(rows, "load_excel"):
+            load_data(os.path.join(tmp, "transaksi_qris.xlsx"), os.path.join(tmp, "transaksi_manual.xlsx"))
+
+    with recorder.stage(rows, "clean"):
+        df = clean_and_merge_transaksi(df_qris, df_manual)
+    del df_qris, df_manual
+
+    with recorder.stage(rows, "build"):
+        df = sort_by_time(compact_transaksi(convert_to_indonesian(df)))
+
+    with recorder.stage(rows, "cube"):
+        data_cube = cube.build_cube(df)
+
+    with recorder.stage(rows, "index"):
+        df_time_index, df_bitmaps = TimeIndex(df["tanggal_jam"]), BitmapIndex(df)
+    cube_parquet = os.path.join(tmp, "transaksi_bersih.parquet")
+    df.to_parquet(cube_parquet, index=False)
+    backend = make_backend(backend_name, data_cube, cube_parquet)
+
+    # Filter representatif: 30 hari terakhir, hanya transaksi berhasil
+    end_date = df["tanggal_jam"].iloc[-1].date()
+    start_date = end_date - pd.Timedelta(days=30)
+    selections = {"metode_pembayaran": [], "status": ["Berhasil"], "nama_campaign": [], "nama_donatur": []}
+    with recorder.stage(rows, "filter"):
+        apply_filters(df, start_date, end_date, selections, df_time_index, df_bitmaps)
+
+    key = filter_key(df["tanggal_jam"].iloc[0].date(), end_date, {})
+    for tab, rollups in TAB_ROLLUPS.items():
+        with recorder.stage(rows, f"tab:{tab}"):
+            for name in rollups:
+                backend.rollup(name, key)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def latest_result(exclude=None):
+    paths = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, "suite-*.json")) if p != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(current, baseline_path, threshold=1.2):
+    """Mencetak perbandingan dengan hasil sebelumnya; stage > threshold x lebih lambat ditandai"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    lama = {(r["rows"], r["stage"]): r["seconds"] for r in baseline["results"]}
+    print(f"\nDibandingkan dengan {baseline_path} (commit {baseline.get('git_commit')}):")
+    regresi = 0
+    for r in current["results"]:
+        sebelum = lama.get((r["rows"], r["stage"]))
+        if not sebelum or r["stage"] == "generate":
+            continue
+        rasio = r["seconds"] / sebelum
+        tanda = "  <-- REGRESI" if rasio > threshold and r["seconds"] > 0.05 else ""
+        regresi += bool(tanda)
+        print(f"  {r['rows']:>11,} {r['stage']:<28} {sebelum:>8.3f} -> {r['seconds']:>8.3f} detik ({rasio:.2f}x){tanda}")
+    return regresi
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--backend", choices=["pandas", "duckdb"], default="pandas")
+    parser.add_argument("--excel-max", type=int, default=100_000, help="Skala terbesar yang juga diukur load Excel-nya")
+    parser.add_argument("--output", help="File JSON hasil (default benchmarks/results/suite-<waktu>.json)")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya (default: hasil terbaru di benchmarks/results)")
+    args = parser.parse_args()
+
+    recorder = Recorder()
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            run_scale(rows, recorder, tmp, args.backend, args.excel_max)
+
+    current = {
+        "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "backend": args.backend,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": {"pandas": pd.__version__, "numpy": np.__version__, "pyarrow": pa.__version__},
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "results": recorder.results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"suite-{pd.Timestamp.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    baseline = args.baseline or latest_result(exclude=os.path.abspath(output))
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nHasil disimpan ke {output} (puncak memori {current['peak_rss_mb']:,} MB)")
+
+    if baseline:
+        compare(current, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Load test dashboard: N sesi bersamaan menjalankan src/app.py lewat API
+app-testing Streamlit (tanpa browser), masing-masing mengganti filter dan tab
+seperti staf yang sedang memantau campaign.
+
+Data diambil dari generator sintetis (benchmarks/synthetic.py) di direktori
+kerja sementara, jadi data/ repo tidak tersentuh. AppTest hanya mendukung satu
+sesi per proses, jadi setiap sesi berjalan di prosesnya sendiri, seperti
+beberapa proses `streamlit run` di belakang reverse proxy: dataset dan cube
+dibagi lewat file Arrow IPC yang di-memory-map dan hasil roll-up lewat cache
+disk, sedangkan cache memori Streamlit milik masing-masing proses. Untuk
+setiap level konkurensi dilaporkan latensi rerun p50/p95/p99, throughput
+(rerun/detik), memori (puncak RSS per sesi, jumlah puncak RSS semua
+proses sesi, dan jumlah PSS yang membagi rata halaman bersama seperti
+file yang di-memory-map), dan jumlah error. Jika ada sesi yang
+gagal, exit code-nya 1.
+
+    python benchmarks/load_test.py                                  # 1, 4, 8 sesi
+    python benchmarks/load_test.py --sessions 1 8 16 32 --rows 200000 --actions 30
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from instrumentation import current_pss_mb, peak_rss_mb  # noqa: E402
+from synthetic import make_exports, write_excel  # noqa: E402
+
+APP = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "app.py"))
+TABS = [
+    "📌 Ringkasan Utama", "👥 Donatur", "📊 Transaksi Keseluruhan",
+    "📅 Transaksi Harian", "📆 Transaksi Bulanan", "📈 Tren Campaign",
+]
+# Bobot tab: ringkasan dan campaign paling sering dibuka saat kampanye ramai
+TAB_WEIGHTS = [4, 2, 2, 1, 1, 3]
+
+
+def prepare_workspace(rows, workdir, seed=42):
+    """Menulis export Excel sintetis ke <workdir>/data seperti struktur repo"""
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    df_qris, df_manual = make_exports(rows, seed=seed)
+    write_excel([df_qris], os.path.join(workdir, "data", "transaksi_qris.xlsx"))
+    write_excel([df_manual], os.path.join(workdir, "data", "transaksi_manual.xlsx"))
+
+
+# --- Aksi pengguna: mengubah widget, rerun dijalankan oleh pemanggil ---
+def ganti_tanggal(at, rng):
+    date_from, date_to = at.sidebar.date_input[0], at.sidebar.date_input[1]
+    min_date, max_date = date_from.min, date_from.max
+    if rng.random() < 0.3:
+        start, end = min_date, max_date
+    else:
+        days = rng.choice([7, 30, 90, 180])
+        end = max_date - timedelta(days=rng.randint(0, 60))
+        start = max(min_date, end - timedelta(days=days))
+    date_from.set_value(start)
+    date_to.set_value(end)
+
+
+def ganti_metode(at, rng):
+    widget = at.sidebar.multiselect[0]
+    widget.set_value(rng.choice([widget.options, ["QRIS"], ["Manual"]]))
+
+
+def ganti_status(at, rng):
+    widget = at.sidebar.multiselect[1]
+    widget.set_value(rng.choice([widget.options, ["Berhasil"]]))
+
+
+def pilih_campaign(at, rng):
+    widget = at.sidebar.multiselect[2]
+    widget.set_value(rng.sample(widget.options, rng.choice([0, 1, 1, 2])))
+
+
+def pilih_donatur(at, rng):
+    widget = at.sidebar.multiselect[3]
+    widget.set_value(rng.sample(widget.options, rng.choice([0, 1])))
+
+
+def ganti_tab(at, rng):
+    at.session_state["tab_aktif"] = rng.choices(TABS, weights=TAB_WEIGHTS)[0]
+
+
+ACTIONS = [ganti_tab, ganti_tanggal, ganti_metode, ganti_status, pilih_campaign, pilih_donatur]
+ACTION_WEIGHTS = [5, 3, 1, 1, 2, 1]
+
+
+def run_session(session_id, actions, seed, barrier, done, results, timeout, think_time):
+    """Dijalankan di proses sendiri; hasilnya dikirim ke `results` (Queue)"""
+    from streamlit.testing.v1 import AppTest
+
+    # Peringatan Streamlit dari setiap proses sesi menenggelamkan tabel hasil
+    logging.disable(logging.WARNING)
+
+    rng = random.Random(seed * 1000 + session_id)
+    latencies, errors = [], []
+    try:
+        at = AppTest.from_file(APP, default_timeout=timeout)
+        at.run()  # halaman pertama dibuka sebelum pengukuran dimulai
+        errors.extend(f"sesi {session_id}, halaman pertama: {e.message}" for e in at.exception)
+    except Exception as exc:
+        errors.append(f"sesi {session_id}, halaman pertama: {exc!r}")
+        at = None
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass  # sesi lain gagal memuat halaman pertama; tetap jalan dan dilaporkan
+
+    for _ in range(actions if at is not None else 0):
+        action = rng.choices(ACTIONS, weights=ACTION_WEIGHTS)[0]
+        try:
+            action(at, rng)
+            start = time.perf_counter()
+            at.run()
+            latencies.append(time.perf_counter() - start)
+        except Exception as exc:
+            # State AppTest tidak bisa dipercaya lagi: sesi berhenti, sisa
+            # interaksinya dihitung sebagai rerun yang gagal
+            errors.append(f"sesi {session_id}, {action.__name__}: {exc!r}")
+            break
+        errors.extend(f"sesi {session_id}, {action.__name__}: {e.message}" for e in at.exception)
+        if think_time:
+            time.sleep(rng.uniform(0, 2 * think_time))
+
+    results.put({
+        "session": session_id, "latencies": latencies, "errors": errors,
+        "peak_rss_mb": peak_rss_mb(), "pss_mb": current_pss_mb(),
+    })
+    # Proses tetap hidup sampai semua sesi melapor, agar PSS sesi lain diukur
+    # saat halaman bersama masih dibagi oleh semua proses
+    done.wait(timeout * (actions + 1) + 60)
+
+
+def run_level(sessions, actions, seed, timeout, think_time):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    barrier = ctx.Barrier(sessions + 1)
+    done = ctx.Event()
+    processes = [
+        ctx.Process(
+            target=run_session,
+            args=(i, actions, seed, barrier, done, results, timeout, think_time),
+            name=f"sesi-{i}",
+        )
+        for i in range(sessions)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        # Semua sesi sudah memuat halaman pertama
+        barrier.wait(timeout=timeout + 60)
+    except Exception:
+        pass  # ada sesi yang mati sebelum barrier; dicatat di bawah
+    start = time.perf_counter()
+
+    reports = {}
+    deadline = time.monotonic() + timeout * (actions + 1) + 60
+    while len(reports) < sessions and time.monotonic() < deadline:
+        try:
+            report = results.get(timeout=1)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes) and results.empty():
+                break
+            continue
+        reports[report["session"]] = report
+    wall = time.perf_counter() - start
+    done.set()
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+
+    latencies, errors = [], []
+    for i, process in enumerate(processes):
+        report = reports.get(i)
+        if report is None:
+            errors.append(f"sesi {i}: proses berhenti tanpa hasil (exit code {process.exitcode})")
+            continue
+        latencies.extend(report["latencies"])
+        errors.extend(report["errors"])
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (np.nan,) * 3
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "expected_reruns": sessions * actions,
+        "errors": len(errors),
+        "p50": round(float(p50), 4),
+        "p95": round(float(p95), 4),
+        "p99": round(float(p99), 4),
+        "max": round(max(latencies, default=np.nan), 4),
+        "throughput": round(len(latencies) / wall, 2),
+        "peak_rss_mb": round(max((r["peak_rss_mb"] for r in reports.values()), default=np.nan), 1),
+        "total_rss_mb": round(sum(r["peak_rss_mb"] for r in reports.values()), 1),
+        "total_pss_mb": round(sum(r["pss_mb"] for r in reports.values()), 1),
+    }, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8], help="Level konkurensi")
+    parser.add_argument("--rows", type=int, default=20_000, help="Jumlah transaksi sintetis")
+    parser.add_argument("--actions", type=int, default=20, help="Interaksi (rerun) per sesi")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Rata-rata jeda antar interaksi (detik)")
+    parser.add_argument("--timeout", type=float, default=300, help="Batas waktu satu rerun (detik)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    # Satu pool roll-up per proses sesi tidak mewakili server sungguhan
+    os.environ.setdefault("DASHBOARD_WORKERS", "0")
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        prepare_workspace(args.rows, workdir, seed=args.seed)
+        print(f"Data sintetis {args.rows:,} transaksi dibuat dalam {time.perf_counter() - start:.1f} detik")
+
+        # Path data di app.py relatif terhadap direktori kerja (diwarisi proses sesi)
+        os.chdir(workdir)
+        start = time.perf_counter()
+        cold, cold_errors = run_level(1, 0, args.seed, args.timeout, 0)
+        print(f"Cold start (cleaning + snapshot + cube): {time.perf_counter() - start:.2f} detik\n")
+
+        print(
+            f"{'sesi':>5} {'rerun':>11} {'error':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} "
+            f"{'rerun/s':>8} {'MB/sesi':>8} {'RSS total':>10} {'PSS total':>10}"
+        )
+        results, all_errors = [], list(cold_errors)
+        for sessions in args.sessions:
+            result, errors = run_level(sessions, args.actions, args.seed, args.timeout, args.think_time)
+            results.append(result)
+            all_errors.extend(errors)
+            rerun = f"{result['reruns']}/{result['expected_reruns']}"
+            print(
+                f"{result['sessions']:>5} {rerun:>11} {result['errors']:>6} {result['p50']:>7.3f}s "
+                f"{result['p95']:>7.3f}s {result['p99']:>7.3f}s {result['max']:>7.3f}s "
+                f"{result['throughput']:>8.2f} {result['peak_rss_mb']:>8,.0f} "
+                f"{result['total_rss_mb']:>10,.0f} {result['total_pss_mb']:>10,.0f}"
+            )
+        os.chdir(os.path.dirname(APP))
+
+    for error in sorted(set(all_errors))[:10]:
+        print(f"ERROR {error}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"rows": args.rows, "actions": args.actions, "errors": all_errors, "results": results},
+                f, indent=2, ensure_ascii=False,
+            )
+        print(f"\nHasil disimpan ke {args.output}")
+
+    if all_errors:
+        print(f"\n{len(all_errors)} error: hasil di atas tidak lengkap", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
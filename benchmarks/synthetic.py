@@ -0,0 +1,245 @@
+"""
+Generator data transaksi sintetis dengan format export SobatBerbagi.
+
+Export yang dihasilkan meniru data asli:
+- tanggal teks Indonesia ("6 Mei 2025 08:29"), urut dari yang terbaru,
+- nominal Rupiah ("Rp 100.000"; transfer manual memakai kode unik "Rp 25.061"),
+- nama donatur dengan huruf besar/kecil dan spasi acak, "Hamba Allah", dan
+  nama kosong,
+- campaign "-" yang harus dibuang saat cleaning,
+- status "Berhasil" / "Belum Di Konfirmasi",
+- kardinalitas donatur dan campaign berdistribusi Zipf (sedikit donatur dan
+  campaign besar, ekor panjang yang kecil).
+
+Data dibuat per chunk dengan memori tetap, jadi skala 10 ribu sampai 50 juta
+baris bisa ditulis ke Parquet. Workbook Excel dibatasi 1.048.574 baris data
+per file (batas satu sheet Excel).
+
+    python benchmarks/synthetic.py --rows 100000                    # xlsx + parquet
+    python benchmarks/synthetic.py --rows 50000000 --format parquet
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from parsers import BULAN_MAPPING  # noqa: E402
+
+NAMA_BULAN = np.array(list(BULAN_MAPPING))
+EXPORT_COLUMNS = ["No", "Tanggal", "Nama Campaign", "Nama Donatur", "Total Donasi", "Status"]
+EXCEL_MAX_ROWS = 1_048_576 - 2  # dikurangi baris judul dan header
+
+# Perbandingan jumlah transaksi QRIS : manual pada data asli (590 : 246)
+PORSI_QRIS = 0.7
+
+NAMA_DEPAN = [
+    "Ahmad", "Muhammad", "Siti", "Nur", "Dewi", "Rizki", "Fajar", "Putri", "Aulia", "Fauzan",
+    "Hanif", "Dimas", "Rina", "Agus", "Budi", "Wahyu", "Intan", "Yusuf", "Fadhil", "Azizah",
+    "Raditya", "Danica", "Titah", "Ranran", "Muji", "Ariq", "Mutiara", "Afif", "Rifki", "Saputra",
+]
+NAMA_BELAKANG = [
+    "Pratama", "Saputra", "Hidayat", "Rahayu", "Wijaya", "Lestari", "Ramadan", "Kurniawan",
+    "Nugroho", "Syaputra", "Amanullah", "Rochmah", "Hartati", "Muzakki", "Alwahidah",
+    "Khoirunnisa", "Firmansyah", "Maulana", "Permata", "Setiawan", "Hakim", "Fattah",
+]
+TEMA_CAMPAIGN = [
+    "Pembangunan Masjid", "Sedekah Subuh", "Beasiswa Yatim", "Bantuan Bencana", "Wakaf Quran",
+    "Operasional Panti", "Air Bersih", "Kesehatan Dhuafa", "Qurban", "Renovasi Sekolah",
+]
+NOMINAL_QRIS = np.array([1_000, 5_000, 10_000, 20_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000])
+PELUANG_QRIS = np.array([0.08, 0.12, 0.2, 0.12, 0.08, 0.17, 0.14, 0.05, 0.03, 0.01])
+
+
+def zipf_sampler(size, exponent, rng):
+    """Sampler kode 0..size-1 dengan peluang sebanding 1 / (k + 1) ** exponent"""
+    bobot = 1.0 / np.arange(1, size + 1) ** exponent
+    cdf = np.cumsum(bobot)
+    cdf /= cdf[-1]
+    return lambda n: np.minimum(np.searchsorted(cdf, rng.random(n)), size - 1)
+
+
+def nama_donatur_pool(size):
+    """Nama donatur unik: kombinasi nama depan & belakang, diberi angka jika habis"""
+    kode = np.arange(size)
+    depan = np.array(NAMA_DEPAN)[kode % len(NAMA_DEPAN)]
+    belakang = np.array(NAMA_BELAKANG)[(kode // len(NAMA_DEPAN)) % len(NAMA_BELAKANG)]
+    nama = pd.Series(depan).str.cat(belakang, sep=" ")
+    putaran = kode // (len(NAMA_DEPAN) * len(NAMA_BELAKANG))
+    nama = nama.where(putaran == 0, nama + " " + pd.Series(putaran).astype(str))
+    return nama.to_numpy(dtype=object)
+
+
+def campaign_pool(size):
+    kode = np.arange(size)
+    tema = np.array(TEMA_CAMPAIGN)[kode % len(TEMA_CAMPAIGN)]
+    nama = pd.Series(tema) + " " + pd.Series(kode // len(TEMA_CAMPAIGN) + 1).astype(str)
+    return nama.to_numpy(dtype=object)
+
+
+def format_tanggal(waktu):
+    """datetime -> "6 Mei 2025 08:29" """
+    waktu = pd.DatetimeIndex(waktu)
+    return (
+        pd.Series(waktu.day.astype(str))
+        .str.cat([pd.Series(NAMA_BULAN[waktu.month - 1]), pd.Series(waktu.strftime("%Y %H:%M"))], sep=" ")
+        .to_numpy(dtype=object)
+    )
+
+
+def format_rupiah(nominal):
+    """int -> "Rp 100.000" (per nilai unik, lalu dipetakan balik)"""
+    codes, uniques = pd.factorize(nominal)
+    teks = np.array([f"Rp {int(v):,}".replace(",", ".") for v in uniques], dtype=object)
+    return teks[codes]
+
+
+def acak_penulisan(nama, rng):
+    """Variasi penulisan seperti input donatur: huruf kecil/besar dan spasi berlebih"""
+    nama = pd.Series(nama, dtype=object)
+    pilih = rng.random(len(nama))
+    nama = nama.mask(pilih < 0.05, nama.str.lower())
+    nama = nama.mask((pilih >= 0.05) & (pilih < 0.07), nama.str.upper())
+    nama = nama.mask((pilih >= 0.07) & (pilih < 0.09), " " + nama + " ")
+    return nama.to_numpy(dtype=object, copy=True)
+
+
+class ExportGenerator:
+    """
+    Membuat export mentah satu metode pembayaran per chunk.
+
+    Waktu transaksi dibagi rata ke setiap chunk (chunk pertama berisi
+    transaksi terbaru), sehingga gabungan chunk tetap terurut menurun seperti
+    file export aslinya.
+    """
+
+    def __init__(self, rows, metode="QRIS", donatur=None, campaign=None, start="2023-12-16",
+                 end="2025-05-26 23:59", seed=42):
+        self.rows = rows
+        self.metode = metode
+        self.rng = np.random.default_rng(seed)
+        self.start = pd.Timestamp(start)
+        self.end = pd.Timestamp(end)
+
+        donatur = donatur or int(min(max(rows // 5, 100), 2_000_000))
+        campaign = campaign or int(min(max(rows // 5_000, 20), 2_000))
+        self.donatur = nama_donatur_pool(donatur)
+        self.campaign = campaign_pool(campaign)
+        self.sample_donatur = zipf_sampler(donatur, 1.1, self.rng)
+        self.sample_campaign = zipf_sampler(campaign, 1.3, self.rng)
+
+    def chunk(self, first_row, rows):
+        """Chunk export untuk baris ke-first_row .. first_row + rows - 1"""
+        rng = self.rng
+        total_menit = int((self.end - self.start) / pd.Timedelta(minutes=1))
+        awal = total_menit * (1 - (first_row + rows) / self.rows)
+        akhir = total_menit * (1 - first_row / self.rows)
+        menit = np.sort(rng.uniform(awal, akhir, size=rows).astype(np.int64))[::-1]
+        waktu = self.start + pd.to_timedelta(menit, unit="min")
+
+        if self.metode == "QRIS":
+            nominal = rng.choice(NOMINAL_QRIS, size=rows, p=PELUANG_QRIS)
+        else:
+            # Transfer manual memakai kode unik 3 digit di belakang nominal
+            nominal = rng.choice(NOMINAL_QRIS[2:], size=rows) + rng.integers(1, 500, size=rows)
+        nominal = np.where(rng.random(rows) < 0.001, 0, nominal)  # nominal kosong / 0
+
+        nama = acak_penulisan(self.donatur[self.sample_donatur(rows)], rng)
+        pilih = rng.random(rows)
+        nama[pilih < 0.02] = "Hamba Allah"
+        nama[(pilih >= 0.02) & (pilih < 0.025)] = "hamba allah"
+        nama[(pilih >= 0.025) & (pilih < 0.035)] = None
+
+        campaign = self.campaign[self.sample_campaign(rows)]
+        campaign[rng.random(rows) < 0.003] = "-"
+
+        status = np.where(rng.random(rows) < 0.55, "Berhasil", "Belum Di Konfirmasi").astype(object)
+
+        return pd.DataFrame({
+            "No": np.arange(first_row + 1, first_row + rows + 1),
+            "Tanggal": format_tanggal(waktu),
+            "Nama Campaign": campaign,
+            "Nama Donatur": nama,
+            "Total Donasi": format_rupiah(nominal),
+            "Status": status,
+        })
+
+    def iter_chunks(self, chunksize=1_000_000):
+        for first_row in range(0, self.rows, chunksize):
+            yield self.chunk(first_row, min(chunksize, self.rows - first_row))
+
+
+def make_exports(rows, seed=42):
+    """Export QRIS dan manual di memori (total `rows` baris) sebagai (df_qris, df_manual)"""
+    rows_qris = int(rows * PORSI_QRIS)
+    df_qris = ExportGenerator(rows_qris, "QRIS", seed=seed).chunk(0, rows_qris)
+    rows_manual = rows - rows_qris
+    df_manual = ExportGenerator(rows_manual, "Manual", seed=seed + 1).chunk(0, rows_manual)
+    return df_qris, df_manual
+
+
+def write_parquet(chunks, path):
+    """Menulis chunk-chunk export ke satu file Parquet (memori tetap)"""
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_excel(chunks, path):
+    """Menulis chunk-chunk export ke workbook Excel dengan baris judul seperti aslinya"""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(["Transaksi Campaign"])
+    ws.append(EXPORT_COLUMNS)
+    rows = 0
+    for chunk in chunks:
+        rows += len(chunk)
+        if rows > EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel maksimal {EXCEL_MAX_ROWS:,} baris data per sheet")
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(row)
+    wb.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Total baris (QRIS + manual)")
+    parser.add_argument("--out-dir", default="data/synthetic", help="Folder output")
+    parser.add_argument("--format", choices=["xlsx", "parquet", "both"], default="both")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not 10_000 <= args.rows <= 50_000_000:
+        parser.error("--rows harus di antara 10.000 dan 50.000.000")
+    if args.format != "parquet" and args.rows * PORSI_QRIS > EXCEL_MAX_ROWS:
+        parser.error("terlalu banyak baris untuk Excel, pakai --format parquet")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    rows_qris = int(args.rows * PORSI_QRIS)
+    for metode, rows, seed in [("qris", rows_qris, args.seed), ("manual", args.rows - rows_qris, args.seed + 1)]:
+        nama_metode = "QRIS" if metode == "qris" else "Manual"
+        if args.format in ("parquet", "both"):
+            path = os.path.join(args.out_dir, f"transaksi_{metode}.parquet")
+            write_parquet(ExportGenerator(rows, nama_metode, seed=seed).iter_chunks(), path)
+            print(f"{path}: {rows:,} baris")
+        if args.format in ("xlsx", "both"):
+            path = os.path.join(args.out_dir, f"transaksi_{metode}.xlsx")
+            write_excel(ExportGenerator(rows, nama_metode, seed=seed).iter_chunks(100_000), path)
+            print(f"{path}: {rows:,} baris")
+
+if __name__ == "__main__":
+    main()
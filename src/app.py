@@ -2,54 +2,29 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from cleaning_data import clean_and_merge_transaksi
+from filters import apply_filters
+import result_cache
+import exports
+import executor
+import disk_cache
+import precompute
+from query_backend import DEFAULT_BACKEND
+from instrumentation import Profiler, current_rss_mb, peak_rss_mb
+from chart_render import cached_optimize_figure, payload_kb
+from segmentation import rfm_scores, rfm_summary, segment_donatur, tier_counts
 import numpy as np
+import os
 from datetime import datetime, timedelta
 
 st.set_page_config(page_title="📊 Dashboard Donasi", layout="wide")
 st.title("📊 Dashboard Transaksi Donasi Campaign SobatBerbagi.com")
-st.subheader("16 Desember 2023 - 26 Mei 2025")
-
-# Fungsi untuk mengkonversi nama hari dan bulan ke Bahasa Indonesia
-def convert_to_indonesian(df):
-    """Mengkonversi nama hari dan bulan ke Bahasa Indonesia"""
-    
-    # Mapping hari ke Bahasa Indonesia
-    day_mapping = {
-        'Monday': 'Senin',
-        'Tuesday': 'Selasa', 
-        'Wednesday': 'Rabu',
-        'Thursday': 'Kamis',
-        'Friday': 'Jumat',
-        'Saturday': 'Sabtu',
-        'Sunday': 'Minggu'
-    }
-    
-    # Mapping bulan ke Bahasa Indonesia
-    month_mapping = {
-        'January': 'Januari',
-        'February': 'Februari',
-        'March': 'Maret',
-        'April': 'April',
-        'May': 'Mei',
-        'June': 'Juni',
-        'July': 'Juli',
-        'August': 'Agustus',
-        'September': 'September',
-        'October': 'Oktober',
-        'November': 'November',
-        'December': 'Desember'
-    }
-    
-    # Konversi nama hari jika kolom 'hari' ada
-    if 'hari' in df.columns:
-        df['hari'] = df['tanggal_jam'].dt.day_name().map(day_mapping)
-    
-    # Konversi nama bulan jika kolom 'bulan' ada
-    if 'bulan' in df.columns:
-        df['bulan'] = df['tanggal_jam'].dt.month_name().map(month_mapping)
-    
-    return df
+
+# Mode debug (opsional): DASHBOARD_DEBUG=1 atau ?debug=1 di URL. Setiap tahap
+# data, roll-up, tab, dan grafik diukur lalu ditampilkan di panel sidebar dan
+# ditambahkan ke log JSON Lines untuk dianalisis offline.
+DEBUG = os.environ.get("DASHBOARD_DEBUG") == "1" or st.query_params.get("debug") == "1"
+DEBUG_LOG = "data/logs/dashboard_debug.jsonl"
+profiler = Profiler(enabled=DEBUG, cache_counters=result_cache.thread_counters)
 
 def get_indonesian_day_order():
     """Mengembalikan urutan hari dalam Bahasa Indonesia"""
@@ -60,44 +35,119 @@ def get_indonesian_month_order():
     return ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 
             'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
 
-@st.cache_data
-def load_data():
-    df_qris = pd.read_excel("data/transaksi_qris.xlsx", skiprows=1)
-    df_manual = pd.read_excel("data/transaksi_manual.xlsx", skiprows=1)
-    df = clean_and_merge_transaksi(df_qris, df_manual)
-    
-    # Tambahkan kolom hari dan bulan dalam Bahasa Indonesia
-    df = convert_to_indonesian(df)
-    
-    return df
+@st.cache_resource
+def start_precompute():
+    # Satu worker per proses: build awal di sini, selanjutnya file di data/
+    # dipantau dan versi baru (snapshot, cube, indeks, roll-up filter default)
+    # disiapkan di background lalu dipublikasikan sekaligus.
+    return precompute.start_worker(DEFAULT_BACKEND)
 
-df = load_data()
+with profiler.section("load_data", kind="stage") as record:
+    worker = start_precompute()
+    # Dibaca sekali per rerun: rerun ini memakai satu versi data dari awal
+    # sampai akhir walaupun worker mempublikasikan versi baru di tengah jalan
+    data = worker.current
+    snapshot_info = data.info
+    df, data_cube, backend = data.frame, data.cube, data.backend
+    df_time_index, df_bitmaps = data.df_time_index, data.df_bitmaps
+    cube_time_index, cube_bitmaps = data.cube_time_index, data.cube_bitmaps
+    record["rows"] = len(df)
+
+def format_tanggal(tanggal):
+    """Tanggal dalam format Indonesia, mis. 16 Desember 2023"""
+    return f"{tanggal.day} {get_indonesian_month_order()[tanggal.month - 1]} {tanggal.year}"
+
+# Rentang data mengikuti partisi yang tersimpan, tidak ditulis tetap
+min_date, max_date = df["tanggal_jam"].iloc[0].date(), df["tanggal_jam"].iloc[-1].date()
+st.subheader(f"{format_tanggal(min_date)} - {format_tanggal(max_date)}")
 
 # --- Sidebar Filter ---
 st.sidebar.header("🔍 Filter Data")
-min_date, max_date = df["tanggal_jam"].min().date(), df["tanggal_jam"].max().date()
+# Partisi bulanan hanya ada untuk backend DuckDB
+partisi = f"{len(data.partitions['parts'])} partisi bulanan · " if data.partitions else ""
+st.sidebar.caption(
+    f"🗄️ Snapshot {snapshot_info['status'].upper()} · {snapshot_info['rows']:,} baris · "
+    f"{snapshot_info['seconds']:.2f} detik · {partisi}"
+    f"diperbarui {data.published:%d/%m %H:%M}"
+)
+if worker.status["state"] == "building":
+    st.sidebar.caption("⏳ Data baru sedang diproses, tampilan memakai versi sebelumnya.")
+elif worker.status["state"] == "error":
+    st.sidebar.warning(f"⚠️ Data baru gagal diproses: {worker.status['error']}")
 start_date = st.sidebar.date_input("Mulai Tanggal", min_value=min_date, max_value=max_date, value=min_date)
 end_date = st.sidebar.date_input("Sampai Tanggal", min_value=min_date, max_value=max_date, value=max_date)
 if start_date > end_date: st.sidebar.error("❌ Tanggal tidak valid."); st.stop()
 
 metode = st.sidebar.multiselect("Metode Pembayaran", df["metode_pembayaran"].unique(), df["metode_pembayaran"].unique())
 status = st.sidebar.multiselect("Status Transaksi", df["status"].unique(), df["status"].unique())
+campaign_pilihan = st.sidebar.multiselect(
+    "Campaign", sorted(df_bitmaps.values["nama_campaign"]), placeholder="Semua campaign"
+)
+donatur_pilihan = st.sidebar.multiselect(
+    "Donatur", sorted(df_bitmaps.values["nama_donatur"]), placeholder="Semua donatur"
+)
 
 # --- Apply Filters ---
-df_filtered = df[
-    (df["tanggal_jam"].dt.date >= start_date) &
-    (df["tanggal_jam"].dt.date <= end_date)
-]
-if metode:
-    df_filtered = df_filtered[df_filtered["metode_pembayaran"].isin(metode)]
-if status:
-    df_filtered = df_filtered[df_filtered["status"].isin(status)]
+# Pilihan kosong berarti tidak difilter
+selections = {
+    "metode_pembayaran": metode,
+    "status": status,
+    "nama_campaign": campaign_pilihan,
+    "nama_donatur": donatur_pilihan,
+}
+with profiler.section("apply_filters", kind="stage") as record:
+    df_filtered = apply_filters(df, start_date, end_date, selections, df_time_index, df_bitmaps)
+    record["rows"] = len(df_filtered)
+
+# Semua agregasi tab di bawah dihitung oleh backend query (pandas di atas cube,
+# atau DuckDB di atas snapshot Parquet) dan di-cache per (versi data, filter)
+filter_key = result_cache.filter_key(start_date, end_date, selections, cube_bitmaps.values)
+
+def rollup(name):
+    """Hasil cube.<name> untuk filter aktif"""
+    with profiler.section(f"rollup:{name}", kind="rollup") as record:
+        result = result_cache.cached_result(backend, name, snapshot_info["key"], filter_key)
+        if isinstance(result, (pd.DataFrame, pd.Series)):
+            record["rows"] = len(result)
+    return result
+
+ringkasan = rollup("summary")
+if ringkasan["trx"] == 0: st.warning("⚠️ Tidak ada transaksi yang sesuai dengan filter."); st.stop()
+
+hasil_cache = result_cache.cache_stats()
+st.sidebar.caption(
+    f"⚡ Backend {backend.name} · cache analitik: {hasil_cache['hits']:,} hit · {hasil_cache['misses']:,} miss "
+    f"({hasil_cache['hit_rate']:.0%}, {hasil_cache['disk_hits']:,} dari disk)"
+)
+
+def plotly_chart(fig, **kwargs):
+    """
+    st.plotly_chart untuk semua grafik dashboard: figure besar diubah ke WebGL,
+    di-downsample, atau diagregasi (lihat chart_render; hasilnya di-cache di
+    disk) sebelum dikirim, dan diukur (serialisasi Plotly termasuk) saat mode debug
+    """
+    with profiler.section(f"plotly:{fig.layout.title.text or 'grafik'}", kind="chart") as record:
+        fig = cached_optimize_figure(fig)
+        if profiler.enabled:
+            record["rows"] = sum(len(trace.x) for trace in fig.data if getattr(trace, "x", None) is not None)
+            record["payload_kb"] = round(payload_kb(fig), 1)
+        st.plotly_chart(fig, **kwargs)
 
 def format_rupiah(val):
     return f"Rp {val:,.0f}".replace(",", ".")
 
-def export_csv(data):
-    return data.to_csv(index=False).encode("utf-8")
+def export_button(label, name, build, fmt="csv", file_name=None):
+    """
+    Tombol download yang isinya baru dibuat saat diklik (`build()` tidak
+    dipanggil di setiap rerun), ditulis per chunk, dan di-cache per filter
+    """
+    st.download_button(
+        label,
+        data=lambda: exports.export_bytes(name, fmt, snapshot_info["key"], filter_key, build),
+        file_name=f"{file_name or name}.{fmt}",
+        mime=exports.MIME_TYPES[fmt],
+        key=f"export_{name}_{fmt}",
+    )
 
 def calculate_growth_rate(current, previous):
     """Menghitung persentase pertumbuhan"""
@@ -116,21 +166,17 @@ def get_performance_insight(value, benchmark, metric_name):
     else:
         return f"🔴 {metric_name} menunjukkan performa PERLU PERBAIKAN (di bawah rata-rata)"
 
-# --- Tabs ---
-tabs = st.tabs([
-    "📌 Ringkasan Utama", "👥 Donatur", "📊 Transaksi Keseluruhan",
-    "📅 Transaksi Harian", "📆 Transaksi Bulanan", "📈 Tren Campaign"
-])
-
 # === 📌 Ringkasan Utama ===
-with tabs[0]:
+def render_ringkasan():
+    """Tab ringkasan utama: metrik, status, dan metode pembayaran"""
     st.subheader("📌 Ringkasan Utama")
     
     # Metrics utama
-    total = int(df_filtered["total_donasi"].sum())
-    trx = len(df_filtered)
-    unik = df_filtered["nama_donatur"].nunique()
-    campaign = df_filtered["nama_campaign"].nunique()
+    total = ringkasan["total"]
+    trx = ringkasan["trx"]
+    unik = ringkasan["unik"]
+    campaign = ringkasan["campaign"]
+    per_status = rollup("total_by_status")
     
     # Hitung rata-rata donasi per transaksi
     avg_per_trx = total / trx if trx > 0 else 0
@@ -153,7 +199,7 @@ with tabs[0]:
         loyalty_rate = (trx / unik) if unik > 0 else 0
         st.metric("🔄 Tingkat Loyalitas", f"{loyalty_rate:.1f}x")
     with col7:
-        success_rate = len(df_filtered[df_filtered["status"] == "Berhasil"]) / trx * 100 if trx > 0 else 0
+        success_rate = per_status["jumlah_transaksi"].get("Berhasil", 0) / trx * 100 if trx > 0 else 0
         st.metric("✅ Tingkat Keberhasilan", f"{success_rate:.1f}%")
     with col8:
         avg_per_campaign = total / campaign if campaign > 0 else 0
@@ -163,11 +209,7 @@ with tabs[0]:
     st.subheader("📊 Analisis Status Transaksi per Metode Pembayaran")
     
     # Hitung jumlah transaksi berdasarkan status dan metode
-    status_metode = (
-        df_filtered.groupby(["metode_pembayaran", "status"])
-        .size()
-        .reset_index(name="jumlah")
-    )
+    status_metode = rollup("status_per_metode")
 
     # Buat stacked bar chart dengan styling yang lebih baik
     fig_status = px.bar(
@@ -188,15 +230,13 @@ with tabs[0]:
         yaxis_title="Jumlah Transaksi",
         showlegend=True
     )
-    st.plotly_chart(fig_status, use_container_width=True)
+    plotly_chart(fig_status, use_container_width=True)
 
     # Analisis dan insight yang lebih mendalam
     st.markdown("#### 🔍 Insight Analisis Status Transaksi:")
     
     # Hitung tingkat keberhasilan per metode
-    success_by_method = df_filtered.groupby("metode_pembayaran").apply(
-        lambda x: (x["status"] == "Berhasil").sum() / len(x) * 100
-    ).reset_index(name="success_rate")
+    success_by_method = rollup("success_rate_per_metode")
     
     best_method = success_by_method.loc[success_by_method["success_rate"].idxmax()]
     worst_method = success_by_method.loc[success_by_method["success_rate"].idxmin()]
@@ -217,7 +257,7 @@ with tabs[0]:
         st.error(f"🔧 **Perbaiki Segera {worst_method['metode_pembayaran']}**: Tingkat kegagalan tinggi dapat menurunkan kepercayaan donatur. Lakukan audit teknis sistem pembayaran.")
     
     # Tindakan konkret berdasarkan data
-    pending_total = df_filtered[df_filtered["status"] == "Pending"]["total_donasi"].sum()
+    pending_total = per_status["total_donasi"].get("Pending", 0)
     if pending_total > 0:
         st.warning(f"💰 **Potensi Kehilangan**: Rp {pending_total:,.0f} dalam status pending. Segera follow-up transaksi pending untuk mengoptimalkan revenue.")
 
@@ -225,8 +265,7 @@ with tabs[0]:
     st.subheader("💳 Popularitas Metode Pembayaran")
     
     # Hitung frekuensi dan persentase
-    metode_freq = df_filtered["metode_pembayaran"].value_counts().reset_index()
-    metode_freq.columns = ["Metode Pembayaran", "Jumlah Transaksi"]
+    metode_freq = rollup("metode_frequency")
     metode_freq["Persentase"] = (metode_freq["Jumlah Transaksi"] / metode_freq["Jumlah Transaksi"].sum() * 100).round(1)
 
     # Dual chart: Bar + Pie
@@ -244,7 +283,7 @@ with tabs[0]:
             color_continuous_scale="viridis"
         )
         fig_bar.update_traces(texttemplate='%{text}%', textposition="outside")
-        st.plotly_chart(fig_bar, use_container_width=True)
+        plotly_chart(fig_bar, use_container_width=True)
     
     with col2:
         fig_pie = px.pie(
@@ -254,7 +293,7 @@ with tabs[0]:
             title="Distribusi Market Share Metode Pembayaran",
             hole=0.4
         )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        plotly_chart(fig_pie, use_container_width=True)
 
     # Market dominance analysis
     dominant_method = metode_freq.iloc[0]
@@ -276,11 +315,7 @@ with tabs[0]:
     st.subheader("👥 Pola Preferensi Donatur")
     
     # Analisis preferensi per donatur
-    preferensi = (
-        df_filtered.groupby(["nama_donatur", "metode_pembayaran"])
-        .size()
-        .reset_index(name="jumlah")
-    )
+    preferensi = rollup("donatur_per_metode")
     
     preferensi_top = (
         preferensi.sort_values("jumlah", ascending=False)
@@ -301,7 +336,7 @@ with tabs[0]:
         color_continuous_scale="plasma"
     )
     fig_pref.update_traces(texttemplate='%{text}%', textposition="outside")
-    st.plotly_chart(fig_pref, use_container_width=True)
+    plotly_chart(fig_pref, use_container_width=True)
     
     # Analisis loyalitas donatur
     multi_method_users = preferensi.groupby("nama_donatur")["metode_pembayaran"].nunique()
@@ -320,11 +355,7 @@ with tabs[0]:
     # === GRAFIK 4: Perbandingan Value Donasi per Metode ===
     st.subheader("💰 Analisis Value Donasi per Metode")
     
-    donasi_stats = df_filtered.groupby("metode_pembayaran").agg({
-        "total_donasi": ["sum", "mean", "count"]
-    }).round(2)
-    donasi_stats.columns = ["Total Donasi", "Rata-rata Donasi", "Jumlah Transaksi"]
-    donasi_stats = donasi_stats.reset_index()
+    donasi_stats = rollup("metode_stats")
     
     # Multi-metric comparison chart
     fig_comparison = go.Figure()
@@ -356,7 +387,7 @@ with tabs[0]:
         yaxis2=dict(title="Rata-rata per Transaksi (Ribu Rp)", side="right", overlaying="y"),
         legend=dict(x=0.01, y=0.99)
     )
-    st.plotly_chart(fig_comparison, use_container_width=True)
+    plotly_chart(fig_comparison, use_container_width=True)
     
     # Value-based insights
     highest_value_method = donasi_stats.loc[donasi_stats["Rata-rata Donasi"].idxmax()]
@@ -375,8 +406,8 @@ with tabs[0]:
     st.subheader("🎯 Rekomendasi Strategis Berbasis Data")
     
     # Calculate key performance indicators
-    total_pending_value = df_filtered[df_filtered["status"] == "Pending"]["total_donasi"].sum()
-    total_success_value = df_filtered[df_filtered["status"] == "Berhasil"]["total_donasi"].sum()
+    total_pending_value = per_status["total_donasi"].get("Pending", 0)
+    total_success_value = per_status["total_donasi"].get("Berhasil", 0)
     pending_percentage = (total_pending_value / (total_pending_value + total_success_value) * 100) if (total_pending_value + total_success_value) > 0 else 0
     
     # Strategic recommendations based on data analysis
@@ -425,53 +456,53 @@ with tabs[0]:
                 st.write("- Program loyalty points atau reward")
                 st.write("- Personalisasi komunikasi berdasarkan preferensi donatur")
 
-    # Download section
+    # Download section: file dibuat saat tombol diklik, bukan di setiap rerun
     st.subheader("📥 Export Data")
-    col1, col2, col3 = st.columns(3)
+    format_export = st.radio(
+        "Format file", ["csv", "xlsx", "parquet"], format_func=str.upper, horizontal=True, key="format_export"
+    )
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.download_button("📊 Export Summary", export_csv(df_filtered), "summary_donasi.csv", "text/csv")
+        export_button("📊 Export Summary", "summary_donasi", lambda: df_filtered, format_export)
     with col2:
-        st.download_button("📈 Export Analytics", export_csv(donasi_stats), "analytics_metode.csv", "text/csv")
+        export_button("📈 Export Analytics", "analytics_metode", lambda: donasi_stats, format_export)
     with col3:
-        st.download_button("👥 Export Donatur", export_csv(preferensi_count), "preferensi_donatur.csv", "text/csv")
+        export_button("👥 Export Donatur", "preferensi_donatur", lambda: preferensi_count, format_export)
+    with col4:
+        export_button(
+            "📑 Laporan Excel",
+            "laporan_donasi",
+            lambda: {
+                "Ringkasan": pd.DataFrame([ringkasan]).rename(columns={
+                    "total": "Total Donasi", "trx": "Jumlah Transaksi",
+                    "unik": "Donatur Unik", "campaign": "Campaign Aktif",
+                }),
+                "Status": per_status.reset_index(),
+                "Metode": donasi_stats,
+                "Preferensi Donatur": preferensi_count,
+                "Transaksi": df_filtered,
+            },
+            "xlsx",
+        )
 
 
 # === 👥 DONATUR ANALYSIS ===
-with tabs[1]:
+def render_donatur():
+    """Tab analisis donatur"""
     st.subheader("👥 Analisis Mendalam Profil Donatur")
     
     # Segmentasi donatur berdasarkan total donasi
-    donatur_stats = df_filtered.groupby("nama_donatur").agg({
-        "total_donasi": "sum",
-        "nama_campaign": "count",
-        "metode_pembayaran": lambda x: x.mode().iloc[0] if not x.empty else "Unknown"
-    }).reset_index()
-    donatur_stats.columns = ["Nama Donatur", "Total Donasi", "Jumlah Transaksi", "Metode Favorit"]
+    donatur_stats = rollup("donatur_stats")
     donatur_stats = donatur_stats.sort_values("Total Donasi", ascending=False)
     
-    # Segmentasi donatur
-    q75 = donatur_stats["Total Donasi"].quantile(0.75)
-    q50 = donatur_stats["Total Donasi"].quantile(0.50)
-    q25 = donatur_stats["Total Donasi"].quantile(0.25)
-    
-    def categorize_donor(amount):
-        if amount >= q75:
-            return "🌟 Premium Donor"
-        elif amount >= q50:
-            return "💎 Gold Donor" 
-        elif amount >= q25:
-            return "🥈 Silver Donor"
-        else:
-            return "🥉 Bronze Donor"
-    
-    donatur_stats["Kategori"] = donatur_stats["Total Donasi"].apply(categorize_donor)
+    # Segmentasi donatur (tier + segmen perilaku) dalam satu lintasan vektor
+    with profiler.section("segmentasi") as record:
+        donatur_stats = segment_donatur(donatur_stats)
+        record["rows"] = len(donatur_stats)
     
     # Dashboard donatur
     col1, col2, col3, col4 = st.columns(4)
-    premium_count = len(donatur_stats[donatur_stats["Kategori"] == "🌟 Premium Donor"])
-    gold_count = len(donatur_stats[donatur_stats["Kategori"] == "💎 Gold Donor"])
-    silver_count = len(donatur_stats[donatur_stats["Kategori"] == "🥈 Silver Donor"])
-    bronze_count = len(donatur_stats[donatur_stats["Kategori"] == "🥉 Bronze Donor"])
+    premium_count, gold_count, silver_count, bronze_count = tier_counts(donatur_stats).tolist()
     
     with col1:
         st.metric("🌟 Premium Donors", premium_count)
@@ -499,12 +530,14 @@ with tabs[1]:
     )
     
     # Pareto Analysis (80/20 rule)
-    donatur_stats_sorted = donatur_stats.sort_values("Total Donasi", ascending=False)
-    donatur_stats_sorted["Cumulative %"] = (donatur_stats_sorted["Total Donasi"].cumsum() / total_all_donations * 100)
-    
-    # Find 80% contributors
-    pareto_80_count = len(donatur_stats_sorted[donatur_stats_sorted["Cumulative %"] <= 80])
-    pareto_80_percentage = (pareto_80_count / len(donatur_stats_sorted) * 100)
+    with profiler.section("pareto") as record:
+        donatur_stats_sorted = donatur_stats.sort_values("Total Donasi", ascending=False)
+        donatur_stats_sorted["Cumulative %"] = (donatur_stats_sorted["Total Donasi"].cumsum() / total_all_donations * 100)
+        
+        # Find 80% contributors
+        pareto_80_count = len(donatur_stats_sorted[donatur_stats_sorted["Cumulative %"] <= 80])
+        pareto_80_percentage = (pareto_80_count / len(donatur_stats_sorted) * 100)
+        record["rows"] = len(donatur_stats_sorted)
     
     st.markdown("#### 📊 Analisis Pareto (80/20 Rule)")
     col1, col2 = st.columns(2)
@@ -537,44 +570,66 @@ with tabs[1]:
             "Total Donasi": "Total Kontribusi (Rp)"
         }
     )
-    st.plotly_chart(fig_scatter, use_container_width=True)
-    
-    # Behavioral insights
-    high_freq_low_value = donatur_stats[
-        (donatur_stats["Jumlah Transaksi"] >= donatur_stats["Jumlah Transaksi"].quantile(0.75)) & 
-        (donatur_stats["Total Donasi"] <= donatur_stats["Total Donasi"].quantile(0.5))
-    ]
-    
-    low_freq_high_value = donatur_stats[
-        (donatur_stats["Jumlah Transaksi"] <= donatur_stats["Jumlah Transaksi"].quantile(0.5)) & 
-        (donatur_stats["Total Donasi"] >= donatur_stats["Total Donasi"].quantile(0.75))
-    ]
+    plotly_chart(fig_scatter, use_container_width=True)
     
+    # Behavioral insights (dihitung di segment_donatur)
     st.markdown("#### 🎯 Segmentasi Perilaku Donatur:")
     
     col1, col2 = st.columns(2)
     with col1:
-        st.info(f"🔄 **Frequent Small Donors**: {len(high_freq_low_value)} donatur")
+        st.info(f"🔄 **Frequent Small Donors**: {donatur_stats['Frequent Small'].sum()} donatur")
         st.write("Karakteristik: Sering berdonasi dengan nominal kecil")
         st.write("💡 **Strategi**: Program micro-donation, gamifikasi")
         
     with col2:
-        st.success(f"💎 **Occasional Big Donors**: {len(low_freq_high_value)} donatur")
+        st.success(f"💎 **Occasional Big Donors**: {donatur_stats['Occasional Big'].sum()} donatur")
         st.write("Karakteristik: Jarang berdonasi tapi nominal besar")
         st.write("💡 **Strategi**: VIP treatment, exclusive updates")
+    
+    # RFM: Recency (hari sejak donasi terakhir, dihitung dari akhir filter
+    # tanggal), Frequency, dan Monetary, masing-masing skor 1-5
+    st.subheader("🧭 Segmentasi RFM (Recency, Frequency, Monetary)")
+    with profiler.section("rfm") as record:
+        rfm = rfm_scores(donatur_stats, pd.Timestamp(end_date) + pd.Timedelta(days=1))
+        segmen_rfm = rfm_summary(rfm)
+        record["rows"] = len(rfm)
+    
+    fig_rfm = px.bar(
+        segmen_rfm,
+        x="Segmen RFM",
+        y="Jumlah Donatur",
+        color="Total Donasi",
+        title="Jumlah Donatur per Segmen RFM",
+        color_continuous_scale="Blues"
+    )
+    plotly_chart(fig_rfm, use_container_width=True)
+    
+    st.dataframe(
+        segmen_rfm.style.format({
+            "Rata-rata Recency (hari)": "{:.0f}",
+            "Rata-rata Transaksi": "{:.1f}",
+            "Total Donasi": lambda x: format_rupiah(x),
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    with st.expander("📋 Skor RFM per Donatur"):
+        st.dataframe(
+            rfm[["Nama Donatur", "Segmen RFM", "Skor RFM", "Recency (hari)", "Jumlah Transaksi", "Total Donasi"]]
+            .sort_values(["Skor RFM", "Total Donasi"], ascending=False),
+            use_container_width=True,
+            hide_index=True
+        )
 
 
 # === 📊 TRANSAKSI KESELURUHAN ===
-with tabs[2]:
+def render_transaksi_keseluruhan():
+    """Tab transaksi keseluruhan"""
     st.subheader("📊 Analisis Komprehensif Transaksi Keseluruhan")
     
     # Time series analysis dengan trend line
-    df_filtered_sorted = df_filtered.sort_values("tanggal_jam")
-    daily_totals = df_filtered_sorted.groupby(df_filtered_sorted["tanggal_jam"].dt.date).agg({
-        "total_donasi": "sum",
-        "nama_donatur": "count"
-    }).reset_index()
-    daily_totals.columns = ["Tanggal", "Total Donasi", "Jumlah Transaksi"]
+    daily_totals = rollup("daily_totals")
     
     # Calculate moving averages
     daily_totals["MA_7"] = daily_totals["Total Donasi"].rolling(window=7, min_periods=1).mean()
@@ -617,7 +672,7 @@ with tabs[2]:
         yaxis_title="Total Donasi (Rp)",
         hovermode='x unified'
     )
-    st.plotly_chart(fig_trend, use_container_width=True)
+    plotly_chart(fig_trend, use_container_width=True)
     
     # Statistical analysis
     max_day = daily_totals.loc[daily_totals["Total Donasi"].idxmax()]
@@ -662,16 +717,12 @@ with tabs[2]:
     
     
 # === 📅 TRANSAKSI HARIAN ===
-with tabs[3]:
+def render_transaksi_harian():
+    """Tab transaksi harian dan pola per jam/hari"""
     st.subheader("📅 Analisis Mendalam Pola Transaksi Harian")
     
     # Buat data harian dengan insight yang lebih dalam
-    harian = df_filtered.groupby("hari").agg({
-        "total_donasi": ["sum", "mean", "count"],
-        "nama_donatur": "nunique"
-    }).round(2)
-    harian.columns = ["Total Donasi", "Rata-rata per Transaksi", "Jumlah Transaksi", "Donatur Unik"]
-    harian = harian.reset_index()
+    harian = rollup("hari_stats")
     
     # Urutkan berdasarkan urutan hari dalam seminggu
     day_order = get_indonesian_day_order()
@@ -710,7 +761,7 @@ with tabs[3]:
         yaxis2=dict(title="Jumlah Transaksi", side="right", overlaying="y"),
         legend=dict(x=0.01, y=0.99)
     )
-    st.plotly_chart(fig_daily, use_container_width=True)
+    plotly_chart(fig_daily, use_container_width=True)
     
     # Daily performance metrics
     max_day = harian.loc[harian["Total Donasi"].idxmax()]
@@ -769,12 +820,7 @@ with tabs[3]:
     # Hour-of-day analysis if timestamp available
     if "tanggal_jam" in df_filtered.columns:
         st.subheader("🕐 Analisis Pola Jam Donasi")
-        df_filtered["jam"] = df_filtered["tanggal_jam"].dt.hour
-        hourly_pattern = df_filtered.groupby("jam").agg({
-            "total_donasi": "sum",
-            "nama_donatur": "count"
-        }).reset_index()
-        hourly_pattern.columns = ["Jam", "Total Donasi", "Jumlah Transaksi"]
+        hourly_pattern = rollup("jam_stats")
         
         fig_hourly = px.line(
             hourly_pattern,
@@ -784,7 +830,7 @@ with tabs[3]:
             markers=True
         )
         fig_hourly.update_xaxes(tickmode='linear', tick0=0, dtick=2)
-        st.plotly_chart(fig_hourly, use_container_width=True)
+        plotly_chart(fig_hourly, use_container_width=True)
         
         # Peak hours analysis
         peak_hour = hourly_pattern.loc[hourly_pattern["Total Donasi"].idxmax()]
@@ -806,17 +852,12 @@ with tabs[3]:
 
 
 # === 📆 TRANSAKSI BULANAN ===
-with tabs[4]:
+def render_transaksi_bulanan():
+    """Tab transaksi bulanan"""
     st.subheader("📆 Analisis Strategis Pola Transaksi Bulanan")
     
     # Enhanced monthly analysis
-    bulanan = df_filtered.groupby("bulan").agg({
-        "total_donasi": ["sum", "mean", "count"],
-        "nama_donatur": "nunique",
-        "nama_campaign": "nunique"
-    }).round(2)
-    bulanan.columns = ["Total Donasi", "Rata-rata per Transaksi", "Jumlah Transaksi", "Donatur Unik", "Campaign Aktif"]
-    bulanan = bulanan.reset_index()
+    bulanan = rollup("bulan_stats")
     
     # Calculate additional metrics
     bulanan["Donasi per Donatur"] = bulanan["Total Donasi"] / bulanan["Donatur Unik"]
@@ -860,7 +901,7 @@ with tabs[4]:
         legend=dict(x=0.01, y=0.99)
     )
     fig_monthly.update_xaxes(tickangle=45)
-    st.plotly_chart(fig_monthly, use_container_width=True)
+    plotly_chart(fig_monthly, use_container_width=True)
     
     # Monthly performance dashboard
     best_month = bulanan.loc[bulanan["Total Donasi"].idxmax()]
@@ -901,7 +942,7 @@ with tabs[4]:
             title="Distribusi Donasi per Musim",
             hole=0.4
         )
-        st.plotly_chart(fig_seasonal, use_container_width=True)
+        plotly_chart(fig_seasonal, use_container_width=True)
     
     with col2:
         st.markdown("**Insight Pola Musiman:**")
@@ -936,7 +977,7 @@ with tabs[4]:
     )
     fig_growth.update_xaxes(tickangle=45)
     fig_growth.add_hline(y=0, line_dash="dash", line_color="black")
-    st.plotly_chart(fig_growth, use_container_width=True)
+    plotly_chart(fig_growth, use_container_width=True)
     
     # Growth insights
     positive_growth_months = bulanan_sorted[bulanan_sorted["MoM Growth"] > 0]
@@ -992,21 +1033,12 @@ with tabs[4]:
 
 # === 📈 TREN CAMPAIGN ===
 # === 📈 ANALISIS MENDALAM PERFORMA CAMPAIGN ===
-with tabs[5]:
+def render_tren_campaign():
+    """Tab tren dan performa campaign"""
     st.subheader("📈 Analisis Mendalam Performa Campaign")
     
     # Comprehensive campaign analysis
-    campaign_stats = df_filtered.groupby("nama_campaign").agg({
-        "total_donasi": ["sum", "mean", "count"],
-        "nama_donatur": ["nunique", "count"],
-        "tanggal_jam": ["min", "max"]
-    }).round(2)
-    
-    campaign_stats.columns = [
-        "Total Donasi", "Rata-rata per Transaksi", "Jumlah Transaksi",
-        "Donatur Unik", "Total Kontribusi", "Tanggal Mulai", "Tanggal Selesai"
-    ]
-    campaign_stats = campaign_stats.reset_index()
+    campaign_stats = rollup("campaign_stats")
     
     # Calculate campaign duration and efficiency metrics
     campaign_stats["Durasi (hari)"] = (campaign_stats["Tanggal Selesai"] - campaign_stats["Tanggal Mulai"]).dt.days + 1
@@ -1060,15 +1092,15 @@ with tabs[5]:
         yaxis_title="Nama Campaign",
         font=dict(size=12)
     )
-    st.plotly_chart(fig_campaign, use_container_width=True)
+    plotly_chart(fig_campaign, use_container_width=True)
     
     # Penjelasan Grafik 1
     with st.expander("💡 Penjelasan & Insight"):
         st.markdown(f"""
         **Analisis Performa Campaign:**
         - **Campaign Teratas:** {top_10_campaigns.iloc[0]['nama_campaign']} dengan total donasi {format_rupiah(top_10_campaigns.iloc[0]['Total Donasi'])}
-        - **Gap Performa:** Selisih antara campaign terbaik dan ke-10 adalah {format_rupiah(top_10_campaigns.iloc[0]['Total Donasi'] - top_10_campaigns.iloc[9]['Total Donasi'])}
-        - **Distribusi:** {'Terdapat kesenjangan besar' if (top_10_campaigns.iloc[0]['Total Donasi'] / top_10_campaigns.iloc[9]['Total Donasi']) > 5 else 'Distribusi relatif merata'} antar campaign top 10
+        - **Gap Performa:** Selisih antara campaign terbaik dan ke-10 adalah {format_rupiah(top_10_campaigns.iloc[0]['Total Donasi'] - top_10_campaigns.iloc[-1]['Total Donasi'])}
+        - **Distribusi:** {'Terdapat kesenjangan besar' if (top_10_campaigns.iloc[0]['Total Donasi'] / top_10_campaigns.iloc[-1]['Total Donasi']) > 5 else 'Distribusi relatif merata'} antar campaign top 10
         
         **Rekomendasi Strategis:**
         - 🎯 **Replikasi Sukses:** Pelajari strategi campaign teratas untuk diterapkan pada campaign lain
@@ -1097,7 +1129,7 @@ with tabs[5]:
         },
         height=500
     )
-    st.plotly_chart(fig_efficiency, use_container_width=True)
+    plotly_chart(fig_efficiency, use_container_width=True)
     
     # Penjelasan Grafik 2
     with st.expander("💡 Penjelasan & Insight"):
@@ -1146,7 +1178,7 @@ with tabs[5]:
     fig_engagement.add_vline(x=avg_conversion, line_dash="dash", line_color="red", 
                         annotation_text=f"Avg Conversion: {avg_conversion:.1f}%")
     
-    st.plotly_chart(fig_engagement, use_container_width=True)
+    plotly_chart(fig_engagement, use_container_width=True)
     
     # Penjelasan Grafik 3
     with st.expander("💡 Penjelasan & Insight"):
@@ -1204,7 +1236,7 @@ with tabs[5]:
     )
     
     fig_timeline.update_yaxes(autorange="reversed")
-    st.plotly_chart(fig_timeline, use_container_width=True)
+    plotly_chart(fig_timeline, use_container_width=True)
     
     # Penjelasan Grafik 4
     with st.expander("💡 Penjelasan & Insight"):
@@ -1351,18 +1383,90 @@ with tabs[5]:
             st.markdown(f"- [ ] {action}")
 
 
-    # Export data option
+    # Export data option: CSV dengan angka berformat ribuan, Excel/Parquet
+    # dengan angka asli
     st.markdown("---")
-    if st.button("📥 Download Detail Analisis Campaign", key="download_campaign"):
-        # Create comprehensive export data
+    st.markdown("#### 📥 Download Detail Analisis Campaign")
+    
+    def campaign_csv():
         export_data = campaign_stats.copy()
-        export_data['Total Donasi'] = export_data['Total Donasi'].apply(lambda x: f"{x:,.0f}")
-        export_data['Rata-rata per Transaksi'] = export_data['Rata-rata per Transaksi'].apply(lambda x: f"{x:,.0f}")
-        export_data['Donasi per Hari'] = export_data['Donasi per Hari'].apply(lambda x: f"{x:,.0f}")
-        
+        for column in ['Total Donasi', 'Rata-rata per Transaksi', 'Donasi per Hari']:
+            export_data[column] = exports.format_ribuan(export_data[column]).to_numpy()
+        return export_data
+    
+    nama_file = f"analisis_campaign_detail_{pd.Timestamp.now().strftime('%Y%m%d')}"
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        export_button("💾 Download CSV", "analisis_campaign", campaign_csv, "csv", nama_file)
+    with col2:
+        export_button("💾 Download Excel", "analisis_campaign", lambda: {"Campaign": campaign_stats}, "xlsx", nama_file)
+    with col3:
+        export_button("💾 Download Parquet", "analisis_campaign", lambda: campaign_stats, "parquet", nama_file)
+
+
+# --- Tabs ---
+# Setiap tab adalah satu fungsi render. Dengan on_change="rerun" Streamlit
+# mencatat tab yang aktif, jadi hanya agregasi dan grafik tab yang sedang
+# dilihat yang dihitung pada setiap interaksi.
+SECTIONS = {
+    "📌 Ringkasan Utama": render_ringkasan,
+    "👥 Donatur": render_donatur,
+    "📊 Transaksi Keseluruhan": render_transaksi_keseluruhan,
+    "📅 Transaksi Harian": render_transaksi_harian,
+    "📆 Transaksi Bulanan": render_transaksi_bulanan,
+    "📈 Tren Campaign": render_tren_campaign,
+}
+
+tabs = st.tabs(list(SECTIONS), key="tab_aktif", on_change="rerun")
+for tab, (label, render) in zip(tabs, SECTIONS.items()):
+    if tab.open:
+        with tab, profiler.section(f"tab:{label}", kind="tab"):
+            render()
+
+
+def render_debug_panel():
+    """Panel sidebar berisi hasil profiler rerun ini, lalu simpan ke log"""
+    context = {
+        "tab": st.session_state.get("tab_aktif"),
+        "backend": backend.name,
+        "data_key": snapshot_info["key"],
+        "filter": filter_key,
+    }
+    profiler.write_log(DEBUG_LOG, **context)
+
+    with st.sidebar.expander("🐞 Debug: performa rerun", expanded=True):
+        records = pd.DataFrame(profiler.summary())
+        total_detik = records.loc[records["depth"] == 0, "seconds"].sum()
+        per_rollup = records[records["kind"] == "rollup"]
+        st.caption(
+            f"⏱️ {total_detik:.3f} detik · cache {per_rollup['cache_hits'].sum():,} hit · "
+            f"{per_rollup['cache_misses'].sum():,} miss · "
+            f"RSS {current_rss_mb():,.0f} MB (puncak {peak_rss_mb():,.0f} MB)"
+        )
+        pool = executor.executor_stats()
+        st.caption(
+            f"🧮 Executor: {pool['workers']} proses · {pool['offloaded']:,} roll-up di pool · "
+            f"{pool['shared']:,} berbagi hasil (single-flight)"
+        )
+        disk = disk_cache.stats()
+        if "entries" in disk:
+            st.caption(
+                f"💽 Cache disk: {disk['entries']:,} entri · {disk['size_mb']:,.1f}/{disk['budget_mb']:,.0f} MB · "
+                f"{disk['hits']:,} hit · {disk['misses']:,} miss · {disk['evicted']:,} dihapus (LRU)"
+            )
+        records["bagian"] = ["· " * depth + section.rsplit("/", 1)[-1] for depth, section in zip(records["depth"], records["section"])]
+        st.dataframe(
+            records[["bagian", "seconds", "rows", "cache_hits", "cache_misses", "rss_delta_mb"]],
+            hide_index=True,
+            use_container_width=True,
+        )
         st.download_button(
-            label="💾 Download CSV",
-            data=export_data.to_csv(index=False),
-            file_name=f"analisis_campaign_detail_{pd.Timestamp.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv"
+            label="💾 Download log (JSON Lines)",
+            data=profiler.to_json_lines(**context),
+            file_name=f"debug_{profiler.run_id}.jsonl",
+            mime="application/json",
         )
+        st.caption(f"Log juga ditambahkan ke `{DEBUG_LOG}`")
+
+if profiler.enabled:
+    render_debug_panel()
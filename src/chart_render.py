@@ -0,0 +1,291 @@
+"""
+Rendering grafik Plotly yang tetap ringan pada data besar.
+
+Sebelum dikirim ke browser setiap figure diperiksa:
+
+- trace scatter dengan banyak titik diganti versi WebGL (`Scattergl`);
+- garis (mode "lines") di atas batas titik di-downsample dengan LTTB
+  (Largest-Triangle-Three-Buckets) yang mempertahankan puncak dan lembah;
+- scatter titik saja yang terlalu padat (mis. satu titik per donatur)
+  diagregasi di server menjadi heatmap kepadatan;
+- ukuran JSON figure dibatasi: jika masih di atas batas, jumlah titik atau
+  bin dikurangi bertahap. Batas ini hanya bisa dicapai lewat trace garis dan
+  scatter; trace lain (bar, pie, ...) tidak diubah, dan figure yang tetap di
+  atas batas dicatat sebagai peringatan di log.
+
+Batas-batasnya bisa diatur lewat environment variable DASHBOARD_CHART_*.
+Hasil optimasi figure besar disimpan (sebagai JSON) di cache disk, dengan
+kunci hash isi figure, sehingga grafik yang sama tidak diproses ulang, juga
+setelah server di-restart.
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+
+import disk_cache
+
+logger = logging.getLogger(__name__)
+
+# Trace scatter dengan titik lebih dari ini dirender dengan WebGL
+WEBGL_THRESHOLD = int(os.environ.get("DASHBOARD_CHART_WEBGL_POINTS", 2_000))
+# Jumlah titik maksimum per garis setelah LTTB
+MAX_LINE_POINTS = int(os.environ.get("DASHBOARD_CHART_MAX_POINTS", 2_000))
+# Scatter titik saja di atas jumlah ini diganti heatmap kepadatan
+DENSITY_THRESHOLD = int(os.environ.get("DASHBOARD_CHART_DENSITY_POINTS", 20_000))
+DENSITY_BINS = 60
+# Batas ukuran JSON per grafik
+MAX_PAYLOAD_KB = int(os.environ.get("DASHBOARD_CHART_MAX_KB", 2_048))
+
+# Atribut per titik yang ikut dipotong saat downsampling
+POINT_ATTRS = ["x", "y", "text", "hovertext", "customdata", "ids"]
+MARKER_ATTRS = ["size", "color", "symbol", "opacity"]
+
+
+def _as_float(values):
+    """Nilai sumbu (angka, tanggal, datetime) sebagai float untuk perhitungan"""
+    values = np.asarray(values)
+    if values.dtype.kind in "iufb":
+        return values.astype("float64")
+    return pd.to_datetime(values).to_numpy("datetime64[ns]").astype("int64").astype("float64")
+
+
+def lttb(x, y, threshold):
+    """
+    Indeks titik yang dipilih Largest-Triangle-Three-Buckets. Titik pertama
+    dan terakhir selalu dipilih; dari setiap bucket diambil titik yang
+    membentuk segitiga terbesar dengan titik terpilih sebelumnya dan rata-rata
+    bucket berikutnya.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = np.nan_to_num(np.asarray(y, dtype="float64"))
+    edges = np.linspace(1, n - 1, threshold - 1).astype("int64")
+    selected = np.empty(threshold, dtype="int64")
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def _n_points(trace):
+    x = getattr(trace, "x", None)
+    y = getattr(trace, "y", None)
+    values = x if x is not None else y
+    return 0 if values is None else len(values)
+
+
+def _take(props, index, n):
+    """Memotong semua atribut per titik (termasuk marker) ke `index`"""
+    for attr in POINT_ATTRS:
+        values = props.get(attr)
+        if values is not None and not isinstance(values, str) and len(values) == n:
+            props[attr] = np.asarray(values, dtype=object if attr == "customdata" else None)[index]
+    marker = props.get("marker") or {}
+    for attr in MARKER_ATTRS:
+        values = marker.get(attr)
+        if values is not None and not isinstance(values, (str, int, float)) and len(values) == n:
+            marker[attr] = np.asarray(values)[index]
+    return props
+
+
+def _trace_props(trace):
+    """
+    Properti trace yang diisi, sebagai dict. Array diambil apa adanya; tidak
+    seperti to_plotly_json() tidak ada deepcopy, yang mahal untuk array
+    objek seperti kolom tanggal.
+    """
+    props = {}
+    for name in trace:
+        value = trace[name]
+        if hasattr(value, "to_plotly_json"):
+            value = value.to_plotly_json()
+        if value is None or (isinstance(value, dict) and not value) or name == "type":
+            continue
+        props[name] = value
+    return props
+
+
+def _optimize_trace(trace, max_points):
+    # plotly.express sudah memakai scattergl di atas 1.000 titik
+    if trace.type not in ("scatter", "scattergl"):
+        return trace
+    n = _n_points(trace)
+    if n <= WEBGL_THRESHOLD:
+        return trace
+
+    props = _trace_props(trace)
+    mode = props.get("mode") or ("lines" if n > 20 else "lines+markers")
+    if "lines" in mode and n > max_points and props.get("x") is not None and props.get("y") is not None:
+        props = _take(props, lttb(props["x"], props["y"], max_points), n)
+    try:
+        return go.Scattergl(props)
+    except ValueError:
+        # Properti yang tidak didukung WebGL (mis. garis spline): tetap SVG
+        return go.Scatter(props)
+
+
+def _is_dense_scatter(fig):
+    markers_only = [
+        trace for trace in fig.data
+        if trace.type in ("scatter", "scattergl") and (trace.mode or "markers") == "markers"
+    ]
+    return (
+        markers_only
+        and len(markers_only) == len(fig.data)
+        and sum(_n_points(trace) for trace in markers_only) > DENSITY_THRESHOLD
+    )
+
+
+def _bin_edges(values, bins):
+    """Bin linear, atau logaritmik untuk data positif dengan rentang sangat lebar"""
+    low, high = values.min(), values.max()
+    if low > 0 and high / low > 1_000:
+        return np.geomspace(low, high, bins + 1), True
+    if low == high:
+        high = low + 1
+    return np.linspace(low, high, bins + 1), False
+
+
+def density_figure(fig, bins=DENSITY_BINS):
+    """
+    Scatter padat -> heatmap jumlah titik per bin, dihitung di server. Judul
+    dan label sumbu figure asal dipertahankan.
+    """
+    x = np.concatenate([_as_float(trace.x) for trace in fig.data])
+    y = np.concatenate([np.asarray(trace.y, dtype="float64") for trace in fig.data])
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y = x[valid], y[valid]
+
+    x_edges, x_log = _bin_edges(x, bins)
+    y_edges, y_log = _bin_edges(y, bins)
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    center = lambda edges, log: np.sqrt(edges[:-1] * edges[1:]) if log else (edges[:-1] + edges[1:]) / 2
+
+    density = go.Figure(go.Heatmap(
+        x=center(x_edges, x_log),
+        y=center(y_edges, y_log),
+        z=np.where(counts.T > 0, counts.T, np.nan),
+        colorscale="Viridis",
+        colorbar=dict(title="Jumlah"),
+        hovertemplate="x=%{x:,.0f}<br>y=%{y:,.0f}<br>Jumlah=%{z:,.0f}<extra></extra>",
+    ))
+    layout = fig.layout
+    density.update_layout(
+        title=f"{layout.title.text or ''} (kepadatan {len(x):,} titik)".strip(),
+        xaxis_title=layout.xaxis.title.text,
+        yaxis_title=layout.yaxis.title.text,
+    )
+    density.update_xaxes(type="log" if x_log else None)
+    density.update_yaxes(type="log" if y_log else None)
+    return density
+
+
+def payload_kb(fig):
+    """Ukuran JSON figure (KB) seperti yang dikirim ke browser"""
+    return len(fig.to_json()) / 1024
+
+
+def optimize_figure(fig, max_points=MAX_LINE_POINTS, max_payload_kb=MAX_PAYLOAD_KB):
+    """
+    Figure yang siap dikirim ke browser. Figure kecil dikembalikan apa adanya;
+    yang besar diubah ke WebGL, di-downsample, atau diagregasi menjadi heatmap
+    kepadatan, lalu diperkecil sampai JSON-nya di bawah `max_payload_kb`.
+
+    Hanya trace garis dan scatter yang diperkecil, dan paling jauh sampai 100
+    titik per garis (10 bin untuk heatmap). Jika JSON masih di atas batas
+    (mis. bar chart besar), figure tetap dikembalikan dan dicatat di log.
+    """
+    total = sum(_n_points(trace) for trace in fig.data)
+    if total <= WEBGL_THRESHOLD:
+        return fig
+
+    if _is_dense_scatter(fig):
+        bins = DENSITY_BINS
+        result = density_figure(fig, bins)
+        size = payload_kb(result)
+        while size > max_payload_kb and bins > 10:
+            bins //= 2
+            result = density_figure(fig, bins)
+            size = payload_kb(result)
+    else:
+        while True:
+            result = go.Figure(layout=fig.layout)
+            result.add_traces([_optimize_trace(trace, max_points) for trace in fig.data])
+            size = payload_kb(result)
+            if size <= max_payload_kb or max_points <= 100:
+                break
+            max_points //= 2
+
+    if size > max_payload_kb:
+        logger.warning(
+            "Grafik %.0f KB masih di atas batas %d KB (trace: %s)",
+            size, max_payload_kb, ", ".join(sorted({trace.type for trace in result.data})),
+        )
+    return result
+
+
+def _hash_values(digest, values):
+    values = np.asarray(values)
+    if values.dtype.kind in "biufcmM":
+        digest.update(values.dtype.str.encode("utf-8"))
+        digest.update(np.ascontiguousarray(values).tobytes())
+    else:
+        digest.update(pd.util.hash_array(values.astype(object).ravel()).tobytes())
+
+
+def figure_key(fig):
+    """Hash isi figure: array trace di-hash langsung, sisanya lewat JSON kecil"""
+    digest = hashlib.sha256()
+    for trace in fig.data:
+        props = _trace_props(trace)
+        digest.update(trace.type.encode("utf-8"))
+        for name, value in sorted(props.items()):
+            digest.update(name.encode("utf-8"))
+            if isinstance(value, (np.ndarray, pd.Series, pd.Index, list, tuple)) and len(value) > 32:
+                _hash_values(digest, value)
+            else:
+                digest.update(json.dumps(value, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(json.dumps(fig.layout.to_plotly_json(), sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Hasil di disk tidak berlaku lagi jika modul ini atau versi plotly berubah
+FIGURE_CODE_VERSION = disk_cache.code_version(sys.modules[__name__], plotly)
+
+
+def cached_optimize_figure(fig):
+    """
+    optimize_figure dengan hasil di cache disk. Figure kecil tidak diubah oleh
+    optimize_figure, jadi langsung dikembalikan tanpa menyentuh cache.
+    """
+    if sum(_n_points(trace) for trace in fig.data) <= WEBGL_THRESHOLD:
+        return fig
+    key = (figure_key(fig), MAX_LINE_POINTS, DENSITY_THRESHOLD, MAX_PAYLOAD_KB)
+    cached = disk_cache.get("figure", FIGURE_CODE_VERSION, key)
+    if cached is not disk_cache.MISS:
+        return pio.from_json(cached, skip_invalid=True)
+    result = optimize_figure(fig)
+    disk_cache.put("figure", FIGURE_CODE_VERSION, key, result.to_json())
+    return result
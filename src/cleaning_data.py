@@ -1,5 +1,8 @@
 import pandas as pd
-from import_data import load_data
+from parsers import parse_rupiah, parse_tanggal_indonesia
+
+# Naikkan versi ini setiap kali logika cleaning berubah agar snapshot lama tidak dipakai
+CLEANING_VERSION = "2"
 
 def clean_and_merge_transaksi(df_qris, df_manual):
     # Tambahkan kolom "Metode Pembayaran"
@@ -12,21 +15,8 @@ def clean_and_merge_transaksi(df_qris, df_manual):
     # Ganti nama kolom "Tanggal" menjadi "tanggal_jam"
     df_transaksi.rename(columns={"Tanggal": "tanggal_jam"}, inplace=True)
     
-    # Pastikan dalam bentuk string
-    df_transaksi["tanggal_jam"] = df_transaksi["tanggal_jam"].astype(str)
-    
-    # Ganti nama bulan Indonesia dengan angka agar bisa diparse
-    bulan_mapping = {
-        "Januari": "01", "Februari": "02", "Maret": "03", "April": "04",
-        "Mei": "05", "Juni": "06", "Juli": "07", "Agustus": "08",
-        "September": "09", "Oktober": "10", "November": "11", "Desember": "12"
-    }
-
-    for nama_bulan, angka_bulan in bulan_mapping.items():
-        df_transaksi["tanggal_jam"] = df_transaksi["tanggal_jam"].str.replace(nama_bulan, angka_bulan)
-
     # Konversi ke datetime
-    df_transaksi["tanggal_jam"] = pd.to_datetime(df_transaksi["tanggal_jam"], format="%d %m %Y %H:%M")
+    df_transaksi["tanggal_jam"] = parse_tanggal_indonesia(df_transaksi["tanggal_jam"])
 
     # Buat kolom tanggal (hanya tanggal tanpa jam)
     df_transaksi["tanggal"] = df_transaksi["tanggal_jam"].dt.date
@@ -35,13 +25,7 @@ def clean_and_merge_transaksi(df_qris, df_manual):
     df_transaksi.drop("No", axis=1, inplace=True)
     
     # Bersihkan Total Donasi
-    df_transaksi["Total Donasi"] = (
-        df_transaksi["Total Donasi"]
-        .astype(str)
-        .str.replace(r"\D", "", regex=True)
-        .replace("", "0")
-        .astype(int)
-    )
+    df_transaksi["Total Donasi"] = parse_rupiah(df_transaksi["Total Donasi"])
     
     # Hapus baris yang total_donasi nya 0
     df_transaksi = df_transaksi[df_transaksi["Total Donasi"] != 0]
@@ -84,14 +68,4 @@ def clean_and_merge_transaksi(df_qris, df_manual):
     return df_transaksi[[
         "tanggal_jam", "tanggal", "tahun", "bulan", "minggu", "hari", "jam",
         "nama_campaign", "nama_donatur", "total_donasi", "metode_pembayaran", "status"
-    ]] 
-
-
-# Panggil load_data() dari file import_data.py
-df_qris, df_manual = load_data() 
-
-# Lanjutkan proses cleaning
-df_clean = clean_and_merge_transaksi(df_qris, df_manual)
-
-# Simpan hasilnya
-df_clean.to_excel("data/data_bersih.xlsx", index=False)
+    ]]
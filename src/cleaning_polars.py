@@ -0,0 +1,167 @@
+"""
+Engine cleaning alternatif berbasis Polars.
+
+Hasilnya sama persis dengan `cleaning_data.clean_and_merge_transaksi` (12
+kolom, dtype, urutan baris, dan index yang sama), tetapi semua langkah
+(gabung, parse tanggal & nominal, bersihkan nama, filter, kolom kalender)
+disusun sebagai satu query plan lazy yang dieksekusi paralel oleh Polars,
+tanpa membuat kolom perantara berukuran penuh di setiap langkah.
+
+Polars adalah dependensi opsional: modul ini hanya diimport jika engine
+polars dipilih (mis. `python src/etl.py --engine polars`).
+"""
+import pandas as pd
+import polars as pl
+
+from parsers import BULAN_MAPPING
+
+OUTPUT_COLUMNS = [
+    "tanggal_jam", "tanggal", "tahun", "bulan", "minggu", "hari", "jam",
+    "nama_campaign", "nama_donatur", "total_donasi", "metode_pembayaran", "status"
+]
+
+
+HARI = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _per_unique(lf, column, expr, alias):
+    """
+    Menghitung `expr` sekali per nilai unik `column` lalu menggabungkannya
+    kembali ke setiap baris (seperti factorize di parsers.py). Export punya
+    sedikit nilai unik untuk tanggal, jam, dan nominal, jadi parse string yang
+    mahal tidak diulang jutaan kali.
+    """
+    tabel = lf.select(pl.col(column).unique()).with_columns(expr.alias(alias))
+    return lf.join(tabel, on=column, how="left", nulls_equal=True, maintain_order="left")
+
+
+def _rupiah(column):
+    """Ekspresi parse nominal Rupiah, sama dengan parsers.parse_rupiah"""
+    return (
+        pl.col(column).cast(pl.String)
+        .str.replace_all(r"[^\d,]", "")  # buang "Rp", spasi, dan titik ribuan
+        .str.replace_all(",", ".", literal=True)  # koma desimal -> titik
+        .cast(pl.Float64, strict=False)
+        .round(0).fill_null(0).cast(pl.Int64)
+    )
+
+
+def _parse_tanggal(lf, column):
+    """
+    Kolom `tanggal_jam` dari teks "26 Mei 2025 18:29", sama dengan
+    parsers.parse_tanggal_indonesia: bagian tanggal dan jam diparse terpisah
+    per nilai unik lalu dijumlahkan.
+    """
+    teks = pl.col(column).str.strip_chars()
+    # Teks kosong menjadi null (NaT), seperti di versi pandas
+    teks = pl.when(teks != "").then(teks)
+    lf = lf.with_columns(teks.str.head(-5).alias("_tgl"), teks.str.tail(5).alias("_jam"))
+    lf = _per_unique(
+        lf, "_tgl",
+        pl.col("_tgl").str.strip_chars()
+        .str.replace_many(list(BULAN_MAPPING), list(BULAN_MAPPING.values()))
+        .str.strptime(pl.Datetime("us"), "%d %m %Y"),
+        "_tgl_dt",
+    )
+    lf = _per_unique(
+        lf, "_jam",
+        pl.col("_jam").str.strip_chars().str.strptime(pl.Time, "%H:%M").cast(pl.Duration("us")),
+        "_jam_td",
+    )
+    return lf.with_columns((pl.col("_tgl_dt") + pl.col("_jam_td")).alias("tanggal_jam"))
+
+
+def clean_transaksi_lazy(lf_qris, lf_manual, numeric_donasi=False):
+    """
+    Query plan lazy untuk cleaning + merge export QRIS dan manual.
+
+    Kolom `_baris` berisi nomor baris hasil gabungan (sebelum filter), dipakai
+    sebagai index agar hasilnya sama dengan versi pandas.
+    """
+    lf = pl.concat(
+        [
+            lf_qris.with_columns(pl.lit("QRIS").alias("Metode Pembayaran")),
+            lf_manual.with_columns(pl.lit("Manual").alias("Metode Pembayaran")),
+        ],
+        how="diagonal_relaxed",
+    ).with_row_index("_baris")
+
+    if numeric_donasi:
+        lf = lf.with_columns(
+            pl.col("Total Donasi").cast(pl.Float64).round(0).fill_null(0).cast(pl.Int64).alias("total_donasi")
+        )
+    else:
+        lf = _per_unique(lf, "Total Donasi", _rupiah("Total Donasi"), "total_donasi")
+    lf = _parse_tanggal(lf, "Tanggal")
+
+    nama = (
+        pl.col("Nama Donatur").cast(pl.String).fill_null("Anonim")
+        .str.strip_chars()
+        .str.to_titlecase()
+    )
+    lf = _per_unique(
+        lf, "Nama Donatur",
+        pl.when(nama.str.to_lowercase() == "hamba allah").then(pl.lit("Anonim")).otherwise(nama),
+        "nama_donatur",
+    )
+    tanggal_jam = pl.col("tanggal_jam")
+
+    return (
+        lf.filter(
+            (pl.col("total_donasi") != 0)
+            & pl.col("Nama Campaign").ne_missing("-")
+        )
+        .select(
+            "_baris",
+            tanggal_jam,
+            tanggal_jam.dt.date().alias("tanggal"),
+            tanggal_jam.dt.year().alias("tahun"),
+            tanggal_jam.dt.month().cast(pl.Int32).alias("bulan"),
+            tanggal_jam.dt.week().cast(pl.UInt32).alias("minggu"),
+            tanggal_jam.dt.weekday().replace_strict(range(1, 8), HARI, return_dtype=pl.String).alias("hari"),
+            tanggal_jam.dt.hour().cast(pl.Int32).alias("jam"),
+            pl.col("Nama Campaign").alias("nama_campaign"),
+            "nama_donatur",
+            "total_donasi",
+            pl.col("Metode Pembayaran").alias("metode_pembayaran"),
+            pl.col("Status").replace("Belum Di Konfirmasi", "Pending")
+            .str.strip_chars()
+            .str.to_titlecase()
+            .alias("status"),
+        )
+    )
+
+
+def _to_polars(df, numeric_donasi):
+    """DataFrame export pandas -> LazyFrame (kolom teks sebagai String)"""
+    df = df.drop(columns="No", errors="ignore")
+    kolom = {column: df[column].astype("string") for column in df.columns if column != "Total Donasi"}
+    donasi = df["Total Donasi"]
+    if numeric_donasi:
+        kolom["Total Donasi"] = donasi
+    elif pd.api.types.is_numeric_dtype(donasi):
+        # Angka digabung dengan export lain yang berupa teks: tulis sebagai
+        # bilangan bulat agar terbaca sama oleh parse Rupiah
+        kolom["Total Donasi"] = donasi.round().astype("Int64").astype("string")
+    else:
+        kolom["Total Donasi"] = donasi.astype("string")
+    return pl.from_pandas(pd.DataFrame(kolom)).lazy()
+
+
+def clean_and_merge_transaksi_polars(df_qris, df_manual):
+    """Pengganti `clean_and_merge_transaksi` dengan engine Polars"""
+    numeric_donasi = all(
+        pd.api.types.is_numeric_dtype(df["Total Donasi"]) for df in (df_qris, df_manual)
+    )
+    hasil = clean_transaksi_lazy(
+        _to_polars(df_qris, numeric_donasi), _to_polars(df_manual, numeric_donasi),
+        numeric_donasi=numeric_donasi,
+    ).collect()
+
+    df = hasil.drop("_baris").to_pandas()
+    df.index = pd.Index(hasil["_baris"].to_numpy().astype("int64"))
+    df["tanggal"] = df["tanggal_jam"].dt.date
+    df["minggu"] = df["minggu"].astype("UInt32")
+    for column in ["hari", "nama_campaign", "nama_donatur", "metode_pembayaran", "status"]:
+        df[column] = df[column].astype("str")
+    return df[OUTPUT_COLUMNS]
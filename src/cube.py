@@ -0,0 +1,185 @@
+"""
+Cube agregat transaksi untuk dashboard.
+
+Cube menyimpan jumlah dan total donasi per kombinasi
+(tanggal, jam, campaign, donatur, metode, status). Semua agregasi tab
+dashboard bisa dihitung ulang dari cube ini (roll-up) tanpa menyentuh tabel
+transaksi, sehingga rerun saat filter berubah jauh lebih ringan.
+"""
+import pandas as pd
+
+# Grain cube. `hari` dan `bulan` ikut sebagai dimensi karena nilainya
+# ditentukan oleh `tanggal`, jadi tidak menambah jumlah baris cube.
+CUBE_DIMENSIONS = [
+    "tanggal", "jam", "hari", "bulan",
+    "nama_campaign", "nama_donatur", "metode_pembayaran", "status"
+]
+
+
+def build_cube(df):
+    """Membangun cube dari tabel transaksi bersih"""
+    # Nominal di skema ringkas bisa int32; jumlahkan sebagai int64 agar total
+    # per sel (dan semua roll-up di atasnya) tidak overflow
+    df = df.assign(total_donasi=df["total_donasi"].astype("int64"))
+    return (
+        df.groupby(CUBE_DIMENSIONS, observed=True, dropna=False, sort=False)
+        .agg(
+            total_donasi=("total_donasi", "sum"),
+            jumlah_transaksi=("total_donasi", "size"),
+            waktu_pertama=("tanggal_jam", "min"),
+            waktu_terakhir=("tanggal_jam", "max"),
+        )
+        .reset_index()
+        .sort_values("tanggal", kind="stable", ignore_index=True)
+    )
+
+
+def _sum_by(cube, by):
+    return cube.groupby(by, observed=True)[["total_donasi", "jumlah_transaksi"]].sum()
+
+
+def _nunique_by(cube, by, column):
+    return cube.groupby(by, observed=True)[column].nunique()
+
+
+def summary(cube):
+    """Metrik utama: total donasi, jumlah transaksi, donatur unik, campaign aktif"""
+    return {
+        "total": int(cube["total_donasi"].sum()),
+        "trx": int(cube["jumlah_transaksi"].sum()),
+        "unik": cube["nama_donatur"].nunique(),
+        "campaign": cube["nama_campaign"].nunique(),
+    }
+
+
+def total_by_status(cube):
+    """Total donasi dan jumlah transaksi per status"""
+    return _sum_by(cube, "status")
+
+
+def status_per_metode(cube):
+    """Jumlah transaksi per (metode, status)"""
+    return (
+        _sum_by(cube, ["metode_pembayaran", "status"])["jumlah_transaksi"]
+        .reset_index(name="jumlah")
+    )
+
+
+def success_rate_per_metode(cube):
+    """Persentase transaksi berhasil per metode pembayaran"""
+    per_metode = _sum_by(cube, "metode_pembayaran")["jumlah_transaksi"]
+    berhasil = (
+        _sum_by(cube[cube["status"] == "Berhasil"], "metode_pembayaran")["jumlah_transaksi"]
+        .reindex(per_metode.index, fill_value=0)
+    )
+    return (berhasil / per_metode * 100).reset_index(name="success_rate")
+
+
+def metode_frequency(cube):
+    """Jumlah transaksi per metode, urut dari yang terbanyak"""
+    freq = (
+        _sum_by(cube, "metode_pembayaran")["jumlah_transaksi"]
+        .sort_values(ascending=False, kind="stable")
+        .reset_index()
+    )
+    freq.columns = ["Metode Pembayaran", "Jumlah Transaksi"]
+    return freq
+
+
+def donatur_per_metode(cube):
+    """Jumlah transaksi per (donatur, metode)"""
+    return (
+        _sum_by(cube, ["nama_donatur", "metode_pembayaran"])["jumlah_transaksi"]
+        .reset_index(name="jumlah")
+    )
+
+
+def metode_stats(cube):
+    """Total, rata-rata, dan jumlah transaksi per metode"""
+    stats = _sum_by(cube, "metode_pembayaran")
+    stats = pd.DataFrame({
+        "Total Donasi": stats["total_donasi"],
+        "Rata-rata Donasi": stats["total_donasi"] / stats["jumlah_transaksi"],
+        "Jumlah Transaksi": stats["jumlah_transaksi"],
+    }).round(2)
+    return stats.reset_index()
+
+
+def donatur_stats(cube):
+    """Total donasi, jumlah transaksi, metode favorit, dan donasi terakhir per donatur"""
+    stats = _sum_by(cube, "nama_donatur")
+    terakhir = cube.groupby("nama_donatur", observed=True)["waktu_terakhir"].max()
+
+    # Metode favorit = metode dengan transaksi terbanyak (seri -> urutan abjad, seperti mode())
+    favorit = (
+        donatur_per_metode(cube)
+        .sort_values(["nama_donatur", "jumlah", "metode_pembayaran"], ascending=[True, False, True])
+        .drop_duplicates("nama_donatur")
+        .set_index("nama_donatur")["metode_pembayaran"]
+    )
+
+    result = pd.DataFrame({
+        "Total Donasi": stats["total_donasi"],
+        "Jumlah Transaksi": stats["jumlah_transaksi"],
+        "Metode Favorit": favorit.reindex(stats.index),
+        "Donasi Terakhir": terakhir,
+    }).reset_index()
+    result.columns = ["Nama Donatur", "Total Donasi", "Jumlah Transaksi", "Metode Favorit", "Donasi Terakhir"]
+    return result
+
+
+def daily_totals(cube):
+    """Total donasi dan jumlah transaksi per tanggal, urut kronologis"""
+    daily = _sum_by(cube, "tanggal").sort_index().reset_index()
+    daily.columns = ["Tanggal", "Total Donasi", "Jumlah Transaksi"]
+    if pd.api.types.is_datetime64_any_dtype(daily["Tanggal"]):
+        daily["Tanggal"] = daily["Tanggal"].dt.date
+    return daily
+
+
+def hari_stats(cube):
+    """Agregasi per nama hari (total, rata-rata, jumlah transaksi, donatur unik)"""
+    stats = _sum_by(cube, "hari")
+    result = pd.DataFrame({
+        "Total Donasi": stats["total_donasi"],
+        "Rata-rata per Transaksi": stats["total_donasi"] / stats["jumlah_transaksi"],
+        "Jumlah Transaksi": stats["jumlah_transaksi"],
+        "Donatur Unik": _nunique_by(cube, "hari", "nama_donatur"),
+    }).round(2)
+    return result.reset_index()
+
+
+def jam_stats(cube):
+    """Total donasi dan jumlah transaksi per jam"""
+    hourly = _sum_by(cube, "jam").reset_index()
+    hourly.columns = ["Jam", "Total Donasi", "Jumlah Transaksi"]
+    return hourly
+
+
+def bulan_stats(cube):
+    """Agregasi per nama bulan (total, rata-rata, transaksi, donatur & campaign unik)"""
+    stats = _sum_by(cube, "bulan")
+    result = pd.DataFrame({
+        "Total Donasi": stats["total_donasi"],
+        "Rata-rata per Transaksi": stats["total_donasi"] / stats["jumlah_transaksi"],
+        "Jumlah Transaksi": stats["jumlah_transaksi"],
+        "Donatur Unik": _nunique_by(cube, "bulan", "nama_donatur"),
+        "Campaign Aktif": _nunique_by(cube, "bulan", "nama_campaign"),
+    }).round(2)
+    return result.reset_index()
+
+
+def campaign_stats(cube):
+    """Agregasi per campaign termasuk tanggal transaksi pertama dan terakhir"""
+    grouped = cube.groupby("nama_campaign", observed=True)
+    stats = grouped[["total_donasi", "jumlah_transaksi"]].sum()
+    result = pd.DataFrame({
+        "Total Donasi": stats["total_donasi"],
+        "Rata-rata per Transaksi": stats["total_donasi"] / stats["jumlah_transaksi"],
+        "Jumlah Transaksi": stats["jumlah_transaksi"],
+        "Donatur Unik": grouped["nama_donatur"].nunique(),
+        "Total Kontribusi": stats["jumlah_transaksi"],
+    }).round(2)
+    result["Tanggal Mulai"] = grouped["waktu_pertama"].min()
+    result["Tanggal Selesai"] = grouped["waktu_terakhir"].max()
+    return result.reset_index()
@@ -0,0 +1,153 @@
+"""
+Cache hasil di disk (SQLite) yang tetap ada setelah server di-restart.
+
+Dipakai di bawah cache memori Streamlit: hasil roll-up per tab (lihat
+result_cache.py) dan JSON grafik besar yang sudah dioptimasi (lihat chart_render.py).
+Kunci entri adalah hash dari (namespace, versi kode, kunci pemanggil);
+pemanggil menyertakan kunci versi data (hash isi file sumber) dan filter.
+Versi kode dihitung dari isi file modul yang menghasilkan nilai tersebut,
+jadi perubahan kode otomatis membuat entri lama tidak terpakai lagi.
+
+Ukuran total dibatasi DASHBOARD_DISK_CACHE_MB (default 256 MB, 0 =
+nonaktif); jika terlampaui, entri yang paling lama tidak dibaca dihapus
+lebih dulu (LRU). Beberapa thread dan proses boleh memakai file yang sama
+(mode WAL).
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = "data/cache/results.sqlite"
+BUDGET_MB = float(os.environ.get("DASHBOARD_DISK_CACHE_MB", 256))
+# Setelah eviction ukuran total diturunkan sampai fraksi ini dari budget
+EVICT_TARGET = 0.9
+
+# Penanda cache miss (None bisa saja nilai yang valid)
+MISS = object()
+
+_local = threading.local()
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "writes": 0, "evicted": 0}
+
+
+def code_version(*modules):
+    """Hash isi file modul-modul `modules`: berubah setiap kali kodenya berubah"""
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+        digest.update(getattr(module, "__version__", "").encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _connect(path):
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    con = connections.get(path)
+    if con is None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        con = sqlite3.connect(path, timeout=30, isolation_level=None)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        con.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        connections[path] = con
+    return con
+
+
+def entry_key(namespace, version, key):
+    return hashlib.sha256(repr((namespace, version, key)).encode("utf-8")).hexdigest()
+
+
+def _count(name, amount=1):
+    with _lock:
+        _counters[name] += amount
+
+
+def get(namespace, version, key, path=CACHE_PATH):
+    """Nilai tersimpan untuk (namespace, version, key), atau MISS"""
+    if BUDGET_MB <= 0:
+        return MISS
+    con = _connect(path)
+    digest = entry_key(namespace, version, key)
+    row = con.execute("SELECT value FROM entries WHERE key = ?", (digest,)).fetchone()
+    if row is None:
+        _count("misses")
+        return MISS
+    con.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), digest))
+    _count("hits")
+    return pickle.loads(row[0])
+
+
+def put(namespace, version, key, value, path=CACHE_PATH, budget_mb=None):
+    """Menyimpan `value` lalu menghapus entri LRU jika ukuran melebihi budget"""
+    budget_mb = BUDGET_MB if budget_mb is None else budget_mb
+    if budget_mb <= 0:
+        return
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(blob) > budget_mb * 2**20 * EVICT_TARGET:
+        return  # lebih besar dari budget: tidak disimpan
+    now = time.time()
+    con = _connect(path)
+    con.execute(
+        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+        (entry_key(namespace, version, key), namespace, blob, len(blob), now, now),
+    )
+    _count("writes")
+    evict(budget_mb, path)
+
+
+def evict(budget_mb=None, path=CACHE_PATH):
+    """Menghapus entri yang paling lama tidak dibaca sampai total di bawah budget"""
+    budget = (BUDGET_MB if budget_mb is None else budget_mb) * 2**20
+    con = _connect(path)
+    total = con.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    if total <= budget:
+        return 0
+    # Satu statement (atomik): entri terbaru dipertahankan selama jumlah
+    # ukurannya masih di bawah target, sisanya dihapus
+    removed = con.execute(
+        """
+        DELETE FROM entries WHERE key IN (
+            SELECT key FROM (
+                SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS kumulatif FROM entries
+            ) WHERE kumulatif > ?
+        )
+        """,
+        (budget * EVICT_TARGET,),
+    ).rowcount
+    _count("evicted", removed)
+    return removed
+
+
+def stats(path=CACHE_PATH):
+    """Counter proses ini plus jumlah entri dan ukuran file cache"""
+    with _lock:
+        result = dict(_counters)
+    if BUDGET_MB > 0:
+        entries, size = _connect(path).execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        result.update(entries=entries, size_mb=size / 2**20, budget_mb=BUDGET_MB)
+    return result
+
+
+def clear(path=CACHE_PATH):
+    _connect(path).execute("DELETE FROM entries")
+    with _lock:
+        _counters.update(hits=0, misses=0, writes=0, evicted=0)
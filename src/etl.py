@@ -0,0 +1,262 @@
+"""
+Pipeline ETL data transaksi donasi.
+
+Contoh pemakaian (dari root repository):
+    python src/etl.py                     # proses ulang semua data -> data/data_bersih.parquet
+    python src/etl.py --format feather    # simpan sebagai Feather
+    python src/etl.py --excel             # tambahan data/data_bersih.xlsx
+    python src/etl.py --since             # hanya baris yang lebih baru dari run terakhir
+    python src/etl.py --since 2025-05-01  # hanya baris mulai setelah tanggal tertentu
+    python src/etl.py --incremental       # append + upsert ke store data/store (lihat ingest.py)
+    python src/etl.py --stream            # baca Excel per chunk, memori tetap kecil
+    python src/etl.py --engine polars     # cleaning dengan engine Polars lazy
+"""
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cleaning_data import clean_and_merge_transaksi
+from import_data import iter_excel_chunks, load_data
+from ingest import STORE_DIR, ingest
+from instrumentation import peak_rss_mb
+from parsers import parse_tanggal_indonesia
+
+STATE_FILE = "data/etl_state.json"
+
+
+@contextmanager
+def timed(stage, timings):
+    """Mencatat dan mencetak lama eksekusi sebuah tahap"""
+    start = time.perf_counter()
+    yield
+    timings[stage] = time.perf_counter() - start
+    print(f"[{stage}] {timings[stage]:.3f} detik")
+
+
+def read_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_state(state, path=STATE_FILE):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_output(path, fmt):
+    if fmt == "feather":
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+def write_output(df, path, fmt):
+    tmp_path = f"{path}.tmp"
+    if fmt == "feather":
+        df.reset_index(drop=True).to_feather(tmp_path)
+    else:
+        df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def rows_after(df_raw, since):
+    """Ambil hanya baris mentah dengan Tanggal setelah `since`"""
+    return df_raw[parse_tanggal_indonesia(df_raw["Tanggal"]) > since].copy()
+
+
+def resolve_since(since_arg, state):
+    """Menentukan batas waktu mode --since (dari argumen atau state run terakhir)"""
+    if since_arg is None:
+        return None
+    if since_arg == "last":
+        if "high_water" not in state:
+            print("Belum ada run sebelumnya, semua baris diproses.")
+            return None
+        return pd.Timestamp(state["high_water"])
+    return pd.Timestamp(since_arg)
+
+
+def run_incremental(args):
+    timings = {}
+    with timed("load", timings):
+        df_qris, df_manual = load_data(args.qris, args.manual)
+
+    with timed("ingest", timings):
+        stats = ingest(df_qris, df_manual, args.store_dir, pd.Timedelta(days=args.overlap_days))
+
+    print(
+        f"Selesai ({stats['mode']}): {stats['appended']:,} baris baru, {stats['updated']:,} status diperbarui, "
+        f"{stats['parts_rewritten']} part ditulis ulang -> {args.store_dir} ({sum(timings.values()):.3f} detik)"
+    )
+    return timings
+
+
+def clean_chunk(chunk, metode):
+    """Membersihkan satu chunk export dari satu sumber (QRIS / Manual)"""
+    kosong = chunk.iloc[0:0].copy()
+    if metode == "QRIS":
+        return clean_and_merge_transaksi(chunk, kosong)
+    return clean_and_merge_transaksi(kosong, chunk)
+
+
+def open_writer(path, schema, fmt):
+    if fmt == "feather":
+        return pa.ipc.new_file(path, schema)
+    return pq.ParquetWriter(path, schema)
+
+
+def stream_to_file(sources, output_path, fmt="parquet", chunksize=50_000):
+    """
+    Membaca setiap file sumber per chunk, membersihkannya, lalu langsung
+    menulisnya ke file kolumnar. Hanya satu chunk yang ada di memori.
+
+    `sources` berisi {metode: path}. Mengembalikan dict statistik run.
+    """
+    start = time.perf_counter()
+    tmp_path = f"{output_path}.tmp"
+    writer = schema = None
+    rows_in = rows_out = chunks = 0
+    try:
+        for metode, path in sources.items():
+            for chunk in iter_excel_chunks(path, chunksize):
+                rows_in += len(chunk)
+                chunks += 1
+                df_clean = clean_chunk(chunk, metode)
+                if df_clean.empty:
+                    continue
+                # Chunk pertama menentukan skema, chunk berikutnya disesuaikan
+                table = pa.Table.from_pandas(df_clean, schema=schema, preserve_index=False)
+                if writer is None:
+                    schema = table.schema
+                    writer = open_writer(tmp_path, schema, fmt)
+                writer.write_table(table)
+                rows_out += len(df_clean)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        os.replace(tmp_path, output_path)
+
+    seconds = time.perf_counter() - start
+    return {
+        "chunks": chunks,
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "seconds": seconds,
+        "rows_per_sec": rows_in / seconds if seconds > 0 else 0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_stream(args):
+    output_path = os.path.join(args.output_dir, f"data_bersih.{args.format}")
+    stats = stream_to_file(
+        {"QRIS": args.qris, "Manual": args.manual}, output_path, args.format, args.chunksize
+    )
+    print(
+        f"Selesai (stream): {stats['rows_out']:,} baris -> {output_path} | {stats['chunks']} chunk, "
+        f"{stats['rows_per_sec']:,.0f} baris/detik, puncak memori {stats['peak_rss_mb']:.0f} MB "
+        f"({stats['seconds']:.3f} detik)"
+    )
+    return stats
+
+
+def get_cleaner(engine="pandas"):
+    """Fungsi cleaning untuk engine yang dipilih (polars diimport hanya jika dipakai)"""
+    if engine == "polars":
+        from cleaning_polars import clean_and_merge_transaksi_polars
+        return clean_and_merge_transaksi_polars
+    return clean_and_merge_transaksi
+
+
+def run(args):
+    if args.incremental:
+        return run_incremental(args)
+    if args.stream:
+        return run_stream(args)
+
+    timings = {}
+    state = read_state(args.state_file)
+    output_path = os.path.join(args.output_dir, f"data_bersih.{args.format}")
+    since = resolve_since(args.since, state)
+
+    if since is not None and not os.path.exists(output_path):
+        print(f"{output_path} belum ada, semua baris diproses.")
+        since = None
+
+    with timed("load", timings):
+        df_qris, df_manual = load_data(args.qris, args.manual)
+
+    if since is not None:
+        with timed("filter_since", timings):
+            df_qris = rows_after(df_qris, since)
+            df_manual = rows_after(df_manual, since)
+        print(f"Baris baru setelah {since}: {len(df_qris) + len(df_manual):,}")
+
+    with timed(f"clean_{args.engine}", timings):
+        df_clean = get_cleaner(args.engine)(df_qris, df_manual)
+
+    if since is not None:
+        with timed("merge_existing", timings):
+            df_existing = read_output(output_path, args.format)
+            # Baris setelah `since` diganti hasil proses ulang agar tidak dobel
+            df_existing = df_existing[df_existing["tanggal_jam"] <= since]
+            df_clean = pd.concat([df_existing, df_clean], ignore_index=True)
+
+    with timed(f"write_{args.format}", timings):
+        write_output(df_clean, output_path, args.format)
+
+    if args.excel:
+        with timed("write_excel", timings):
+            df_clean.to_excel(os.path.join(args.output_dir, "data_bersih.xlsx"), index=False)
+
+    if not df_clean.empty:
+        state["high_water"] = df_clean["tanggal_jam"].max().isoformat()
+    state["last_run"] = pd.Timestamp.now().isoformat()
+    state["rows"] = len(df_clean)
+    write_state(state, args.state_file)
+
+    print(f"Selesai: {len(df_clean):,} baris -> {output_path} ({sum(timings.values()):.3f} detik)")
+    return timings
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="ETL data transaksi donasi SobatBerbagi")
+    parser.add_argument("--qris", default="data/transaksi_qris.xlsx", help="File export transaksi QRIS")
+    parser.add_argument("--manual", default="data/transaksi_manual.xlsx", help="File export transaksi manual")
+    parser.add_argument("--output-dir", default="data", help="Folder output data bersih")
+    parser.add_argument("--format", choices=["parquet", "feather"], default="parquet", help="Format output kolumnar")
+    parser.add_argument("--excel", action="store_true", help="Tulis juga data_bersih.xlsx (lambat)")
+    parser.add_argument(
+        "--since", nargs="?", const="last", default=None,
+        help="Hanya proses baris setelah tanggal ini (tanpa nilai: setelah run terakhir)"
+    )
+    parser.add_argument("--state-file", default=STATE_FILE, help="File state run terakhir")
+    parser.add_argument("--incremental", action="store_true", help="Append + upsert ke store berbasis watermark")
+    parser.add_argument("--store-dir", default=STORE_DIR, help="Folder store untuk mode --incremental")
+    parser.add_argument("--overlap-days", type=int, default=7, help="Jendela overlap de-duplikasi (hari)")
+    parser.add_argument("--stream", action="store_true", help="Baca Excel per chunk dengan memori terbatas")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="Jumlah baris per chunk untuk --stream")
+    parser.add_argument(
+        "--engine", choices=["pandas", "polars"], default="pandas",
+        help="Engine cleaning untuk run penuh / --since (polars perlu paket polars)"
+    )
+    args = parser.parse_args(argv)
+    if args.stream and (args.since or args.excel or args.incremental):
+        parser.error("--stream tidak bisa digabung dengan --since, --excel, atau --incremental")
+    if args.engine == "polars" and (args.stream or args.incremental):
+        parser.error("--engine polars hanya untuk run penuh atau --since")
+    return args
+
+
+if __name__ == "__main__":
+    run(parse_args())
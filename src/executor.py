@@ -0,0 +1,160 @@
+"""
+Eksekusi roll-up berat di luar thread sesi Streamlit.
+
+Dua mekanisme, dipakai oleh `result_cache` saat terjadi cache miss:
+
+- Single-flight: permintaan yang identik (versi data, nama roll-up, filter)
+  yang datang bersamaan hanya dihitung sekali; pemanggil lain menunggu hasil
+  yang sama.
+- Process pool (opsional, DASHBOARD_WORKERS > 0): roll-up backend pandas
+  dijalankan di proses terpisah agar perhitungan pandas yang CPU-bound tidak
+  berebut GIL dengan rerun sesi lain. Proses pool me-memory-map cube dari
+  file Arrow IPC yang sama dengan proses Streamlit (lihat precompute.py), jadi
+  data tidak dikirim ke pool; hanya kunci filter yang dikirim, dan hasilnya
+  dikembalikan sebagai Arrow IPC stream.
+
+Default jumlah worker: jumlah CPU - 1 (maks. 4). Di mesin satu CPU pool tidak
+dipakai karena tidak ada core lain untuk menjalankannya.
+"""
+import atexit
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import pyarrow as pa
+
+WORKERS = int(os.environ.get("DASHBOARD_WORKERS", min(4, (os.cpu_count() or 1) - 1)))
+
+_pool = None
+_pool_lock = threading.Lock()
+_inflight = {}
+_inflight_lock = threading.Lock()
+_stats = {"calls": 0, "shared": 0, "offloaded": 0}
+
+# Backend per file cube di dalam proses pool (versi terbaru dan sebelumnya)
+_worker_backends = {}
+_WORKER_BACKENDS_MAX = 2
+
+
+def _ready():
+    """Tugas kosong untuk memulai proses pool"""
+    return os.getpid()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn mengimpor ulang modul __main__ di setiap proses baru, dan di
+            # server Streamlit __main__ adalah app.py. Semua proses dimulai
+            # sekarang dengan __main__ kosong; setelah itu pool tidak membuat
+            # proses baru lagi (kecuali rusak, lihat _compute).
+            pool = ProcessPoolExecutor(WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            main = sys.modules.get("__main__")
+            sys.modules["__main__"] = types.ModuleType("__main__")
+            try:
+                started = [pool.submit(_ready) for _ in range(WORKERS)]
+            finally:
+                sys.modules["__main__"] = main
+            wait(started)
+            atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+            _pool = pool
+        return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def to_arrow(result):
+    """Hasil roll-up -> bytes Arrow IPC stream (DataFrame) atau objek apa adanya"""
+    if not isinstance(result, pd.DataFrame):
+        return result
+    # Satu RecordBatch, juga untuk hasil kosong, agar kamus kategori ikut
+    # terkirim (tabel kosong tidak punya batch sama sekali)
+    batch = pa.RecordBatch.from_pandas(result, preserve_index=not isinstance(result.index, pd.RangeIndex))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def from_arrow(payload):
+    if not isinstance(payload, bytes):
+        return payload
+    return pa.ipc.open_stream(payload).read_all().to_pandas()
+
+
+def _worker_rollup(cube_path, name, key):
+    """Dijalankan di proses pool"""
+    from filters import BitmapIndex, TimeIndex
+    from query_backend import PandasBackend
+    from shared_data import SharedDataset
+
+    backend = _worker_backends.get(cube_path)
+    if backend is None:
+        frame = SharedDataset.from_ipc(cube_path, cube_path).frame
+        backend = PandasBackend(frame, TimeIndex(frame["tanggal"]), BitmapIndex(frame))
+        while len(_worker_backends) >= _WORKER_BACKENDS_MAX:
+            _worker_backends.pop(next(iter(_worker_backends)))
+        _worker_backends[cube_path] = backend
+    return to_arrow(backend.rollup(name, key))
+
+
+def _compute(backend, name, key):
+    cube_path = getattr(backend, "cube_path", None)
+    if WORKERS > 0 and cube_path is not None:
+        pool = _get_pool()
+        try:
+            payload = pool.submit(_worker_rollup, os.path.abspath(cube_path), name, key).result()
+        except BrokenProcessPool:
+            # Proses pool mati (mis. kehabisan memori): hitung di sini, pool
+            # dibuat ulang pada permintaan berikutnya
+            _reset_pool(pool)
+        else:
+            with _inflight_lock:
+                _stats["offloaded"] += 1
+            return from_arrow(payload)
+    return backend.rollup(name, key)
+
+
+def run_rollup(backend, name, data_key, key):
+    """
+    `backend.rollup(name, key)` dengan single-flight per (backend, data_key,
+    name, key), dijalankan di process pool jika tersedia.
+    """
+    flight = (backend.name, data_key, name, key)
+    with _inflight_lock:
+        _stats["calls"] += 1
+        future = _inflight.get(flight)
+        owner = future is None
+        if owner:
+            future = _inflight[flight] = Future()
+        else:
+            _stats["shared"] += 1
+    if not owner:
+        return future.result()
+
+    try:
+        future.set_result(_compute(backend, name, key))
+    except BaseException as exc:
+        future.set_exception(exc)
+    finally:
+        with _inflight_lock:
+            del _inflight[flight]
+    return future.result()
+
+
+def executor_stats():
+    """Jumlah permintaan, yang berbagi hasil (single-flight), dan yang dijalankan di pool"""
+    with _inflight_lock:
+        return {**_stats, "workers": WORKERS}
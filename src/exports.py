@@ -0,0 +1,165 @@
+"""
+Export data dashboard (CSV, Parquet, Excel) yang dibuat saat diminta.
+
+File export ditulis per chunk ke disk, jadi memori yang dipakai tidak
+bergantung pada jumlah baris: CSV ditulis bertahap, Parquet per row group,
+dan Excel dengan workbook write-only openpyxl (satu workbook bisa berisi
+beberapa sheet). Hasilnya di-cache di data/cache/exports dengan kunci
+(versi data, filter, nama export, format), sehingga download ulang dengan
+filter yang sama tidak membuat file lagi.
+"""
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EXPORT_DIR = "data/cache/exports"
+# Naikkan jika isi atau format export berubah agar file lama tidak dipakai
+EXPORT_VERSION = "1"
+EXPORT_MAX_FILES = 64
+CHUNK_ROWS = 100_000
+EXCEL_MAX_ROWS = 1_048_576 - 1  # satu baris untuk header
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def format_ribuan(values):
+    """Sama dengan f"{x:,.0f}" untuk setiap nilai, tanpa apply per baris"""
+    values = pd.Series(values, dtype="float64")
+    finite = np.isfinite(values.to_numpy())
+    text = (
+        values.where(finite, 0).round().astype("int64").astype(str)
+        .str.replace(r"\B(?=(\d{3})+(?!\d))", ",", regex=True)
+    )
+    if not finite.all():
+        text[~finite] = [f"{x:,.0f}" for x in values[~finite]]
+    return text
+
+
+def iter_chunks(df, chunksize=CHUNK_ROWS):
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def write_csv(df, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(iter_chunks(df)):
+            chunk.to_csv(f, index=False, header=i == 0)
+        if len(df) == 0:
+            df.to_csv(f, index=False)
+
+
+def write_parquet(df, path):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in iter_chunks(df):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def _excel_rows(chunk):
+    # Nilai kosong (NaN, NaT, pd.NA) -> sel kosong
+    values = chunk.astype(object)
+    return values.where(chunk.notna(), None).itertuples(index=False, name=None)
+
+
+def write_excel(sheets, path):
+    """
+    Workbook write-only: baris langsung ditulis ke file, tidak disimpan di
+    memori. Sheet yang melebihi batas baris Excel dilanjutkan ke sheet
+    "<nama> (2)", "<nama> (3)", ...
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for name, df in sheets.items():
+        parts = max(1, -(-len(df) // EXCEL_MAX_ROWS))
+        for part in range(parts):
+            ws = wb.create_sheet(name[:31] if part == 0 else f"{name[:26]} ({part + 1})")
+            ws.append([str(column) for column in df.columns])
+            bagian = df.iloc[part * EXCEL_MAX_ROWS:(part + 1) * EXCEL_MAX_ROWS]
+            for chunk in iter_chunks(bagian):
+                for row in _excel_rows(chunk):
+                    ws.append(row)
+    wb.save(path)
+
+
+def _as_sheets(data):
+    return data if isinstance(data, dict) else {"Data": data}
+
+
+def write_export(data, path, fmt):
+    """Menulis DataFrame (atau dict nama sheet -> DataFrame untuk xlsx)"""
+    if fmt == "xlsx":
+        write_excel(_as_sheets(data), path)
+        return
+    # CSV dan Parquet hanya satu tabel: pakai sheet pertama
+    df = next(iter(_as_sheets(data).values()))
+    if fmt == "csv":
+        write_csv(df, path)
+    elif fmt == "parquet":
+        write_parquet(df, path)
+    else:
+        raise ValueError(f"Format export tidak dikenal: {fmt} (pilihan: {', '.join(MIME_TYPES)})")
+
+
+def export_path(name, fmt, data_key, key, export_dir=EXPORT_DIR):
+    digest = hashlib.sha256(repr((EXPORT_VERSION, name, data_key, key)).encode()).hexdigest()[:20]
+    return os.path.join(export_dir, f"{name}-{digest}.{fmt}")
+
+
+def _lock_for(path):
+    with _locks_guard:
+        return _locks.setdefault(path, threading.Lock())
+
+
+def remove_old_exports(export_dir=EXPORT_DIR, keep=EXPORT_MAX_FILES):
+    """Menghapus export paling lama jika jumlah file melebihi `keep`"""
+    paths = sorted(
+        (os.path.join(export_dir, name) for name in os.listdir(export_dir) if not name.endswith(".tmp")),
+        key=os.path.getmtime,
+    )
+    for path in paths[:-keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def export_file(name, fmt, data_key, key, build, export_dir=EXPORT_DIR):
+    """
+    Path file export untuk (name, fmt, data_key, key). `build()` (DataFrame
+    atau dict sheet) hanya dipanggil jika file belum ada di cache. File
+    ditulis ke .tmp lalu di-rename agar tidak pernah terbaca setengah jadi.
+    """
+    path = export_path(name, fmt, data_key, key, export_dir)
+    with _lock_for(path):
+        if os.path.exists(path):
+            os.utime(path)  # tandai baru dipakai untuk pembersihan LRU
+            return path
+        os.makedirs(export_dir, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            write_export(build(), tmp, fmt)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    remove_old_exports(export_dir)
+    return path
+
+
+def export_bytes(name, fmt, data_key, key, build, export_dir=EXPORT_DIR):
+    """Isi file export, untuk `data=` callable st.download_button"""
+    with open(export_file(name, fmt, data_key, key, build, export_dir), "rb") as f:
+        return f.read()
@@ -0,0 +1,156 @@
+"""
+Indeks untuk filter sidebar dashboard.
+"""
+import numpy as np
+import pandas as pd
+
+
+def sort_by_time(df, column="tanggal_jam"):
+    """Mengurutkan frame berdasarkan waktu agar bisa difilter dengan TimeIndex"""
+    return df.sort_values(column, kind="stable", ignore_index=True)
+
+
+class TimeIndex:
+    """
+    Indeks offset hari untuk frame yang sudah terurut berdasarkan waktu.
+
+    `day_offset[i]` adalah jumlah hari sejak tanggal pertama untuk baris ke-i.
+    Filter rentang tanggal cukup dua kali `searchsorted` (O(log n)) dan
+    hasilnya berupa slice posisi, jadi frame bisa dipotong dengan `iloc`
+    tanpa membuat mask boolean sepanjang tabel.
+    """
+
+    def __init__(self, waktu):
+        waktu = pd.DatetimeIndex(waktu)
+        if not waktu.is_monotonic_increasing:
+            raise ValueError("TimeIndex membutuhkan data yang terurut berdasarkan waktu")
+        self.origin = waktu[0].normalize() if len(waktu) else pd.Timestamp(0)
+        self.day_offset = (waktu.normalize() - self.origin).days.to_numpy(dtype=np.int32)
+
+    def __len__(self):
+        return len(self.day_offset)
+
+    def _offset(self, tanggal):
+        return (pd.Timestamp(tanggal) - self.origin).days
+
+    def day_range(self, start_date, end_date):
+        """Slice posisi baris dengan tanggal di antara start_date dan end_date (inklusif)"""
+        lo = np.searchsorted(self.day_offset, self._offset(start_date), side="left")
+        hi = np.searchsorted(self.day_offset, self._offset(end_date), side="right")
+        return slice(int(lo), int(hi))
+
+    def slice_frame(self, df, start_date, end_date):
+        """Potongan `df` untuk rentang tanggal, tanpa menyalin data"""
+        return df.iloc[self.day_range(start_date, end_date)]
+
+
+# Kolom dengan nilai unik sebanyak ini atau kurang disimpan sebagai bitmap
+# padat per nilai; kolom lain (campaign, donatur) disimpan sebagai daftar posisi
+# dan diubah ke bitmap hanya saat dipakai.
+DENSE_MAX_VALUES = 64
+
+FILTER_COLUMNS = ["metode_pembayaran", "status", "nama_campaign", "nama_donatur"]
+
+
+class BitmapIndex:
+    """
+    Indeks bitmap untuk kolom kategori filter sidebar.
+
+    Bitmap disimpan ter-pack (1 bit per baris, `np.packbits`). Pilihan dalam
+    satu kolom digabung dengan OR, antar kolom dengan AND, lalu hasilnya
+    dibuka menjadi satu mask boolean yang dipakai sekali saja.
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.size = len(df)
+        self.values = {}
+        self._dense = {}
+        self._positions = {}
+        for column in columns:
+            codes, uniques = pd.factorize(df[column])
+            self.values[column] = list(uniques)
+            if len(uniques) <= DENSE_MAX_VALUES:
+                self._dense[column] = {
+                    value: np.packbits(codes == code) for code, value in enumerate(uniques)
+                }
+            else:
+                # Posisi baris dikelompokkan per nilai dengan satu kali argsort
+                order = np.argsort(codes, kind="stable").astype(np.int32)
+                bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+                self._positions[column] = {
+                    value: order[bounds[code]:bounds[code + 1]] for code, value in enumerate(uniques)
+                }
+
+    def bitmap(self, column, selected):
+        """Bitmap ter-pack untuk baris yang nilai `column`-nya ada di `selected` (OR)"""
+        if column in self._dense:
+            bitmaps = [self._dense[column][value] for value in selected if value in self._dense[column]]
+            if not bitmaps:
+                return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+            return np.bitwise_or.reduce(bitmaps)
+
+        mask = np.zeros(self.size, dtype=bool)
+        positions = self._positions[column]
+        for value in selected:
+            if value in positions:
+                mask[positions[value]] = True
+        return np.packbits(mask)
+
+    def select(self, selections, rows=slice(None)):
+        """
+        Mask boolean untuk kombinasi filter `{kolom: [nilai, ...]}` (AND antar
+        kolom), hanya untuk baris `rows` (slice atau mask boolean). Kolom tanpa
+        pilihan atau dengan semua nilai terpilih diabaikan. Mengembalikan None
+        jika tidak ada filter yang membatasi.
+        """
+        combined = None
+        for column, selected in selections.items():
+            if not selected or set(self.values[column]) <= set(selected):
+                continue
+            bitmap = self.bitmap(column, selected)
+            combined = bitmap if combined is None else np.bitwise_and(combined, bitmap)
+        if combined is None:
+            return None
+
+        if not isinstance(rows, slice):
+            return np.unpackbits(combined, count=self.size).astype(bool)[rows]
+
+        # Untuk slice, buka hanya byte yang mencakup rentang `rows`
+        start, stop, _ = rows.indices(self.size)
+        first_byte = start // 8
+        bits = np.unpackbits(combined[first_byte:(stop + 7) // 8])
+        offset = start - first_byte * 8
+        return bits[offset:offset + (stop - start)].astype(bool)
+
+
+def value_mask(frame, selections):
+    """Mask boolean biasa (isin per kolom) sebagai pembanding tanpa indeks"""
+    mask = None
+    for column, selected in selections.items():
+        if selected:
+            terpilih = frame[column].isin(selected).to_numpy()
+            mask = terpilih if mask is None else mask & terpilih
+    return mask
+
+
+def apply_filters(frame, start_date, end_date, selections, time_index=None, bitmap_index=None):
+    """
+    Menerapkan filter sidebar ke `frame` (tabel transaksi atau cube).
+
+    Rentang tanggal dipotong dengan TimeIndex jika ada, filter kategori
+    diselesaikan lewat BitmapIndex menjadi satu mask yang diterapkan sekali.
+    Tanpa indeks, dipakai perbandingan biasa pada kolom `tanggal` dan `isin`.
+    """
+    if time_index is not None:
+        rows = time_index.day_range(start_date, end_date)
+    else:
+        tanggal = pd.to_datetime(frame["tanggal"])
+        rows = ((tanggal >= pd.Timestamp(start_date)) & (tanggal <= pd.Timestamp(end_date))).to_numpy()
+
+    if bitmap_index is not None:
+        mask = bitmap_index.select(selections, rows)
+        frame = frame.iloc[rows]
+    else:
+        frame = frame.iloc[rows]
+        mask = value_mask(frame, selections)
+    return frame if mask is None else frame[mask]
@@ -1,8 +1,35 @@
 import pandas as pd
+from openpyxl import load_workbook
 
-def load_data():
+def load_data(qris_path="data/transaksi_qris.xlsx", manual_path="data/transaksi_manual.xlsx"):
     # Baca file Excel
-    transaksi_qris = pd.read_excel("data/transaksi_qris.xlsx", skiprows=1)
-    transaksi_manual = pd.read_excel("data/transaksi_manual.xlsx", skiprows=1)
+    transaksi_qris = pd.read_excel(qris_path, skiprows=1)
+    transaksi_manual = pd.read_excel(manual_path, skiprows=1)
 
     return transaksi_qris, transaksi_manual
+
+def iter_excel_chunks(path, chunksize=50_000, skiprows=1):
+    """
+    Membaca file export baris per baris (openpyxl read-only) dan menghasilkan
+    DataFrame berisi paling banyak `chunksize` baris, sehingga memori tetap
+    kecil berapa pun ukuran file.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        for _ in range(skiprows):
+            next(rows, None)
+        header = next(rows)
+
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) == chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        wb.close()
@@ -0,0 +1,209 @@
+"""
+Ingestion inkremental data transaksi ke store Parquet append-only.
+
+Store berada di satu folder berisi beberapa file part Parquet dan manifest.json
+yang mencatat rentang tanggal tiap part serta watermark (tanggal_jam terbaru)
+per sumber (QRIS / Manual). Pada setiap refresh:
+
+1. Hanya baris export dengan Tanggal >= watermark - overlap yang dibersihkan.
+2. Baris tersebut dicocokkan dengan isi store di jendela overlap yang sama.
+   Baris yang sudah ada diperbarui statusnya (mis. Pending -> Berhasil),
+   baris baru ditambahkan.
+3. Hanya part "panas" (yang bersinggungan dengan jendela overlap) yang ditulis
+   ulang, sehingga biaya refresh sebanding dengan ukuran delta.
+"""
+import json
+import os
+import time
+
+import pandas as pd
+
+from cleaning_data import CLEANING_VERSION, clean_and_merge_transaksi
+from parsers import parse_tanggal_indonesia
+
+STORE_DIR = "data/store"
+DEFAULT_OVERLAP = pd.Timedelta(days=7)
+
+# Kolom pengenal transaksi. Status sengaja tidak ikut agar perubahan status
+# diperlakukan sebagai update, bukan transaksi baru.
+KEY_COLUMNS = ["metode_pembayaran", "tanggal_jam", "nama_campaign", "nama_donatur", "total_donasi"]
+
+SOURCES = ["QRIS", "Manual"]
+
+
+def manifest_path(store_dir=STORE_DIR):
+    return os.path.join(store_dir, "manifest.json")
+
+
+def read_manifest(store_dir=STORE_DIR):
+    path = manifest_path(store_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, store_dir=STORE_DIR):
+    path = manifest_path(store_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_store(store_dir=STORE_DIR):
+    """Membaca seluruh isi store sebagai satu DataFrame terurut waktu"""
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"Store belum ada di {store_dir}, jalankan ingestion terlebih dahulu")
+    parts = [pd.read_parquet(os.path.join(store_dir, part["file"])) for part in manifest["parts"]]
+    df = pd.concat(parts, ignore_index=True)
+    return df.sort_values("tanggal_jam", kind="stable", ignore_index=True)
+
+
+def _write_part(df, store_dir, manifest):
+    """Menulis satu part baru dan mengembalikan entri manifest-nya"""
+    manifest["next_part"] = manifest.get("next_part", 0) + 1
+    name = f"part-{manifest['next_part']:05d}.parquet"
+    df.to_parquet(os.path.join(store_dir, name), index=False)
+    return {
+        "file": name,
+        "rows": len(df),
+        "min": df["tanggal_jam"].min().isoformat(),
+        "max": df["tanggal_jam"].max().isoformat(),
+    }
+
+
+def _with_occurrence(df):
+    """Nomor urut baris kembar agar donasi identik di menit yang sama tetap terpisah"""
+    df = df.copy()
+    df["_urutan"] = df.groupby(KEY_COLUMNS, sort=False, dropna=False).cumcount()
+    return df
+
+
+def upsert(df_window, df_delta):
+    """
+    Menggabungkan isi store di jendela overlap dengan delta hasil cleaning.
+
+    Mengembalikan (df_gabungan, jumlah_baru, jumlah_update).
+    """
+    window = _with_occurrence(df_window)
+    delta = _with_occurrence(df_delta)
+    merged = window.merge(
+        delta[KEY_COLUMNS + ["_urutan", "status"]],
+        on=KEY_COLUMNS + ["_urutan"], how="left", suffixes=("", "_baru"), indicator=True
+    )
+
+    matched = merged["_merge"] == "both"
+    changed = matched & (merged["status"] != merged["status_baru"])
+    merged.loc[changed, "status"] = merged.loc[changed, "status_baru"]
+    updated = merged[df_window.columns]
+
+    # Baris delta yang belum ada di store
+    ada = window[KEY_COLUMNS + ["_urutan"]].assign(_ada=True)
+    baru = delta.merge(ada, on=KEY_COLUMNS + ["_urutan"], how="left")
+    baru = baru[baru["_ada"].isna()][df_delta.columns]
+
+    combined = pd.concat([updated, baru], ignore_index=True)
+    return combined, len(baru), int(changed.sum())
+
+
+def _full_rebuild(df_qris, df_manual, store_dir, overlap):
+    df_clean = clean_and_merge_transaksi(df_qris, df_manual)
+    for name in os.listdir(store_dir):
+        if name.startswith("part-"):
+            os.remove(os.path.join(store_dir, name))
+
+    manifest = {"version": CLEANING_VERSION, "parts": [], "watermark": {}}
+    manifest["watermark"] = {
+        metode: df_clean.loc[df_clean["metode_pembayaran"] == metode, "tanggal_jam"].max().isoformat()
+        for metode in SOURCES if (df_clean["metode_pembayaran"] == metode).any()
+    }
+    _write_split(df_clean, store_dir, manifest, overlap)
+    write_manifest(manifest, store_dir)
+    return {"mode": "full", "appended": len(df_clean), "updated": 0, "parts_rewritten": 0}
+
+
+def _write_split(df, store_dir, manifest, overlap):
+    """
+    Memisahkan baris menjadi part "tertutup" (di luar jendela overlap refresh
+    berikutnya, tidak akan ditulis ulang lagi) dan part "panas".
+    """
+    if df.empty:
+        return
+    batas = min(pd.Timestamp(ts) for ts in manifest["watermark"].values()) - overlap
+    tertutup = df[df["tanggal_jam"] < batas]
+    panas = df[df["tanggal_jam"] >= batas]
+    for bagian in (tertutup, panas):
+        if not bagian.empty:
+            manifest["parts"].append(_write_part(bagian, store_dir, manifest))
+
+
+def ingest(df_qris, df_manual, store_dir=STORE_DIR, overlap=DEFAULT_OVERLAP):
+    """
+    Memasukkan export QRIS/manual terbaru ke store secara inkremental.
+
+    Jika store belum ada atau CLEANING_VERSION berubah, store dibangun ulang
+    penuh. Mengembalikan dict statistik (mode, appended, updated,
+    parts_rewritten, seconds).
+    """
+    start = time.perf_counter()
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = read_manifest(store_dir)
+
+    if manifest is None or manifest.get("version") != CLEANING_VERSION:
+        stats = _full_rebuild(df_qris, df_manual, store_dir, overlap)
+        stats["seconds"] = time.perf_counter() - start
+        return stats
+
+    # Hanya baris mentah di sekitar watermark masing-masing sumber yang dibersihkan
+    raw = {"QRIS": df_qris, "Manual": df_manual}
+    window_start = {}
+    for metode, df_raw in raw.items():
+        watermark = manifest["watermark"].get(metode)
+        window_start[metode] = pd.Timestamp(watermark) - overlap if watermark else pd.Timestamp.min
+        raw[metode] = df_raw[parse_tanggal_indonesia(df_raw["Tanggal"]) >= window_start[metode]].copy()
+    df_delta = clean_and_merge_transaksi(raw["QRIS"], raw["Manual"])
+
+    # Part panas = part yang rentang tanggalnya menyentuh jendela overlap
+    batas = min(window_start.values())
+    hot = [part for part in manifest["parts"] if pd.Timestamp(part["max"]) >= batas]
+    cold = [part for part in manifest["parts"] if pd.Timestamp(part["max"]) < batas]
+    if hot:
+        df_hot = pd.concat(
+            [pd.read_parquet(os.path.join(store_dir, part["file"])) for part in hot], ignore_index=True
+        )
+    else:
+        df_hot = df_delta.iloc[0:0]
+
+    in_window = pd.Series(False, index=df_hot.index)
+    for metode, mulai in window_start.items():
+        in_window |= (df_hot["metode_pembayaran"] == metode) & (df_hot["tanggal_jam"] >= mulai)
+
+    df_window, appended, updated = upsert(df_hot[in_window], df_delta)
+    df_hot = pd.concat([df_hot[~in_window], df_window], ignore_index=True)
+    df_hot = df_hot.sort_values("tanggal_jam", kind="stable", ignore_index=True)
+
+    for metode in SOURCES:
+        delta_src = df_delta.loc[df_delta["metode_pembayaran"] == metode, "tanggal_jam"]
+        if not delta_src.empty:
+            lama = manifest["watermark"].get(metode)
+            terbaru = delta_src.max()
+            manifest["watermark"][metode] = max(terbaru, pd.Timestamp(lama)).isoformat() if lama else terbaru.isoformat()
+
+    manifest["parts"] = cold
+    _write_split(df_hot, store_dir, manifest, overlap)
+    write_manifest(manifest, store_dir)
+
+    # File part lama dihapus setelah manifest baru tersimpan
+    for part in hot:
+        os.remove(os.path.join(store_dir, part["file"]))
+
+    return {
+        "mode": "incremental",
+        "appended": appended,
+        "updated": updated,
+        "parts_rewritten": len(hot),
+        "delta_rows": len(df_delta),
+        "seconds": time.perf_counter() - start,
+    }
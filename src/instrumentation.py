@@ -0,0 +1,131 @@
+"""
+Pengukuran performa: memori proses dan profiler per bagian dashboard.
+
+`Profiler` mencatat setiap tahap data dan bagian dashboard yang dibungkus
+`profiler.section(...)`: lama eksekusi, jumlah baris, hit/miss cache analitik,
+dan perubahan resident memory. Profiler yang tidak aktif tidak mengukur apa
+pun, jadi pembungkusnya boleh tetap ada di hot path.
+"""
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def peak_rss_mb():
+    """Puncak resident memory proses sejauh ini (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def current_rss_mb():
+    """Resident memory proses saat ini (MB); puncaknya jika /proc tidak ada"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def current_pss_mb():
+    """
+    Proportional set size proses saat ini (MB): halaman yang dibagi beberapa
+    proses (mis. file Arrow IPC yang di-memory-map) dihitung sebagian untuk
+    setiap proses, jadi jumlahnya antar proses tidak menghitung ganda. Jika
+    /proc/self/smaps_rollup tidak ada (bukan Linux), RSS saat ini.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return current_rss_mb()
+
+
+class Profiler:
+    """
+    Pencatat durasi, baris, hit/miss cache, dan memori per bagian.
+
+    `cache_counters` adalah fungsi tanpa argumen yang mengembalikan
+    (jumlah panggilan, jumlah miss) cache; selisihnya sebelum dan sesudah
+    bagian menjadi hit/miss bagian tersebut.
+    """
+
+    def __init__(self, enabled=False, cache_counters=None):
+        self.enabled = enabled
+        self.cache_counters = cache_counters
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.records = []
+        self._t0 = time.perf_counter()
+        self._stack = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def section(self, name, kind="section"):
+        """
+        Mengukur blok `with`. Blok boleh mengisi `record["rows"]` dengan
+        jumlah baris yang diproses.
+        """
+        record = {}
+        if not self.enabled:
+            yield record
+            return
+
+        parent = "/".join(self._stack)
+        self._stack.append(name)
+        counters = self.cache_counters() if self.cache_counters else (0, 0)
+        rss = current_rss_mb()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            calls, misses = self.cache_counters() if self.cache_counters else (0, 0)
+            rss_after = current_rss_mb()
+            record.update(
+                section=f"{parent}/{name}" if parent else name,
+                kind=kind,
+                depth=len(self._stack),
+                offset=round(start - self._t0, 6),
+                seconds=round(seconds, 6),
+                rows=record.get("rows"),
+                cache_hits=(calls - counters[0]) - (misses - counters[1]),
+                cache_misses=misses - counters[1],
+                rss_mb=round(rss_after, 1),
+                rss_delta_mb=round(rss_after - rss, 1),
+            )
+            with self._lock:
+                self.records.append(record)
+
+    def summary(self):
+        """Catatan diurutkan sesuai waktu mulai (bagian induk sebelum anaknya)"""
+        return sorted(self.records, key=lambda r: (r["offset"], r["depth"]))
+
+    def to_json_lines(self, **context):
+        """Satu baris JSON per bagian, ditambah run_id, waktu, dan konteks rerun"""
+        header = {"run_id": self.run_id, "started": self.started, **context}
+        return "".join(
+            json.dumps({**header, **record}, default=str, ensure_ascii=False) + "\n"
+            for record in self.records
+        )
+
+    def write_log(self, path, **context):
+        """Menambahkan catatan rerun ini ke log JSON Lines di `path`"""
+        if not self.records:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_json_lines(**context))
@@ -0,0 +1,87 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Nama bulan Indonesia -> angka bulan
+BULAN_MAPPING = {
+    "Januari": "01", "Februari": "02", "Maret": "03", "April": "04",
+    "Mei": "05", "Juni": "06", "Juli": "07", "Agustus": "08",
+    "September": "09", "Oktober": "10", "November": "11", "Desember": "12"
+}
+
+# Satu regex untuk semua nama bulan, jadi cukup satu kali lewat per string
+BULAN_PATTERN = re.compile(r"\b(" + "|".join(BULAN_MAPPING) + r")\b")
+
+
+def _map_back(values, codes, fill_value):
+    """Sebarkan hasil parse per nilai unik kembali ke setiap baris"""
+    out = values[codes]
+    if (codes < 0).any():
+        out = out.copy()
+        out[codes < 0] = fill_value
+    return out
+
+
+def _blank_to_na(teks):
+    return teks.mask(teks == "")
+
+
+def parse_tanggal_indonesia(series):
+    """
+    Mengubah teks tanggal Indonesia (mis. "26 Mei 2025 18:29") menjadi datetime.
+
+    Bagian tanggal dan bagian jam difaktorkan terpisah: satu export hanya punya
+    ratusan tanggal unik dan paling banyak 1440 jam:menit unik, jadi setiap
+    string unik cukup diparse sekali lalu hasilnya dipetakan balik ke seluruh
+    baris. Nilai kosong (termasuk teks kosong atau hanya spasi) menjadi NaT.
+    """
+    teks = series.astype("string")
+
+    # Jam selalu "HH:MM" (atau "H:MM") di akhir teks
+    tgl_codes, tgl_uniques = pd.factorize(teks.str.slice(stop=-5))
+    jam_codes, jam_uniques = pd.factorize(teks.str.slice(start=-5))
+
+    # Nama bulan diganti angka dalam satu kali lewat regex
+    tgl = _blank_to_na(pd.Series(tgl_uniques, dtype="string").str.strip())
+    tgl = tgl.str.replace(BULAN_PATTERN, lambda m: BULAN_MAPPING[m.group(1)], regex=True)
+    tgl = pd.to_datetime(tgl, format="%d %m %Y").to_numpy()
+    jam = _blank_to_na(pd.Series(jam_uniques, dtype="string").str.strip())
+    jam = pd.to_timedelta(jam + ":00").to_numpy()
+
+    out = (
+        _map_back(tgl, tgl_codes, np.datetime64("NaT"))
+        + _map_back(jam, jam_codes, np.timedelta64("NaT"))
+    )
+    return pd.Series(out, index=series.index, name=series.name)
+
+
+def parse_rupiah(series):
+    """
+    Mengubah nominal Rupiah (mis. "Rp 50.000" atau "Rp 50.000,00") menjadi int.
+
+    Titik dibaca sebagai pemisah ribuan dan koma sebagai pemisah desimal,
+    sehingga "Rp 50.000,00" menjadi 50000 (bukan 5000000). Angka yang sudah
+    numerik dipakai apa adanya. Nilai kosong atau tidak valid menjadi 0.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.fillna(0).round().astype("int64")
+
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype=object)
+
+    # Nilai yang sudah berupa angka (sel numerik di Excel) tidak perlu dibersihkan
+    is_number = uniques.map(lambda v: isinstance(v, (int, float, np.number)))
+    nilai = pd.to_numeric(uniques.where(is_number), errors="coerce")
+
+    teks = (
+        uniques[~is_number]
+        .astype(str)
+        .str.replace(r"[^\d,]", "", regex=True)  # buang "Rp", spasi, dan titik ribuan
+        .str.replace(",", ".", regex=False)      # koma desimal -> titik
+    )
+    nilai[~is_number] = pd.to_numeric(teks, errors="coerce")
+
+    parsed = nilai.fillna(0).round().astype("int64").to_numpy()
+    out = _map_back(parsed, codes, 0)
+    return pd.Series(out, index=series.index, name=series.name)
@@ -0,0 +1,114 @@
+"""
+Penyimpanan transaksi bersih yang dipartisi per tahun/bulan.
+
+Setiap bulan disimpan sebagai satu file Parquet `<tahun>/<bulan>-<digest>.parquet`
+di PARTITION_DIR. Digest dihitung dari isi baris bulan tersebut, jadi file
+tidak pernah ditimpa: bulan yang sudah tutup (sebelum bulan transaksi
+terakhir) tetap memakai file yang sama dari refresh ke refresh, dan biasanya
+hanya bulan berjalan yang ditulis ulang. Jika bulan lama ternyata berubah
+(mis. koreksi status di export), ia mendapat file baru dengan digest baru.
+
+manifest.json mencatat rentang tanggal setiap partisi sehingga pembaca cukup
+membuka partisi yang bersinggungan dengan rentang filter (partition pruning).
+Pembacanya hanya backend DuckDB, jadi partisi hanya ditulis jika backend itu
+dipilih; backend pandas memotong dataset yang sudah di-memory-map (lihat
+precompute.py) dengan TimeIndex, tanpa membaca Parquet.
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+PARTITION_DIR = "data/cache/partitions"
+
+
+def manifest_path(partition_dir=PARTITION_DIR):
+    return os.path.join(partition_dir, "manifest.json")
+
+
+def read_manifest(partition_dir=PARTITION_DIR):
+    path = manifest_path(partition_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, partition_dir=PARTITION_DIR):
+    path = manifest_path(partition_dir)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _month_digest(month):
+    """Hash isi baris (bukan dtype/kategori), stabil antar refresh"""
+    hashes = pd.util.hash_pandas_object(month, index=False).to_numpy()
+    digest = hashlib.sha256(hashes.tobytes())
+    digest.update(",".join(month.columns).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def _compact_month(month):
+    # Kategori yang tidak muncul di bulan ini tidak ikut disimpan; daftar
+    # kategori lengkap dibentuk ulang saat partisi digabung
+    month = month.copy()
+    for column in month.select_dtypes("category").columns:
+        month[column] = month[column].cat.remove_unused_categories()
+    return month
+
+
+def write_partitions(df, key, partition_dir=PARTITION_DIR):
+    """
+    Menyimpan `df` (terurut waktu) per tahun/bulan. Partisi yang isinya sudah
+    ada di disk tidak ditulis ulang. Mengembalikan manifest baru (juga
+    disimpan ke manifest.json) dengan jumlah partisi yang ditulis.
+    """
+    waktu = df["tanggal_jam"]
+    periode = waktu.dt.year * 100 + waktu.dt.month
+    # Batas baris tiap bulan; df terurut sehingga setiap bulan satu potongan
+    batas = periode.ne(periode.shift()).to_numpy().nonzero()[0].tolist() + [len(df)]
+    terakhir = int(periode.iloc[-1]) if len(df) else None
+
+    parts, written = [], 0
+    for start, end in zip(batas[:-1], batas[1:]):
+        month = _compact_month(df.iloc[start:end])
+        tahun, bulan = divmod(int(periode.iloc[start]), 100)
+        name = os.path.join(str(tahun), f"{bulan:02d}-{_month_digest(month)}.parquet")
+        path = os.path.join(partition_dir, name)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            month.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, path)
+            written += 1
+        parts.append({
+            "tahun": tahun,
+            "bulan": bulan,
+            "file": name,
+            "rows": end - start,
+            "min": waktu.iloc[start].isoformat(),
+            "max": waktu.iloc[end - 1].isoformat(),
+            "closed": tahun * 100 + bulan < terakhir,
+        })
+
+    manifest = {"key": key, "parts": parts, "written": written}
+    os.makedirs(partition_dir, exist_ok=True)
+    write_manifest(manifest, partition_dir)
+    return manifest
+
+
+def partition_paths(parts, partition_dir=PARTITION_DIR):
+    return [os.path.join(partition_dir, part["file"]) for part in parts]
+
+
+def remove_unused_partitions(keep_manifests, partition_dir=PARTITION_DIR):
+    """Menghapus file partisi yang tidak dipakai manifest mana pun di `keep_manifests`"""
+    keep = {os.path.normpath(part["file"]) for manifest in keep_manifests for part in manifest["parts"]}
+    for root, _, names in os.walk(partition_dir):
+        for name in names:
+            relative = os.path.normpath(os.path.relpath(os.path.join(root, name), partition_dir))
+            if name.endswith(".parquet") and relative not in keep:
+                os.remove(os.path.join(root, name))
@@ -0,0 +1,295 @@
+"""
+Worker background yang menyiapkan data dashboard di luar request.
+
+Satu `PrecomputeWorker` per proses memantau file export di data/. Jika ada
+file yang berubah (dan ukurannya sudah tidak berubah lagi selama satu
+interval, artinya selesai disalin), worker membangun versi data baru:
+parse + cleaning + snapshot Parquet, cube, indeks filter, backend query, dan
+semua roll-up untuk filter default. Setelah semuanya siap, versi baru
+dipublikasikan dengan satu pergantian referensi. Rerun yang sedang berjalan
+tetap memakai versi lama sampai selesai, jadi tidak ada request yang
+menunggu cleaning atau bertemu cache kosong.
+
+Dataset bersih dan cube juga dipublikasikan sebagai file Arrow IPC di
+SHARED_DIR. Jika beberapa proses `streamlit run` berjalan di belakang reverse
+proxy, hanya satu proses yang membangun versi baru (dijaga file lock), proses
+lain cukup me-memory-map file yang sama: satu salinan fisik data di page
+cache, dan proses baru siap melayani tanpa parse atau cleaning.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar proses
+    fcntl = None
+
+import pandas as pd
+
+import cube
+import partitions
+import result_cache
+from cleaning_data import CLEANING_VERSION, clean_and_merge_transaksi
+from filters import FILTER_COLUMNS, BitmapIndex, TimeIndex, sort_by_time
+from query_backend import BACKENDS, DEFAULT_BACKEND, DuckDBBackend, PandasBackend
+from schema import compact_transaksi, convert_to_indonesian
+from shared_data import SharedDataset, write_ipc
+from snapshot import CACHE_DIR, SOURCE_FILES, load_or_build, remove_stale_snapshots, snapshot_key, snapshot_path
+
+# Naikkan versi ini jika build_data() berubah agar snapshot lama tidak dipakai
+BUILD_VERSION = "3"
+
+# File Arrow IPC (dataset + cube) per versi data, di-memory-map semua proses
+SHARED_DIR = os.path.join(CACHE_DIR, "shared")
+
+# Interval pengecekan file sumber (detik)
+WATCH_INTERVAL = float(os.environ.get("DASHBOARD_WATCH_INTERVAL", 10))
+
+# Roll-up yang dihitung tab dashboard, disiapkan untuk filter default
+DEFAULT_ROLLUPS = [
+    "summary", "total_by_status", "status_per_metode", "success_rate_per_metode",
+    "metode_frequency", "donatur_per_metode", "metode_stats", "donatur_stats",
+    "daily_totals", "hari_stats", "jam_stats", "bulan_stats", "campaign_stats",
+]
+
+
+def build_data(sources=SOURCE_FILES):
+    df_qris = pd.read_excel(sources[0], skiprows=1)
+    df_manual = pd.read_excel(sources[1], skiprows=1)
+    df = clean_and_merge_transaksi(df_qris, df_manual)
+
+    # Tambahkan kolom hari dan bulan dalam Bahasa Indonesia
+    df = convert_to_indonesian(df)
+
+    # Skema ringkas: categorical, tanggal datetime64 harian, integer kecil
+    df = compact_transaksi(df)
+
+    # Simpan terurut waktu agar filter tanggal cukup memakai binary search
+    return sort_by_time(df)
+
+
+def make_backend(name, cube_frame, cube_time_index, cube_bitmaps, manifest, partition_dir, cube_path=None):
+    if name == "duckdb":
+        # Satu file per bulan: query hanya membaca bulan yang masuk rentang filter
+        parts = manifest["parts"]
+        return DuckDBBackend(
+            partitions.partition_paths(parts, partition_dir),
+            ranges=[(part["min"], part["max"]) for part in parts],
+        )
+    if name == "pandas":
+        return PandasBackend(cube_frame, cube_time_index, cube_bitmaps, cube_path)
+    raise ValueError(f"Backend tidak dikenal: {name} (pilihan: {', '.join(BACKENDS)})")
+
+
+def default_filter_key(df):
+    """Kunci filter saat sidebar belum diubah: seluruh rentang tanggal, semua nilai"""
+    waktu = df["tanggal_jam"]
+    return result_cache.filter_key(
+        waktu.iloc[0].date(), waktu.iloc[-1].date(), {column: [] for column in FILTER_COLUMNS}
+    )
+
+
+class DataVersion:
+    """
+    Satu versi data dashboard yang lengkap dan tidak berubah: dataset bersama,
+    partisi bulanan di disk (hanya untuk backend DuckDB), cube, indeks filter,
+    dan backend query. Dataset dan cube di-memory-map dari file Arrow IPC;
+    indeks dan backend dibuat per proses. Dipakai bersama oleh semua sesi.
+    """
+
+    def __init__(self, info, backend_name=DEFAULT_BACKEND, shared_dir=SHARED_DIR):
+        self.key = info["key"]
+        dataset_path, cube_path = shared_paths(self.key, shared_dir)
+        self.dataset = SharedDataset.from_ipc(dataset_path, self.key)
+        self.info = {**info, "rows": len(self.dataset)}
+        self.frame = self.dataset.frame
+        self.cube = SharedDataset.from_ipc(cube_path, self.key).frame
+        self.partition_dir = os.path.join(os.path.dirname(info["path"]), "partitions")
+        # Partisi bulanan hanya dibaca backend DuckDB; backend pandas memakai cube
+        self.partitions = None
+        if backend_name == "duckdb":
+            manifest = partitions.read_manifest(self.partition_dir)
+            if manifest is None or manifest["key"] != self.key:
+                manifest = partitions.write_partitions(self.frame, self.key, self.partition_dir)
+            self.partitions = manifest
+        self.df_time_index = TimeIndex(self.frame["tanggal_jam"])
+        self.df_bitmaps = BitmapIndex(self.frame)
+        self.cube_time_index = TimeIndex(self.cube["tanggal"])
+        self.cube_bitmaps = BitmapIndex(self.cube)
+        self.backend = make_backend(
+            backend_name, self.cube, self.cube_time_index, self.cube_bitmaps,
+            self.partitions, self.partition_dir, cube_path,
+        )
+        self.published = None
+
+    def warm(self):
+        """Mengisi cache analitik dengan semua roll-up untuk filter default"""
+        key = default_filter_key(self.frame)
+        for name in DEFAULT_ROLLUPS:
+            result_cache.cached_result(self.backend, name, self.key, key)
+
+
+def shared_paths(key, shared_dir=SHARED_DIR):
+    """(file dataset, file cube) Arrow IPC untuk versi data `key`"""
+    return (
+        os.path.join(shared_dir, f"transaksi_{key}.arrow"),
+        os.path.join(shared_dir, f"cube_{key}.arrow"),
+    )
+
+
+@contextmanager
+def build_lock(shared_dir=SHARED_DIR):
+    """Lock antar proses agar satu versi data hanya dibangun oleh satu proses"""
+    os.makedirs(shared_dir, exist_ok=True)
+    with open(os.path.join(shared_dir, "build.lock"), "w") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def publish_shared(sources=SOURCE_FILES, shared_dir=SHARED_DIR):
+    """
+    Memastikan file Arrow IPC untuk isi file sumber saat ini tersedia, lalu
+    mengembalikan info snapshot. Proses pertama membangunnya (dari snapshot
+    Parquet atau Excel); proses lain yang menunggu lock langsung memakainya.
+    """
+    start = time.perf_counter()
+    version = f"{CLEANING_VERSION}.{BUILD_VERSION}"
+    key = snapshot_key(sources, version)
+    paths = shared_paths(key, shared_dir)
+    if all(os.path.exists(path) for path in paths):
+        status = "shared"
+    else:
+        with build_lock(shared_dir):
+            if all(os.path.exists(path) for path in paths):
+                status = "shared"
+            else:
+                df, info = load_or_build(lambda: build_data(sources), sources, version=version, remove_stale=False)
+                write_ipc(df, paths[0])
+                write_ipc(cube.build_cube(df), paths[1])
+                status = info["status"]
+    return {
+        "status": status,
+        "key": key,
+        "path": snapshot_path(key),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def remove_stale_shared(keep_keys, shared_dir=SHARED_DIR):
+    """Menghapus file Arrow IPC versi lain. Proses yang masih me-map file tetap aman (Linux)."""
+    keep = {os.path.basename(path) for key in keep_keys for path in shared_paths(key, shared_dir)}
+    for name in os.listdir(shared_dir):
+        if name.endswith(".arrow") and name not in keep:
+            os.remove(os.path.join(shared_dir, name))
+
+
+def source_signature(sources=SOURCE_FILES):
+    """(path, mtime, ukuran) file sumber; murah dibanding hash isi file"""
+    signature = []
+    for path in sources:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class PrecomputeWorker(threading.Thread):
+    """Memantau file sumber dan mempublikasikan `DataVersion` baru jika berubah"""
+
+    def __init__(self, backend_name=DEFAULT_BACKEND, sources=SOURCE_FILES, interval=WATCH_INTERVAL):
+        super().__init__(name="precompute-worker", daemon=True)
+        self.backend_name = backend_name
+        self.sources = list(sources)
+        self.interval = interval
+        self._current = None
+        self._signature = None
+        self._pending = None
+        self._stop_event = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self.status = {"state": "idle", "builds": 0, "error": None, "checked": None}
+
+    @property
+    def current(self):
+        """Versi data terbaru yang sudah siap; satu rerun sebaiknya membacanya sekali"""
+        return self._current
+
+    def refresh(self):
+        """
+        Membangun dan mempublikasikan versi data dari file sumber saat ini.
+        Jika isi file (kunci snapshot) sama dengan versi aktif, tidak ada yang
+        diganti.
+        """
+        with self._refresh_lock:
+            signature = source_signature(self.sources)
+            self.status.update(state="building", error=None)
+            start = time.perf_counter()
+            try:
+                info = publish_shared(self.sources)
+                if self._current is None or info["key"] != self._current.key:
+                    version = DataVersion(info, self.backend_name)
+                    version.warm()
+                    self._publish(version)
+            except Exception as exc:
+                # Versi lama tetap dipakai; dicoba lagi saat file berubah lagi
+                self.status.update(state="error", error=f"{type(exc).__name__}: {exc}")
+                if self._current is None:
+                    raise
+            else:
+                self.status.update(state="idle", seconds=time.perf_counter() - start)
+            finally:
+                self._signature = signature
+                self._pending = None
+        return self._current
+
+    def _publish(self, version):
+        previous = self._current
+        version.published = datetime.now()
+        self._current = version  # pergantian referensi atomik
+        self.status["builds"] += 1
+        # Snapshot dan partisi versi sebelumnya disimpan: rerun yang masih
+        # berjalan (dan backend DuckDB-nya) mungkin masih membacanya
+        versions = [version] + ([previous] if previous else [])
+        remove_stale_snapshots([v.info["path"] for v in versions], os.path.dirname(version.info["path"]))
+        if version.partitions is not None:
+            partitions.remove_unused_partitions(
+                [v.partitions for v in versions if v.partitions is not None], version.partition_dir
+            )
+        remove_stale_shared([v.key for v in versions])
+
+    def check(self):
+        """Satu kali pengecekan file sumber; rebuild jika perubahan sudah stabil"""
+        self.status["checked"] = datetime.now()
+        signature = source_signature(self.sources)
+        if signature == self._signature:
+            self._pending = None
+        elif signature != self._pending:
+            # Baru terlihat berubah: tunggu satu interval lagi, file mungkin
+            # masih disalin
+            self._pending = signature
+        else:
+            self.refresh()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def start_worker(backend_name=DEFAULT_BACKEND, sources=SOURCE_FILES, interval=WATCH_INTERVAL):
+    """Build awal (sinkron) lalu jalankan pemantauan di background"""
+    worker = PrecomputeWorker(backend_name, sources, interval)
+    worker.refresh()
+    worker.start()
+    return worker
@@ -0,0 +1,265 @@
+"""
+Backend query untuk agregasi dashboard.
+
+Setiap backend punya method `rollup(name, key)` yang mengembalikan hasil yang
+sama dengan fungsi `cube.<name>` untuk filter `key` (lihat
+`result_cache.filter_key`). Backend `pandas` adalah implementasi acuan dan
+menghitung roll-up dari cube di memori. Backend `duckdb` menjalankan agregasi
+sebagai SQL di DuckDB embedded langsung di atas file Parquet, sehingga hanya
+tabel hasil yang kecil yang masuk ke pandas.
+
+Backend dipilih lewat variabel lingkungan DASHBOARD_BACKEND (default pandas).
+"""
+import os
+import threading
+
+import pandas as pd
+
+import cube
+from filters import apply_filters
+from schema import BULAN_ORDER, HARI_ORDER
+
+BACKENDS = ["pandas", "duckdb"]
+DEFAULT_BACKEND = os.environ.get("DASHBOARD_BACKEND", "pandas")
+
+
+def _unpack_key(key):
+    start_date, end_date, selections = key
+    return pd.Timestamp(start_date), pd.Timestamp(end_date), dict(selections)
+
+
+class PandasBackend:
+    """Roll-up dari cube pandas yang difilter dengan TimeIndex dan BitmapIndex"""
+
+    name = "pandas"
+
+    def __init__(self, cube_frame, time_index, bitmap_index, cube_path=None):
+        self.cube = cube_frame
+        self.time_index = time_index
+        self.bitmap_index = bitmap_index
+        # File Arrow IPC cube ini, jika ada: proses pool di executor.py bisa
+        # membuat backend yang sama dengan me-memory-map file tersebut
+        self.cube_path = cube_path
+        # Cube terfilter terakhir, dipakai ulang oleh roll-up lain dengan filter sama
+        self._lock = threading.Lock()
+        self._last = (None, None)
+
+    def filtered(self, key):
+        with self._lock:
+            last_key, frame = self._last
+        if last_key != key:
+            start_date, end_date, selections = _unpack_key(key)
+            frame = apply_filters(
+                self.cube, start_date, end_date, selections, self.time_index, self.bitmap_index
+            )
+            with self._lock:
+                self._last = (key, frame)
+        return frame
+
+    def rollup(self, name, key):
+        return getattr(cube, name)(self.filtered(key))
+
+
+class DuckDBBackend:
+    """Roll-up sebagai SQL DuckDB di atas file Parquet tabel transaksi"""
+
+    name = "duckdb"
+
+    def __init__(self, parquet_paths, ranges=None):
+        import duckdb  # opsional, hanya dibutuhkan jika backend ini dipilih
+
+        if isinstance(parquet_paths, str):
+            parquet_paths = [parquet_paths]
+        self.paths = list(parquet_paths)
+        # Rentang (min, max) tanggal_jam per file, jika data dipartisi per
+        # bulan: query hanya membaca file yang bersinggungan dengan filter
+        self.ranges = [(pd.Timestamp(lo), pd.Timestamp(hi)) for lo, hi in ranges] if ranges else None
+        self._con = duckdb.connect()
+        self._con.execute(f"CREATE VIEW transaksi AS SELECT * FROM {self._source(self.paths)}")
+
+    @staticmethod
+    def _source(paths):
+        # Path dikutip manual karena daftar file bagian dari teks query
+        files = ", ".join("'" + path.replace("'", "''") + "'" for path in paths)
+        return f"read_parquet([{files}])"
+
+    def _pruned(self, start_date, end_date):
+        """Sumber tabel untuk rentang tanggal: view penuh, atau file yang relevan saja"""
+        if self.ranges is None:
+            return "transaksi"
+        end = end_date + pd.Timedelta(days=1)
+        paths = [path for path, (lo, hi) in zip(self.paths, self.ranges) if lo < end and hi >= start_date]
+        # Tidak ada file yang cocok: tetap baca satu file, filter tanggal
+        # menghasilkan tabel kosong dengan skema yang benar
+        return self._source(paths or self.paths[:1])
+
+    def _query(self, sql, key, order=None):
+        """Menjalankan `sql` dengan {where} diganti klausa filter `key`"""
+        start_date, end_date, selections = _unpack_key(key)
+        where = ["tanggal BETWEEN ? AND ?"]
+        params = [start_date.to_pydatetime(), end_date.to_pydatetime()]
+        for column, selected in selections.items():
+            if selected:
+                where.append(f"{column} IN (SELECT unnest(?))")
+                params.append(list(selected))
+        sql = sql.format(where=" AND ".join(where), transaksi=self._pruned(start_date, end_date))
+        # Cursor terpisah per query agar aman dipakai beberapa thread sesi
+        return self._con.cursor().execute(sql, params + (order or [])).df()
+
+    def _grouped(self, by, key, extra="", order_by=None, order=None):
+        return self._query(
+            f"""
+            SELECT {by}, SUM(total_donasi)::BIGINT AS total_donasi, COUNT(*) AS jumlah_transaksi {extra}
+            FROM {{transaksi}} WHERE {{where}} AND {by} IS NOT NULL
+            GROUP BY {by} ORDER BY {order_by or by}
+            """,
+            key, order,
+        )
+
+    def rollup(self, name, key):
+        return getattr(self, name)(key)
+
+    def summary(self, key):
+        row = self._query(
+            """
+            SELECT COALESCE(SUM(total_donasi), 0)::BIGINT AS total, COUNT(*) AS trx,
+                   COUNT(DISTINCT nama_donatur) AS unik, COUNT(DISTINCT nama_campaign) AS campaign
+            FROM {transaksi} WHERE {where}
+            """,
+            key,
+        ).iloc[0]
+        return {column: int(row[column]) for column in ["total", "trx", "unik", "campaign"]}
+
+    def total_by_status(self, key):
+        return self._grouped("status", key).set_index("status")
+
+    def status_per_metode(self, key):
+        return self._query(
+            """
+            SELECT metode_pembayaran, status, COUNT(*) AS jumlah
+            FROM {transaksi} WHERE {where}
+            GROUP BY ALL ORDER BY metode_pembayaran, status
+            """,
+            key,
+        )
+
+    def success_rate_per_metode(self, key):
+        return self._query(
+            """
+            SELECT metode_pembayaran,
+                   COUNT(*) FILTER (WHERE status = 'Berhasil') / COUNT(*) * 100 AS success_rate
+            FROM {transaksi} WHERE {where}
+            GROUP BY ALL ORDER BY metode_pembayaran
+            """,
+            key,
+        )
+
+    def metode_frequency(self, key):
+        freq = self._query(
+            """
+            SELECT metode_pembayaran AS "Metode Pembayaran", COUNT(*) AS "Jumlah Transaksi"
+            FROM {transaksi} WHERE {where}
+            GROUP BY ALL ORDER BY "Jumlah Transaksi" DESC, "Metode Pembayaran"
+            """,
+            key,
+        )
+        return freq
+
+    def donatur_per_metode(self, key):
+        return self._query(
+            """
+            SELECT nama_donatur, metode_pembayaran, COUNT(*) AS jumlah
+            FROM {transaksi} WHERE {where}
+            GROUP BY ALL ORDER BY nama_donatur, metode_pembayaran
+            """,
+            key,
+        )
+
+    def metode_stats(self, key):
+        stats = self._grouped("metode_pembayaran", key)
+        return pd.DataFrame({
+            "metode_pembayaran": stats["metode_pembayaran"],
+            "Total Donasi": stats["total_donasi"],
+            "Rata-rata Donasi": stats["total_donasi"] / stats["jumlah_transaksi"],
+            "Jumlah Transaksi": stats["jumlah_transaksi"],
+        }).round(2)
+
+    def donatur_stats(self, key):
+        result = self._query(
+            """
+            WITH per_metode AS (
+                SELECT nama_donatur, metode_pembayaran,
+                       SUM(total_donasi)::BIGINT AS total_donasi, COUNT(*) AS jumlah,
+                       MAX(tanggal_jam) AS terakhir
+                FROM {transaksi} WHERE {where} AND nama_donatur IS NOT NULL
+                GROUP BY ALL
+            )
+            SELECT nama_donatur AS "Nama Donatur",
+                   SUM(total_donasi)::BIGINT AS "Total Donasi",
+                   SUM(jumlah)::BIGINT AS "Jumlah Transaksi",
+                   arg_min(metode_pembayaran, (-jumlah, metode_pembayaran)) AS "Metode Favorit",
+                   MAX(terakhir) AS "Donasi Terakhir"
+            FROM per_metode
+            GROUP BY ALL ORDER BY "Nama Donatur"
+            """,
+            key,
+        )
+        return result
+
+    def daily_totals(self, key):
+        daily = self._grouped("tanggal", key)
+        daily.columns = ["Tanggal", "Total Donasi", "Jumlah Transaksi"]
+        daily["Tanggal"] = daily["Tanggal"].dt.date
+        return daily
+
+    def _calendar_stats(self, column, order, key, extra):
+        stats = self._grouped(
+            column, key,
+            extra=extra,
+            order_by=f"list_position(?, {column})",
+            order=[order],
+        )
+        result = pd.DataFrame({
+            column: stats[column],
+            "Total Donasi": stats["total_donasi"],
+            "Rata-rata per Transaksi": stats["total_donasi"] / stats["jumlah_transaksi"],
+            "Jumlah Transaksi": stats["jumlah_transaksi"],
+            "Donatur Unik": stats["donatur_unik"],
+        })
+        if "campaign_aktif" in stats:
+            result["Campaign Aktif"] = stats["campaign_aktif"]
+        return result.round(2)
+
+    def hari_stats(self, key):
+        return self._calendar_stats(
+            "hari", HARI_ORDER, key, ", COUNT(DISTINCT nama_donatur) AS donatur_unik"
+        )
+
+    def bulan_stats(self, key):
+        return self._calendar_stats(
+            "bulan", BULAN_ORDER, key,
+            ", COUNT(DISTINCT nama_donatur) AS donatur_unik, COUNT(DISTINCT nama_campaign) AS campaign_aktif",
+        )
+
+    def jam_stats(self, key):
+        hourly = self._grouped("jam", key)
+        hourly.columns = ["Jam", "Total Donasi", "Jumlah Transaksi"]
+        return hourly
+
+    def campaign_stats(self, key):
+        stats = self._grouped(
+            "nama_campaign", key,
+            extra=""", COUNT(DISTINCT nama_donatur) AS donatur_unik,
+                      MIN(tanggal_jam) AS tanggal_mulai, MAX(tanggal_jam) AS tanggal_selesai""",
+        )
+        result = pd.DataFrame({
+            "nama_campaign": stats["nama_campaign"],
+            "Total Donasi": stats["total_donasi"],
+            "Rata-rata per Transaksi": stats["total_donasi"] / stats["jumlah_transaksi"],
+            "Jumlah Transaksi": stats["jumlah_transaksi"],
+            "Donatur Unik": stats["donatur_unik"],
+            "Total Kontribusi": stats["jumlah_transaksi"],
+        }).round(2)
+        result["Tanggal Mulai"] = stats["tanggal_mulai"]
+        result["Tanggal Selesai"] = stats["tanggal_selesai"]
+        return result
@@ -0,0 +1,100 @@
+"""
+Cache hasil analitik dashboard per kombinasi filter.
+
+Setiap roll-up cube (ringkasan, statistik donatur, harian, bulanan, campaign,
+...) disimpan dengan kunci (versi data, nama analitik, filter). Cache dibagi
+antar sesi dan antar rerun, dibatasi jumlah entrinya (LRU) dan umurnya (TTL),
+jadi staf yang membuka dashboard dengan filter yang sama tidak menghitung
+ulang apa pun. Di bawahnya ada cache disk (disk_cache.py), sehingga hasil
+yang pernah dihitung tetap tersedia setelah server di-restart.
+"""
+import threading
+
+import pandas as pd
+import streamlit as st
+
+import cube
+import disk_cache
+import executor
+import filters
+import query_backend
+
+# Batas cache: entri paling lama tidak dipakai dibuang lebih dulu (LRU) dan
+# setiap entri kedaluwarsa setelah TTL detik
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL = 30 * 60
+
+# Hasil di disk ikut tidak berlaku jika kode roll-up (atau versi pandas) berubah
+ROLLUP_CODE_VERSION = disk_cache.code_version(cube, query_backend, filters, pd)
+
+_lock = threading.Lock()
+_counters = {"calls": 0, "misses": 0, "disk_hits": 0}
+# Counter per thread (satu rerun Streamlit berjalan di satu thread), dipakai
+# panel debug untuk menghitung hit/miss per bagian dashboard
+_local = threading.local()
+
+
+def filter_key(start_date, end_date, selections, all_values=None):
+    """
+    Kunci filter yang bisa di-hash. Pilihan diurutkan, dan kolom dengan semua
+    nilai terpilih disamakan dengan pilihan kosong karena hasilnya sama.
+    """
+    bagian = []
+    for column, selected in sorted(selections.items()):
+        selected = tuple(sorted(map(str, selected)))
+        if all_values is not None and set(selected) >= set(map(str, all_values[column])):
+            selected = ()
+        bagian.append((column, selected))
+    return (str(start_date), str(end_date), tuple(bagian))
+
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached(backend_name, name, data_key, key, _backend):
+    # Badan fungsi hanya dijalankan saat cache miss: coba cache disk dulu,
+    # baru hitung (single-flight, di process pool jika tersedia)
+    with _lock:
+        _counters["misses"] += 1
+    _local.misses = getattr(_local, "misses", 0) + 1
+    disk_key = (backend_name, name, data_key, key)
+    result = disk_cache.get("rollup", ROLLUP_CODE_VERSION, disk_key)
+    if result is not disk_cache.MISS:
+        with _lock:
+            _counters["disk_hits"] += 1
+        return result
+    result = executor.run_rollup(_backend, name, data_key, key)
+    disk_cache.put("rollup", ROLLUP_CODE_VERSION, disk_key, result)
+    return result
+
+
+def cached_result(backend, name, data_key, key):
+    """
+    Hasil `backend.rollup(name, key)` dari cache, dengan kunci (nama backend,
+    name, data_key, key). Backend baru dipanggil jika ada cache miss.
+    """
+    with _lock:
+        _counters["calls"] += 1
+    _local.calls = getattr(_local, "calls", 0) + 1
+    return _cached(backend.name, name, data_key, key, backend)
+
+
+def cache_stats():
+    """
+    Jumlah hit, miss (cache memori), dan rasio hit sejak proses dijalankan.
+    `disk_hits` adalah miss memori yang dijawab oleh cache disk.
+    """
+    with _lock:
+        calls, misses, disk_hits = _counters["calls"], _counters["misses"], _counters["disk_hits"]
+    hits = calls - misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / calls if calls else 0.0, "disk_hits": disk_hits}
+
+
+def thread_counters():
+    """(jumlah panggilan, jumlah miss) cache dari thread ini saja"""
+    return getattr(_local, "calls", 0), getattr(_local, "misses", 0)
+
+
+def clear():
+    """Mengosongkan cache dan counter"""
+    _cached.clear()
+    with _lock:
+        _counters.update(calls=0, misses=0, disk_hits=0)
@@ -0,0 +1,131 @@
+"""
+Skema ringkas (compact) untuk tabel transaksi di memori.
+
+Kolom teks berulang diubah menjadi categorical dengan kamus yang stabil
+(kategori terurut), `tanggal` menjadi datetime64 harian (bukan objek
+`datetime.date`), dan kolom angka diperkecil jika rentang nilainya aman.
+
+Jalankan `python src/schema.py` dari root repository untuk melihat laporan
+memori per baris sebelum dan sesudah.
+"""
+import numpy as np
+import pandas as pd
+
+HARI_ORDER = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+BULAN_ORDER = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+               'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
+
+CATEGORICAL_COLUMNS = ["nama_campaign", "nama_donatur", "metode_pembayaran", "status"]
+
+
+def _smallest_int(series, candidates=("int8", "int16", "int32")):
+    """Tipe integer terkecil yang bisa menampung seluruh nilai kolom"""
+    if series.isna().any():
+        return series
+    lo, hi = series.min(), series.max()
+    for dtype in candidates:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return series.astype(dtype)
+    return series.astype("int64")
+
+
+def _categorical(series, order=None):
+    """
+    Categorical dengan kamus stabil: urutan kalender jika semua nilai ada di
+    `order`, selain itu kategori diurutkan abjad.
+    """
+    if order is not None and series.dropna().isin(order).all():
+        return pd.Categorical(series, categories=order, ordered=True)
+    return pd.Categorical(series, categories=sorted(series.dropna().unique()))
+
+
+def convert_to_indonesian(df):
+    """Mengkonversi nama hari dan bulan ke Bahasa Indonesia"""
+    
+    # Mapping hari ke Bahasa Indonesia
+    day_mapping = {
+        'Monday': 'Senin',
+        'Tuesday': 'Selasa', 
+        'Wednesday': 'Rabu',
+        'Thursday': 'Kamis',
+        'Friday': 'Jumat',
+        'Saturday': 'Sabtu',
+        'Sunday': 'Minggu'
+    }
+    
+    # Mapping bulan ke Bahasa Indonesia
+    month_mapping = {
+        'January': 'Januari',
+        'February': 'Februari',
+        'March': 'Maret',
+        'April': 'April',
+        'May': 'Mei',
+        'June': 'Juni',
+        'July': 'Juli',
+        'August': 'Agustus',
+        'September': 'September',
+        'October': 'Oktober',
+        'November': 'November',
+        'December': 'Desember'
+    }
+    
+    # Konversi nama hari jika kolom 'hari' ada
+    if 'hari' in df.columns:
+        df['hari'] = df['tanggal_jam'].dt.day_name().map(day_mapping)
+    
+    # Konversi nama bulan jika kolom 'bulan' ada
+    if 'bulan' in df.columns:
+        df['bulan'] = df['tanggal_jam'].dt.month_name().map(month_mapping)
+    
+    return df
+
+
+def compact_transaksi(df):
+    """Mengembalikan salinan `df` dengan skema ringkas"""
+    df = df.copy()
+
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = _categorical(df[column])
+
+    df["hari"] = _categorical(df["hari"], HARI_ORDER)
+    if pd.api.types.is_integer_dtype(df["bulan"]):
+        df["bulan"] = _smallest_int(df["bulan"])
+    else:
+        df["bulan"] = _categorical(df["bulan"], BULAN_ORDER)
+
+    df["tanggal"] = df["tanggal_jam"].dt.normalize()
+
+    for column in ["tahun", "minggu", "jam"]:
+        df[column] = _smallest_int(df[column].astype("int64"))
+
+    # Nominal donasi tetap int64 jika ada nilai di atas batas int32
+    df["total_donasi"] = _smallest_int(df["total_donasi"], candidates=("int32",))
+    return df
+
+
+def memory_report(before, after):
+    """Tabel byte per baris setiap kolom sebelum dan sesudah compact"""
+    rows_before = max(len(before), 1)
+    rows_after = max(len(after), 1)
+    report = pd.DataFrame({
+        "dtype_sebelum": before.dtypes.astype(str),
+        "byte_per_baris_sebelum": before.memory_usage(deep=True, index=False) / rows_before,
+        "dtype_sesudah": after.dtypes.astype(str),
+        "byte_per_baris_sesudah": after.memory_usage(deep=True, index=False) / rows_after,
+    })
+    report.loc["TOTAL"] = [
+        "", report["byte_per_baris_sebelum"].sum(), "", report["byte_per_baris_sesudah"].sum()
+    ]
+    report["hemat_%"] = (
+        (1 - report["byte_per_baris_sesudah"] / report["byte_per_baris_sebelum"]) * 100
+    ).round(1)
+    return report.round({"byte_per_baris_sebelum": 1, "byte_per_baris_sesudah": 1})
+
+
+if __name__ == "__main__":
+    from cleaning_data import clean_and_merge_transaksi
+    from import_data import load_data
+
+    df_clean = clean_and_merge_transaksi(*load_data())
+    print(memory_report(df_clean, compact_transaksi(df_clean)).to_string())
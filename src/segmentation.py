@@ -0,0 +1,95 @@
+"""
+Segmentasi donatur di atas hasil roll-up `donatur_stats`.
+
+Semua segmen dihitung dalam satu lintasan vektor per kolom: setiap kuantil
+dihitung sekali, tier dipilih dengan `np.searchsorted`, dan skor RFM dengan
+ranking persentil, tanpa `apply` per baris.
+"""
+import numpy as np
+import pandas as pd
+
+# Urutan tier dari terendah ke tertinggi; batasnya kuartil Total Donasi
+TIER_LABELS = ["🥉 Bronze Donor", "🥈 Silver Donor", "💎 Gold Donor", "🌟 Premium Donor"]
+
+# Segmen RFM (urutan = prioritas, aturan pertama yang cocok dipakai)
+RFM_SEGMENTS = [
+    ("🏆 Champions", lambda r, f, m: (r >= 4) & (f >= 4)),
+    ("💙 Loyal", lambda r, f, m: (r >= 3) & (f >= 3)),
+    ("💎 Big Spender", lambda r, f, m: (m >= 4) & (r >= 2)),
+    ("🌱 Donatur Baru", lambda r, f, m: (r >= 4) & (f <= 2)),
+    ("⚠️ Berisiko", lambda r, f, m: (r <= 2) & (f >= 3)),
+    ("😴 Hibernasi", lambda r, f, m: r <= 2),
+]
+RFM_DEFAULT = "🔄 Perlu Perhatian"
+
+
+def segment_donatur(stats):
+    """
+    Menambahkan kolom tier dan segmen perilaku ke `donatur_stats`.
+
+    - "Kategori": Premium (>= Q3), Gold (>= median), Silver (>= Q1), Bronze
+    - "Frequent Small": frekuensi >= Q3 frekuensi dan total <= median total
+    - "Occasional Big": frekuensi <= median frekuensi dan total >= Q3 total
+    """
+    total = stats["Total Donasi"].to_numpy()
+    frekuensi = stats["Jumlah Transaksi"].to_numpy()
+    q25, q50, q75 = stats["Total Donasi"].quantile([0.25, 0.5, 0.75]).to_numpy()
+    f50, f75 = stats["Jumlah Transaksi"].quantile([0.5, 0.75]).to_numpy()
+
+    # Jumlah batas yang <= nominal = indeks tier (sama dengan if >= q75 ... elif)
+    tier = np.searchsorted([q25, q50, q75], total, side="right")
+    result = stats.copy()
+    result["Kategori"] = np.asarray(TIER_LABELS, dtype=object)[tier]
+    result["Frequent Small"] = (frekuensi >= f75) & (total <= q50)
+    result["Occasional Big"] = (frekuensi <= f50) & (total >= q75)
+    return result
+
+
+def tier_counts(segmented):
+    """Jumlah donatur per tier, urut dari Premium ke Bronze"""
+    return segmented["Kategori"].value_counts().reindex(TIER_LABELS[::-1], fill_value=0)
+
+
+def _score(values, higher_is_better=True):
+    # Skor 1-5 dari persentil; nilai yang sama mendapat skor yang sama (yang
+    # terendah, jadi mayoritas donatur 1x transaksi tetap F=1)
+    pct = pd.Series(values).rank(method="min", pct=True).to_numpy()
+    score = np.ceil(pct * 5).clip(1, 5).astype("int8")
+    return score if higher_is_better else (6 - score).astype("int8")
+
+
+def rfm_scores(stats, reference):
+    """
+    Skor RFM (1-5) per donatur dan segmennya.
+
+    Recency = hari sejak "Donasi Terakhir" hingga `reference` (makin baru makin
+    tinggi skornya), Frequency = "Jumlah Transaksi", Monetary = "Total Donasi".
+    """
+    reference = pd.Timestamp(reference)
+    recency = (reference - stats["Donasi Terakhir"]).dt.days.to_numpy()
+    r = _score(recency, higher_is_better=False)
+    f = _score(stats["Jumlah Transaksi"].to_numpy())
+    m = _score(stats["Total Donasi"].to_numpy())
+
+    result = stats.copy()
+    result["Recency (hari)"] = recency
+    result["R"], result["F"], result["M"] = r, f, m
+    result["Skor RFM"] = r.astype("int16") * 100 + f * 10 + m
+    result["Segmen RFM"] = np.select(
+        [rule(r, f, m) for _, rule in RFM_SEGMENTS],
+        [label for label, _ in RFM_SEGMENTS],
+        default=RFM_DEFAULT,
+    )
+    return result
+
+
+def rfm_summary(rfm):
+    """Ringkasan per segmen RFM: jumlah donatur, rata-rata R/F/M, total donasi"""
+    urutan = [label for label, _ in RFM_SEGMENTS] + [RFM_DEFAULT]
+    summary = rfm.groupby("Segmen RFM").agg(**{
+        "Jumlah Donatur": ("Nama Donatur", "size"),
+        "Rata-rata Recency (hari)": ("Recency (hari)", "mean"),
+        "Rata-rata Transaksi": ("Jumlah Transaksi", "mean"),
+        "Total Donasi": ("Total Donasi", "sum"),
+    })
+    return summary.reindex([label for label in urutan if label in summary.index]).reset_index()
@@ -0,0 +1,105 @@
+"""
+Dataset transaksi bersama untuk semua sesi Streamlit.
+
+Data bersih disimpan sekali per proses sebagai tabel Arrow. Frame pandas yang
+dipakai dashboard dibuat zero-copy dari buffer Arrow tersebut, sehingga semua
+array kolomnya read-only, dan dibungkus `ReadOnlyFrame` yang menolak perubahan
+struktur (tambah/hapus/ganti kolom, operasi inplace). Kode sesi hanya boleh
+memakai view, slice, atau mask dari frame ini; hasil operasi seperti filter,
+`iloc`, atau `sort_values` adalah DataFrame biasa milik sesi itu sendiri.
+
+Dataset juga bisa dibagi antar proses: `write_ipc` menulis tabel sebagai file
+Arrow IPC tanpa kompresi, dan `SharedDataset.from_ipc` me-memory-map file itu
+read-only. Array kolom (termasuk kode categorical) langsung menunjuk ke page
+cache, jadi beberapa proses Streamlit berbagi satu salinan fisik data; hanya
+kamus kategori yang dibuat per proses.
+"""
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+
+class SharedFrameMutationError(TypeError):
+    """Dilempar saat ada kode yang mencoba mengubah frame bersama"""
+
+
+def _tolak(*args, **kwargs):
+    raise SharedFrameMutationError(
+        "Frame transaksi dibagi antar sesi dan tidak boleh diubah. "
+        "Buat salinan (df.copy()) atau kerjakan pada hasil filter."
+    )
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """
+    DataFrame yang tidak bisa diubah. Perubahan nilai ditolak oleh array
+    read-only (ValueError dari NumPy), perubahan struktur ditolak di sini.
+    """
+
+    @property
+    def _constructor(self):
+        # Hasil turunan (filter, slice, sort, groupby) adalah DataFrame biasa
+        return pd.DataFrame
+
+    __setitem__ = _tolak
+    __delitem__ = _tolak
+    insert = _tolak
+    pop = _tolak
+    _set_item = _tolak
+    _update_inplace = _tolak
+
+    def __setattr__(self, name, value):
+        if name in ("columns", "index") or name in getattr(self, "columns", ()):
+            _tolak()
+        super().__setattr__(name, value)
+
+
+def _freeze(frame):
+    for column in frame.columns:
+        values = frame[column].array
+        # Categorical menyimpan kode di _codes, array lain di _ndarray
+        for attr in ("_ndarray", "_codes"):
+            array = getattr(values, attr, None)
+            if array is not None:
+                array.flags.writeable = False
+    return frame
+
+
+class SharedDataset:
+    """
+    Handle dataset bersama: `table` (pyarrow.Table, immutable), `frame`
+    (ReadOnlyFrame zero-copy dari `table`), dan `key` versi data.
+    """
+
+    def __init__(self, df, key, table=None):
+        self.key = key
+        self.table = table if table is not None else pa.Table.from_pandas(df, preserve_index=False)
+        frame = self.table.to_pandas(split_blocks=True)
+        self.frame = _freeze(ReadOnlyFrame(frame))
+
+    @classmethod
+    def from_ipc(cls, path, key):
+        """Dataset dari file Arrow IPC yang di-memory-map (tanpa membaca seluruh file)"""
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        return cls(None, key, table=table)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+
+def write_ipc(df, path):
+    """
+    Menulis `df` sebagai file Arrow IPC tanpa kompresi (syarat memory-map
+    zero-copy), secara atomik agar proses lain tidak membaca file setengah jadi.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
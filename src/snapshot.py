@@ -0,0 +1,85 @@
+import hashlib
+import os
+import time
+
+import pandas as pd
+
+from cleaning_data import CLEANING_VERSION
+
+# File sumber hasil export SobatBerbagi
+SOURCE_FILES = ["data/transaksi_qris.xlsx", "data/transaksi_manual.xlsx"]
+
+# Folder penyimpanan snapshot Parquet hasil cleaning
+CACHE_DIR = "data/cache"
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """Menghitung hash SHA-256 dari isi sebuah file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def snapshot_key(sources=SOURCE_FILES, version=CLEANING_VERSION):
+    """Membuat kunci snapshot dari hash isi file sumber dan versi kode cleaning"""
+    digest = hashlib.sha256(version.encode("utf-8"))
+    for path in sources:
+        digest.update(hash_file(path).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def snapshot_path(key, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"transaksi_{key}.parquet")
+
+
+def write_snapshot(df, path):
+    """Menulis snapshot secara atomik agar pembaca tidak melihat file setengah jadi"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def remove_stale_snapshots(keep_paths, cache_dir=CACHE_DIR):
+    """Menghapus snapshot lama yang kuncinya sudah tidak berlaku"""
+    if isinstance(keep_paths, str):
+        keep_paths = [keep_paths]
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith("transaksi_") and name.endswith(".parquet") and path not in keep_paths:
+            os.remove(path)
+
+
+def load_or_build(build, sources=SOURCE_FILES, version=CLEANING_VERSION, cache_dir=CACHE_DIR, remove_stale=True):
+    """
+    Memuat data bersih dari snapshot Parquet, atau membangunnya ulang dengan
+    `build()` jika file sumber atau versi cleaning berubah. Dengan
+    `remove_stale=False` snapshot lama dibiarkan (dihapus oleh pemanggil).
+
+    Mengembalikan (df, info) dengan info berisi status "hit"/"miss",
+    kunci snapshot, dan lama proses dalam detik.
+    """
+    start = time.perf_counter()
+    key = snapshot_key(sources, version)
+    path = snapshot_path(key, cache_dir)
+
+    if os.path.exists(path):
+        df = pd.read_parquet(path)
+        status = "hit"
+    else:
+        df = build()
+        write_snapshot(df, path)
+        if remove_stale:
+            remove_stale_snapshots(path, cache_dir)
+        status = "miss"
+
+    info = {
+        "status": status,
+        "key": key,
+        "path": path,
+        "rows": len(df),
+        "seconds": time.perf_counter() - start,
+    }
+    return df, info
@@ -0,0 +1,58 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+
+# Modul aplikasi ada di src/ (flat, tanpa package), seperti saat dijalankan
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from cleaning_data import clean_and_merge_transaksi  # noqa: E402
+from filters import sort_by_time  # noqa: E402
+from schema import compact_transaksi, convert_to_indonesian  # noqa: E402
+
+BULAN = ["Januari", "Februari", "Maret"]
+
+
+def _export(rows):
+    df = pd.DataFrame(rows, columns=["Tanggal", "Nama Campaign", "Nama Donatur", "Total Donasi", "Status"])
+    df.insert(0, "No", range(1, len(df) + 1))
+    return df.astype({column: "str" for column in df.columns[1:]})
+
+
+@pytest.fixture
+def export():
+    """Pembuat export mentah dari tuple (Tanggal, Nama Campaign, Nama Donatur, Total Donasi, Status) seperti file SobatBerbagi"""
+    return _export
+
+
+@pytest.fixture
+def data_dir():
+    """Folder data/ repo berisi export contoh"""
+    return DATA_DIR
+
+
+@pytest.fixture
+def transaksi():
+    """Transaksi bersih berskema ringkas, seperti precompute.build_data"""
+    rng = np.random.default_rng(7)
+    rows = []
+    for _ in range(400):
+        rows.append((
+            f"{rng.integers(1, 29)} {rng.choice(BULAN)} 2024 {rng.integers(0, 24):02d}:{rng.integers(0, 60):02d}",
+            f"Campaign {rng.integers(0, 5)}",
+            f"Donatur {rng.zipf(1.5) % 15}",
+            f"Rp {rng.integers(1, 500) * 1_000:,}".replace(",", "."),
+            rng.choice(["Berhasil", "Belum Di Konfirmasi"], p=[0.7, 0.3]),
+        ))
+    # Metode favorit seri: satu QRIS dan satu Manual -> urutan abjad (Manual)
+    qris = _export(rows[::2] + [("3 Maret 2024 10:00", "Campaign 1", "Seri", "Rp 5.000", "Berhasil")])
+    manual = _export(rows[1::2] + [("4 Maret 2024 11:00", "Campaign 2", "Seri", "Rp 7.000", "Berhasil")])
+    df = clean_and_merge_transaksi(qris, manual)
+    # Beberapa donatur memakai kedua metode, jadi "Metode Favorit" benar-benar diuji
+    assert df.groupby("nama_donatur")["metode_pembayaran"].nunique().gt(1).sum() > 1
+    return sort_by_time(compact_transaksi(convert_to_indonesian(df)))
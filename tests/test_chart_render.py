@@ -0,0 +1,63 @@
+"""Downsampling LTTB dan optimasi figure besar."""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import pytest
+
+from chart_render import MAX_LINE_POINTS, WEBGL_THRESHOLD, lttb, optimize_figure
+
+
+def test_lttb_keeps_endpoints_and_threshold():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000)
+    y = rng.normal(size=len(x)).cumsum()
+    index = lttb(x, y, 500)
+    assert len(index) == 500
+    assert index[0] == 0 and index[-1] == len(x) - 1
+    assert (np.diff(index) > 0).all()
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(10_000)
+    y[[1_234, 7_777]] = [100, -100]
+    index = lttb(np.arange(len(y)), y, 100)
+    assert {1_234, 7_777} <= set(index)
+
+
+def test_lttb_datetime_axis():
+    x = pd.date_range("2024-01-01", periods=5_000, freq="h")
+    index = lttb(x, np.sin(np.arange(len(x)) / 50), 200)
+    assert len(index) == 200
+
+
+@pytest.mark.parametrize("threshold", [2, 10_000, 20_000])
+def test_lttb_returns_all_points_when_not_reducing(threshold):
+    assert len(lttb(np.arange(10_000), np.zeros(10_000), threshold)) == 10_000
+
+
+def test_large_px_line_is_downsampled():
+    # plotly.express memakai scattergl untuk trace di atas 1.000 titik
+    df = pd.DataFrame({
+        "tanggal": pd.date_range("2020-01-01", periods=50_000, freq="h"),
+        "total": np.random.default_rng(0).normal(size=50_000).cumsum(),
+    })
+    fig = px.line(df, x="tanggal", y="total")
+    assert fig.data[0].type == "scattergl"
+
+    result = optimize_figure(fig)
+    assert len(result.data[0].x) <= MAX_LINE_POINTS
+    assert len(result.data[0].x) == len(result.data[0].y)
+
+
+def test_small_figure_is_unchanged():
+    fig = px.line(x=np.arange(WEBGL_THRESHOLD), y=np.arange(WEBGL_THRESHOLD))
+    assert optimize_figure(fig) is fig
+
+
+def test_payload_over_cap_is_logged(caplog):
+    # Bar tidak diperkecil: figure dikembalikan apa adanya, dengan peringatan
+    fig = px.bar(x=np.arange(50_000), y=np.ones(50_000))
+    with caplog.at_level("WARNING", logger="chart_render"):
+        result = optimize_figure(fig, max_payload_kb=10)
+    assert len(result.data[0].x) == 50_000
+    assert "di atas batas 10 KB" in caplog.text and "bar" in caplog.text
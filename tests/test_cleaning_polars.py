@@ -0,0 +1,60 @@
+"""Engine Polars harus menghasilkan DataFrame yang identik dengan engine pandas."""
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("polars")
+
+from cleaning_data import clean_and_merge_transaksi  # noqa: E402
+from cleaning_polars import clean_and_merge_transaksi_polars  # noqa: E402
+from import_data import load_data  # noqa: E402
+
+
+def assert_same(df_qris, df_manual):
+    expected = clean_and_merge_transaksi(df_qris.copy(), df_manual.copy())
+    result = clean_and_merge_transaksi_polars(df_qris, df_manual)
+    pd.testing.assert_frame_equal(expected, result)
+    return result
+
+
+def test_bundled_exports(data_dir):
+    df_qris, df_manual = load_data(
+        os.path.join(data_dir, "transaksi_qris.xlsx"), os.path.join(data_dir, "transaksi_manual.xlsx")
+    )
+    result = assert_same(df_qris, df_manual)
+    assert len(result) > 0
+
+
+@pytest.mark.parametrize("tanggal", ["", "   ", None])
+def test_blank_dates_become_nat(tanggal, export):
+    rows = [
+        (tanggal, "Campaign", "Budi", "Rp 1.000", "Berhasil"),
+        ("1 Januari 2024 07:05", "Campaign", "Ani", "Rp 2.000", "Berhasil"),
+    ]
+    result = assert_same(export(rows), export(rows[1:]))
+    assert result["tanggal_jam"].isna().sum() == 1
+
+
+@pytest.mark.parametrize("tanggal", ["5 Januari 2024 7:05", "  5 Januari 2024 17:05", "31 Desember 2024 23:59"])
+def test_odd_date_strings(tanggal, export):
+    rows = [(tanggal, "Campaign", "Budi", "Rp 1.000", "Berhasil")]
+    assert_same(export(rows), export(rows))
+
+
+def test_rupiah_comma_decimals(export):
+    nominal = ["Rp 50.000,00", "Rp 1.250,50", "Rp 1.251,50", "Rp 0,49", "Rp 12,6", "abc", ""]
+    rows = [("5 Januari 2024 17:05", "Campaign", "Budi", value, "Berhasil") for value in nominal]
+    result = assert_same(export(rows), export(rows[:1]))
+    # "Rp 0,49", "abc", dan "" menjadi 0 lalu dibuang
+    assert result["total_donasi"].tolist()[:4] == [50_000, 1_250, 1_252, 13]
+
+
+def test_duplicated_rows(export):
+    row = ("5 Januari 2024 17:05", "Campaign", " hamba allah ", "Rp 1.000", "Belum Di Konfirmasi")
+    rows = [row] * 3 + [("5 Januari 2024 17:05", "-", "Budi", "Rp 1.000", "Berhasil")]
+    result = assert_same(export(rows), export(rows[:2]))
+    # Baris duplikat tidak digabung; campaign "-" dibuang
+    assert len(result) == 5
+    assert set(result["nama_donatur"]) == {"Anonim"}
+    assert set(result["status"]) == {"Pending"}
@@ -0,0 +1,122 @@
+"""Roll-up cube harus sama dengan groupby biasa pada baris transaksi (cara lama di app.py)."""
+import pandas as pd
+
+import cube
+
+
+def assert_same(result, expected):
+    def plain(df):
+        df = df.reset_index(drop=True)
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].astype(object)
+        return df
+
+    pd.testing.assert_frame_equal(plain(result), plain(expected), check_dtype=False)
+
+
+def test_summary(transaksi):
+    result = cube.summary(cube.build_cube(transaksi))
+    assert result == {
+        "total": transaksi["total_donasi"].sum(),
+        "trx": len(transaksi),
+        "unik": transaksi["nama_donatur"].nunique(),
+        "campaign": transaksi["nama_campaign"].nunique(),
+    }
+
+
+def test_total_by_status(transaksi):
+    expected = transaksi.groupby("status", observed=True)["total_donasi"].agg(["sum", "size"])
+    expected.columns = ["total_donasi", "jumlah_transaksi"]
+    assert_same(cube.total_by_status(cube.build_cube(transaksi)), expected)
+
+
+def test_status_and_donatur_per_metode(transaksi):
+    data = cube.build_cube(transaksi)
+    for rollup, by in [
+        (cube.status_per_metode, ["metode_pembayaran", "status"]),
+        (cube.donatur_per_metode, ["nama_donatur", "metode_pembayaran"]),
+    ]:
+        expected = transaksi.groupby(by, observed=True).size().reset_index(name="jumlah")
+        assert_same(rollup(data), expected)
+
+
+def test_success_rate_per_metode(transaksi):
+    expected = (
+        transaksi.groupby("metode_pembayaran", observed=True)["status"]
+        .apply(lambda x: (x == "Berhasil").sum() / len(x) * 100)
+        .reset_index(name="success_rate")
+    )
+    assert_same(cube.success_rate_per_metode(cube.build_cube(transaksi)), expected)
+
+
+def test_metode_frequency(transaksi):
+    expected = transaksi["metode_pembayaran"].value_counts().reset_index()
+    expected.columns = ["Metode Pembayaran", "Jumlah Transaksi"]
+    result = cube.metode_frequency(cube.build_cube(transaksi))
+    assert_same(result, expected)
+
+
+def test_metode_stats(transaksi):
+    expected = transaksi.groupby("metode_pembayaran", observed=True).agg(
+        {"total_donasi": ["sum", "mean", "count"]}
+    ).round(2)
+    expected.columns = ["Total Donasi", "Rata-rata Donasi", "Jumlah Transaksi"]
+    assert_same(cube.metode_stats(cube.build_cube(transaksi)), expected.reset_index())
+
+
+def test_donatur_stats(transaksi):
+    expected = transaksi.groupby("nama_donatur", observed=True).agg({
+        "total_donasi": "sum",
+        "nama_campaign": "count",
+        "metode_pembayaran": lambda x: x.mode().iloc[0],
+        "tanggal_jam": "max",
+    }).reset_index()
+    expected.columns = ["Nama Donatur", "Total Donasi", "Jumlah Transaksi", "Metode Favorit", "Donasi Terakhir"]
+    result = cube.donatur_stats(cube.build_cube(transaksi))
+    assert_same(result, expected)
+    assert result.set_index("Nama Donatur").loc["Seri", "Metode Favorit"] == "Manual"
+
+
+def test_daily_totals(transaksi):
+    expected = transaksi.groupby(transaksi["tanggal_jam"].dt.date).agg(
+        {"total_donasi": "sum", "nama_donatur": "count"}
+    ).reset_index()
+    expected.columns = ["Tanggal", "Total Donasi", "Jumlah Transaksi"]
+    assert_same(cube.daily_totals(cube.build_cube(transaksi)), expected)
+
+
+def test_hari_and_jam_stats(transaksi):
+    data = cube.build_cube(transaksi)
+    harian = transaksi.groupby("hari", observed=True).agg(
+        {"total_donasi": ["sum", "mean", "count"], "nama_donatur": "nunique"}
+    ).round(2)
+    harian.columns = ["Total Donasi", "Rata-rata per Transaksi", "Jumlah Transaksi", "Donatur Unik"]
+    assert_same(cube.hari_stats(data), harian.reset_index())
+
+    per_jam = transaksi.groupby("jam").agg({"total_donasi": "sum", "nama_donatur": "count"}).reset_index()
+    per_jam.columns = ["Jam", "Total Donasi", "Jumlah Transaksi"]
+    assert_same(cube.jam_stats(data), per_jam)
+
+
+def test_bulan_stats(transaksi):
+    expected = transaksi.groupby("bulan", observed=True).agg({
+        "total_donasi": ["sum", "mean", "count"],
+        "nama_donatur": "nunique",
+        "nama_campaign": "nunique",
+    }).round(2)
+    expected.columns = ["Total Donasi", "Rata-rata per Transaksi", "Jumlah Transaksi", "Donatur Unik", "Campaign Aktif"]
+    assert_same(cube.bulan_stats(cube.build_cube(transaksi)), expected.reset_index())
+
+
+def test_campaign_stats(transaksi):
+    expected = transaksi.groupby("nama_campaign", observed=True).agg({
+        "total_donasi": ["sum", "mean", "count"],
+        "nama_donatur": ["nunique", "count"],
+        "tanggal_jam": ["min", "max"],
+    }).round({("total_donasi", "mean"): 2})
+    expected.columns = [
+        "Total Donasi", "Rata-rata per Transaksi", "Jumlah Transaksi",
+        "Donatur Unik", "Total Kontribusi", "Tanggal Mulai", "Tanggal Selesai",
+    ]
+    assert_same(cube.campaign_stats(cube.build_cube(transaksi)), expected.reset_index())
@@ -0,0 +1,66 @@
+"""Cache hasil di disk: kunci versi, budget ukuran, dan eviction LRU."""
+import itertools
+import types
+
+import pandas as pd
+import pytest
+
+import disk_cache
+
+
+@pytest.fixture
+def path(tmp_path, monkeypatch):
+    # Jam palsu: setiap get/put mendapat waktu akses yang berbeda dan berurutan
+    clock = itertools.count(1)
+    monkeypatch.setattr(disk_cache, "time", types.SimpleNamespace(time=lambda: float(next(clock))))
+    return str(tmp_path / "results.sqlite")
+
+
+def test_roundtrip_and_version_key(path):
+    df = pd.DataFrame({"a": [1, 2], "b": pd.Categorical(["x", "y"])})
+    disk_cache.put("rollup", "v1", ("summary", "filter"), df, path)
+
+    pd.testing.assert_frame_equal(disk_cache.get("rollup", "v1", ("summary", "filter"), path), df)
+    assert disk_cache.get("rollup", "v2", ("summary", "filter"), path) is disk_cache.MISS
+    assert disk_cache.get("figure", "v1", ("summary", "filter"), path) is disk_cache.MISS
+    assert disk_cache.get("rollup", "v1", ("summary", "lain"), path) is disk_cache.MISS
+
+
+def test_none_is_a_value(path):
+    disk_cache.put("rollup", "v1", "kosong", None, path)
+    assert disk_cache.get("rollup", "v1", "kosong", path) is None
+
+
+def test_evicts_least_recently_read(path):
+    budget_mb = 1
+    blob = b"x" * 220_000  # 5 entri melebihi budget 1 MB, 4 entri di bawah 90%-nya
+    for i in range(4):
+        disk_cache.put("rollup", "v1", i, blob, path, budget_mb)
+    # Entri 0 dibaca lagi, jadi entri 1 yang paling lama tidak dipakai
+    assert disk_cache.get("rollup", "v1", 0, path) == blob
+    disk_cache.put("rollup", "v1", 4, blob, path, budget_mb)
+
+    tersimpan = [i for i in range(5) if disk_cache.get("rollup", "v1", i, path) is not disk_cache.MISS]
+    assert tersimpan == [0, 2, 3, 4]
+    stats = disk_cache.stats(path)
+    assert stats["size_mb"] <= budget_mb * disk_cache.EVICT_TARGET
+
+
+def test_value_larger_than_budget_is_not_stored(path):
+    disk_cache.put("rollup", "v1", "besar", b"x" * 2_000_000, path, budget_mb=1)
+    assert disk_cache.get("rollup", "v1", "besar", path) is disk_cache.MISS
+
+
+def test_disabled_with_zero_budget(path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "BUDGET_MB", 0)
+    disk_cache.put("rollup", "v1", "a", 1, path)
+    assert disk_cache.get("rollup", "v1", "a", path) is disk_cache.MISS
+    assert "entries" not in disk_cache.stats(path)
+
+
+def test_code_version_changes_with_module_source(tmp_path):
+    module = tmp_path / "modul_contoh.py"
+    module.write_text("X = 1\n")
+    versi = disk_cache.code_version(types.SimpleNamespace(__file__=str(module)))
+    module.write_text("X = 2\n")
+    assert disk_cache.code_version(types.SimpleNamespace(__file__=str(module))) != versi
@@ -0,0 +1,96 @@
+"""Indeks filter sidebar harus memberi hasil yang sama dengan filter tanpa indeks."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from filters import DENSE_MAX_VALUES, BitmapIndex, TimeIndex, apply_filters, sort_by_time, value_mask
+
+
+def transaksi(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-01-01")
+    waktu = start + pd.to_timedelta(rng.integers(0, 90 * 24 * 60, size=rows), unit="min")
+    df = pd.DataFrame({"tanggal_jam": waktu})
+    df["tanggal"] = df["tanggal_jam"].dt.normalize()
+    df["metode_pembayaran"] = rng.choice(["QRIS", "Manual"], size=rows)
+    df["status"] = rng.choice(["Berhasil", "Pending", "Gagal"], size=rows)
+    # Lebih dari DENSE_MAX_VALUES nilai: disimpan sebagai daftar posisi
+    df["nama_campaign"] = rng.choice([f"Campaign {i}" for i in range(DENSE_MAX_VALUES * 2)], size=rows)
+    df["nama_donatur"] = pd.Categorical(rng.choice([f"Donatur {i}" for i in range(300)], size=rows))
+    return sort_by_time(df)
+
+
+def test_time_index_requires_sorted_data():
+    df = transaksi(100)
+    with pytest.raises(ValueError):
+        TimeIndex(df["tanggal_jam"][::-1])
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2024-01-01", "2024-03-31"),  # seluruh data
+    ("2024-02-10", "2024-02-10"),  # satu hari, inklusif
+    ("2024-02-29", "2024-02-01"),  # rentang terbalik -> kosong
+    ("2023-06-01", "2023-12-31"),  # sebelum data
+    ("2024-03-15", "2025-01-01"),  # melewati akhir data
+])
+def test_day_range_matches_date_comparison(start, end):
+    df = transaksi(5_000)
+    index = TimeIndex(df["tanggal_jam"])
+    expected = df[(df["tanggal"] >= pd.Timestamp(start)) & (df["tanggal"] <= pd.Timestamp(end))]
+    result = index.slice_frame(df, pd.Timestamp(start).date(), pd.Timestamp(end).date())
+    pd.testing.assert_frame_equal(result, expected)
+    pd.testing.assert_frame_equal(apply_filters(df, start, end, {}, time_index=index), expected)
+
+
+def test_empty_frame():
+    df = transaksi(0)
+    index = TimeIndex(df["tanggal_jam"])
+    assert len(index) == 0
+    assert index.day_range("2024-01-01", "2024-12-31") == slice(0, 0)
+
+
+def random_selections(index, rng):
+    selections = {}
+    for column, values in index.values.items():
+        pilihan = rng.integers(0, 4)
+        if pilihan == 0:
+            selections[column] = []  # tanpa filter
+        elif pilihan == 1:
+            selections[column] = list(values)  # semua nilai = tanpa filter
+        else:
+            k = int(rng.integers(1, min(len(values), 5) + 1))
+            selections[column] = list(rng.choice(values, size=k, replace=False)) + ["tidak ada"]
+    return selections
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bitmap_index_matches_isin(seed):
+    rng = np.random.default_rng(seed)
+    df = transaksi(1_003, seed)  # bukan kelipatan 8: byte bitmap terakhir tidak penuh
+    index = BitmapIndex(df)
+    time_index = TimeIndex(df["tanggal_jam"])
+    selections = random_selections(index, rng)
+    start, end = sorted(pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, size=2), unit="D"))
+
+    expected = apply_filters(df, start, end, selections)
+    result = apply_filters(df, start, end, selections, time_index, index)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("rows", [slice(None), slice(3, 17), slice(8, 16), slice(1_000, 1_003), slice(5, 5)])
+def test_bitmap_select_on_slices(rows):
+    df = transaksi(1_003)
+    index = BitmapIndex(df)
+    selections = {"status": ["Berhasil"], "nama_campaign": ["Campaign 1", "Campaign 100"]}
+    expected = value_mask(df, selections)[rows]
+    np.testing.assert_array_equal(index.select(selections, rows), expected)
+    mask = np.zeros(len(df), dtype=bool)
+    mask[rows] = True
+    np.testing.assert_array_equal(index.select(selections, mask), value_mask(df, selections)[mask])
+
+
+def test_bitmap_select_without_restriction():
+    df = transaksi(100)
+    index = BitmapIndex(df)
+    assert index.select({"status": [], "metode_pembayaran": ["QRIS", "Manual"]}) is None
+    assert not index.select({"status": ["tidak ada"]}).any()
@@ -0,0 +1,84 @@
+"""Ingestion inkremental: hasil store harus sama dengan cleaning penuh export terbaru."""
+import os
+
+import pandas as pd
+
+import ingest
+from cleaning_data import clean_and_merge_transaksi
+
+
+def transaksi(tanggal, donatur, nominal="Rp 10.000", status="Belum Di Konfirmasi", campaign="Campaign A"):
+    return (tanggal, campaign, donatur, nominal, status)
+
+
+def cleaned(df_qris, df_manual):
+    df = clean_and_merge_transaksi(df_qris.copy(), df_manual.copy())
+    return df.sort_values("tanggal_jam", kind="stable", ignore_index=True)
+
+
+def assert_store_equals(store_dir, df_qris, df_manual):
+    result = ingest.read_store(store_dir)
+    expected = cleaned(df_qris, df_manual)
+    columns = ingest.KEY_COLUMNS + ["status"]
+    pd.testing.assert_frame_equal(
+        result[columns].sort_values(columns, ignore_index=True),
+        expected[columns].sort_values(columns, ignore_index=True),
+        check_dtype=False,
+    )
+
+
+QRIS = [
+    transaksi("1 Januari 2024 08:00", "Ani"),
+    transaksi("15 Februari 2024 09:30", "Budi", status="Berhasil"),
+    transaksi("1 Maret 2024 10:00", "Citra"),
+    transaksi("1 Maret 2024 10:00", "Citra"),  # donasi kembar di menit yang sama
+]
+MANUAL = [transaksi("2 Maret 2024 11:00", "Dedi", nominal="Rp 50.000")]
+
+
+def test_upsert_updates_status_and_appends_new_rows(export):
+    window = cleaned(export(QRIS[2:]), export(MANUAL))
+    delta_rows = [transaksi("1 Maret 2024 10:00", "Citra", status="Berhasil")] + QRIS[3:] + [
+        transaksi("3 Maret 2024 12:00", "Eka"),
+    ]
+    delta = cleaned(export(delta_rows), export(MANUAL))
+
+    combined, appended, updated = ingest.upsert(window, delta)
+
+    assert (appended, updated) == (1, 1)
+    citra = combined[combined["nama_donatur"] == "Citra"]
+    assert sorted(citra["status"]) == ["Berhasil", "Pending"]
+    assert len(combined) == len(window) + 1
+
+
+def test_incremental_ingest_matches_full_cleaning(tmp_path, export):
+    store_dir = str(tmp_path / "store")
+    overlap = pd.Timedelta(days=7)
+    stats = ingest.ingest(export(QRIS), export(MANUAL), store_dir, overlap)
+    assert stats["mode"] == "full"
+    assert_store_equals(store_dir, export(QRIS), export(MANUAL))
+    cold = {part["file"] for part in ingest.read_manifest(store_dir)["parts"]}
+
+    # Status berubah di jendela overlap, plus transaksi baru di kedua sumber
+    qris = QRIS[:3] + [transaksi("1 Maret 2024 10:00", "Citra", status="Berhasil"),
+                       transaksi("4 Maret 2024 13:00", "Fajar")]
+    manual = MANUAL + [transaksi("5 Maret 2024 14:00", "Gita")]
+    stats = ingest.ingest(export(qris), export(manual), store_dir, overlap)
+
+    assert stats["mode"] == "incremental"
+    assert (stats["appended"], stats["updated"]) == (2, 1)
+    assert_store_equals(store_dir, export(qris), export(manual))
+    # Part lama (Januari-Februari) di luar jendela overlap tidak ditulis ulang
+    parts = {part["file"] for part in ingest.read_manifest(store_dir)["parts"]}
+    assert stats["parts_rewritten"] == 1
+    assert len(cold & parts) == 1
+    assert sorted(os.listdir(store_dir)) == sorted(parts | {"manifest.json"})
+
+
+def test_reingest_same_export_is_noop(tmp_path, export):
+    store_dir = str(tmp_path / "store")
+    ingest.ingest(export(QRIS), export(MANUAL), store_dir)
+    stats = ingest.ingest(export(QRIS), export(MANUAL), store_dir)
+
+    assert (stats["appended"], stats["updated"]) == (0, 0)
+    assert_store_equals(store_dir, export(QRIS), export(MANUAL))
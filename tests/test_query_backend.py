@@ -0,0 +1,59 @@
+"""Backend DuckDB harus memberi hasil roll-up yang sama dengan backend pandas (acuan)."""
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+import cube  # noqa: E402
+import partitions  # noqa: E402
+from filters import FILTER_COLUMNS, BitmapIndex, TimeIndex  # noqa: E402
+from precompute import DEFAULT_ROLLUPS, make_backend  # noqa: E402
+from result_cache import filter_key  # noqa: E402
+
+
+@pytest.fixture
+def backends(transaksi, tmp_path):
+    data = cube.build_cube(transaksi)
+    manifest = partitions.write_partitions(transaksi, "uji", str(tmp_path))
+    return [
+        make_backend(name, data, TimeIndex(data["tanggal"]), BitmapIndex(data), manifest, str(tmp_path))
+        for name in ("pandas", "duckdb")
+    ]
+
+
+def _key(start_date, end_date, **selections):
+    return filter_key(start_date, end_date, {column: selections.get(column, []) for column in FILTER_COLUMNS})
+
+
+KEYS = {
+    "semua": _key("2024-01-01", "2024-03-31"),
+    "satu bulan": _key("2024-02-01", "2024-02-29"),
+    "satu campaign": _key("2024-01-01", "2024-03-31", nama_campaign=["Campaign 2"]),
+    "tanpa baris": _key("2023-01-01", "2023-06-30"),
+}
+
+
+def _plain(df):
+    # Kolom teks (categorical, string, object) dan tipe indeks boleh berbeda
+    # antar backend, isinya tidak
+    df = df.copy()
+    for column in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].astype(object)
+    if isinstance(df.index.dtype, pd.CategoricalDtype):
+        df.index = df.index.astype(str)
+    return df
+
+
+@pytest.mark.parametrize("key", KEYS.values(), ids=KEYS.keys())
+@pytest.mark.parametrize("name", DEFAULT_ROLLUPS)
+def test_duckdb_matches_pandas(backends, name, key):
+    pandas_backend, duckdb_backend = backends
+    expected = pandas_backend.rollup(name, key)
+    result = duckdb_backend.rollup(name, key)
+    if isinstance(expected, dict):
+        assert result == expected
+    else:
+        pd.testing.assert_frame_equal(
+            _plain(result), _plain(expected), check_index_type=False, check_column_type=False
+        )